@@ -1,7 +1,6 @@
 import logging
 import traceback
 from datetime import timedelta
-from decimal import Decimal
 from functools import wraps
 
 import pandas as pd
@@ -9,6 +8,7 @@ import pandas as pd
 from lumibot.brokers import Broker
 from lumibot.data_sources import DataSourceBacktesting
 from lumibot.entities import Asset, Order, Position, TradingFee
+from lumibot.tools.types import to_quantity
 from lumibot.trading_builtins import CustomStream
 
 
@@ -488,19 +488,21 @@ class BacktestingBroker(Broker):
         elif order.side == "sell":
             trading_fees: list[TradingFee] = strategy.sell_trading_fees
 
+        # The fees are Decimals, they are converted to the quantity type of the numeric mode (see set_numeric_mode)
+        notional = to_quantity(price) * to_quantity(order.quantity)
         for trading_fee in trading_fees:
             if trading_fee.taker == True and order.type in [
                 "market",
                 "stop",
             ]:
-                trade_cost += trading_fee.flat_fee
-                trade_cost += Decimal(price) * Decimal(order.quantity) * trading_fee.percent_fee
+                trade_cost += to_quantity(trading_fee.flat_fee)
+                trade_cost += notional * to_quantity(trading_fee.percent_fee)
             elif trading_fee.maker == True and order.type in [
                 "limit",
                 "stop_limit",
             ]:
-                trade_cost += trading_fee.flat_fee
-                trade_cost += Decimal(price) * Decimal(order.quantity) * trading_fee.percent_fee
+                trade_cost += to_quantity(trading_fee.flat_fee)
+                trade_cost += notional * to_quantity(trading_fee.percent_fee)
 
         return trade_cost
 
@@ -1,7 +1,8 @@
 import logging
 import traceback
 from collections import OrderedDict, defaultdict
-from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
 from polygon import RESTClient
 from polygon.exceptions import BadResponse
@@ -20,10 +21,17 @@ class PolygonDataBacktesting(PandasData):
     Backtesting implementation of Polygon
     """
 
-    # Size limit for the pandas_data and _data_store (dicts of Pandas DataFrames) in bytes.
+    # Size limit for the _data_store (dict of Data objects holding Pandas DataFrames) in bytes.
     # Set to None to disable the limit.
     MAX_STORAGE_BYTES = None
 
+    # Number of background threads used to download data that was requested with prefetch().
+    PREFETCH_MAX_WORKERS = 4
+
+    # Number of strikes around the underlying price (per right) for which get_chains() will automatically start
+    # a background download for the nearest expiration. Set to None to disable the automatic prefetching.
+    PREFETCH_NEAR_THE_MONEY_STRIKES = None
+
     def __init__(
         self,
         datetime_start,
@@ -41,6 +49,10 @@ class PolygonDataBacktesting(PandasData):
         # RESTClient API for Polygon.io polygon-api-client
         self.polygon_client = RESTClient(self._api_key)
 
+        # Background downloads started by prefetch(), keyed by ((asset, quote), timestep unit)
+        self._prefetch_executor = None
+        self._prefetch_futures = {}
+
     @staticmethod
     def _enforce_storage_limit(pandas_data: OrderedDict):
         storage_used = sum(data.df.memory_usage().sum() for data in pandas_data.values())
@@ -51,9 +63,13 @@ class PolygonDataBacktesting(PandasData):
             storage_used -= mu
             logging.info(f"Storage limit exceeded. Evicted LRU data: {k} used {mu:,} bytes")
 
-    def _update_pandas_data(self, asset, quote, length, timestep, start_dt=None, update_data_store=False):
+    def _update_pandas_data(self, asset, quote, length, timestep, start_dt=None):
         """
-        Get asset data and update the self.pandas_data dictionary.
+        Get asset data and update the self._data_store dictionary.
+
+        New data is added to the store in its raw state and replaces any previous entry for the same asset, so
+        there is only ever one copy of an asset's bars. The entry is repaired (reindexed and filled) lazily by Data
+        the first time it is read.
 
         Parameters
         ----------
@@ -67,10 +83,6 @@ class PolygonDataBacktesting(PandasData):
             The timestep to use. For example, "1minute" or "1hour" or "1day".
         start_dt : datetime
             The start datetime to use. If None, the current self.start_datetime will be used.
-        update_data_store : bool
-            If True, the data will also be added to the self._data_store dictionary.
-            That update will not include the adjustments made by PandasData.load_data.
-            See https://github.com/Lumiwealth/lumibot/issues/391 and its PR for further discussion.
         """
         search_asset = asset
         asset_separated = asset
@@ -87,8 +99,10 @@ class PolygonDataBacktesting(PandasData):
         )
 
         # Check if we have data for this asset
-        if search_asset in self.pandas_data:
-            asset_data = self.pandas_data[search_asset]
+        if search_asset in self._data_store:
+            # Mark the entry as recently used so that it is the last to be evicted
+            self._data_store.move_to_end(search_asset)
+            asset_data = self._data_store[search_asset]
             asset_data_df = asset_data.df
             data_start_datetime = asset_data_df.index[0]
 
@@ -129,12 +143,36 @@ class PolygonDataBacktesting(PandasData):
                         # We don't have enough data, so we need to get more (but in minutes)
                         ts_unit = "minute"
 
-        # Download data from Polygon
+        # Use the data from a background prefetch if there is one, otherwise download it now
+        data = self._collect_prefetched_data(search_asset, ts_unit, start_datetime)
+        if data is None:
+            df = self._get_price_data_from_polygon(asset_separated, quote_asset, start_datetime, ts_unit)
+            if (df is None) or df.empty:
+                return
+            data = Data(asset_separated, df, timestep=ts_unit, quote=quote_asset)
+
+        pandas_data_update = self._set_pandas_data_keys([data])
+
+        # Add the keys to the self._data_store dictionary, replacing (and releasing) any older copy of the data
+        for key in pandas_data_update:
+            self._data_store.pop(key, None)
+        self._data_store.update(pandas_data_update)
+        if PolygonDataBacktesting.MAX_STORAGE_BYTES:
+            self._enforce_storage_limit(self._data_store)
+
+    def _get_price_data_from_polygon(self, asset, quote_asset, start_datetime, ts_unit):
+        """
+        Download the data for an asset from Polygon (or its cache) from start_datetime to the end of the backtest.
+
+        Returns
+        -------
+        pd.DataFrame or None
+        """
         try:
             # Get data from Polygon
             df = polygon_helper.get_price_data_from_polygon(
                 self._api_key,
-                asset_separated,
+                asset,
                 start_datetime,
                 self.datetime_end,
                 timespan=ts_unit,
@@ -192,21 +230,144 @@ class PolygonDataBacktesting(PandasData):
             logging.error(traceback.format_exc())
             raise Exception("Error getting data from Polygon") from e
 
+        return df
+
+    def prefetch(self, assets, timestep="minute", quote=None, length=1):
+        """
+        Start downloading the data for the assets in background threads so that it is (hopefully) ready by the time
+        the strategy asks for it. The simulation keeps running while the data downloads, and the first request for
+        one of these assets picks up the prefetched data instead of downloading it again.
+
+        Parameters
+        ----------
+        assets : list of Asset or tuple
+            The assets to prefetch. Tuples are interpreted as (asset, quote).
+        timestep : str
+            The timestep that the strategy will request. For example, "1minute" or "1day".
+        quote : Asset
+            The quote asset to use. Defaults to USD.
+        length : int
+            The number of bars the strategy is expected to request.
+        """
+        start_datetime, ts_unit = self.get_start_datetime_and_ts_unit(
+            length, timestep, self.get_datetime(), start_buffer=START_BUFFER
+        )
+        default_quote = quote if quote is not None else Asset("USD", "forex")
+
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=self.PREFETCH_MAX_WORKERS, thread_name_prefix="polygon_prefetch"
+            )
+
+        for asset in assets:
+            if isinstance(asset, tuple):
+                search_asset = asset
+            else:
+                search_asset = (asset, default_quote)
+
+            # Skip assets that we already have (or are already downloading)
+            key = (search_asset, ts_unit)
+            if key in self._prefetch_futures:
+                continue
+            if search_asset in self._data_store and self._data_store[search_asset].timestep == ts_unit:
+                continue
+
+            self._prefetch_futures[key] = self._prefetch_executor.submit(
+                self._prefetch_worker, search_asset[0], search_asset[1], start_datetime, ts_unit
+            )
+
+    def prefetch_option_chain(self, asset, expiration=None, num_strikes=5, timestep="minute", chains=None):
+        """
+        Prefetch the option contracts that are closest to the money for one expiration of the option chain.
+
+        Parameters
+        ----------
+        asset : Asset
+            The underlying asset.
+        expiration : datetime.date
+            The expiration to prefetch. If None, the nearest expiration is used.
+        num_strikes : int
+            The number of strikes closest to the underlying price to prefetch, for both calls and puts.
+        timestep : str
+            The timestep that the strategy will request.
+        chains : dict
+            The option chains for the asset as returned by get_chains(). Queried if not provided.
+
+        Returns
+        -------
+        list of Asset
+            The option assets that are being prefetched.
+        """
+        if chains is None:
+            chains = self.get_chains(asset)
+
+        underlying_price = self.get_last_price(asset)
+        if underlying_price is None:
+            return []
+
+        # Expirations in the chains are strings formatted as YYYY-MM-DD
+        if expiration is not None:
+            expiration_str = expiration.strftime("%Y-%m-%d")
+        else:
+            today_str = self.get_datetime().strftime("%Y-%m-%d")
+            expirations = [exp for right in chains["Chains"].values() for exp in right if str(exp) >= today_str]
+            if not expirations:
+                return []
+            expiration_str = str(min(expirations))
+
+        option_assets = []
+        for right, expirations in chains["Chains"].items():
+            strikes = expirations.get(expiration_str, [])
+            for strike in sorted(strikes, key=lambda x: abs(x - underlying_price))[:num_strikes]:
+                option_assets.append(
+                    Asset(
+                        asset.symbol,
+                        asset_type="option",
+                        expiration=datetime.strptime(expiration_str, "%Y-%m-%d").date(),
+                        strike=strike,
+                        right=right,
+                    )
+                )
+
+        self.prefetch(option_assets, timestep=timestep)
+        return option_assets
+
+    def cancel_prefetch(self):
+        """Cancel the queued prefetch downloads and shut the prefetch threads down without waiting for the running
+        downloads. A later prefetch starts new threads."""
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_executor = None
+        self._prefetch_futures.clear()
+
+    def _prefetch_worker(self, asset, quote_asset, start_datetime, ts_unit):
+        # Runs in a background thread, so it must not touch self._data_store
+        df = self._get_price_data_from_polygon(asset, quote_asset, start_datetime, ts_unit)
         if (df is None) or df.empty:
-            return
+            return None
 
-        data = Data(asset_separated, df, timestep=ts_unit, quote=quote_asset)
-        pandas_data_update = self._set_pandas_data_keys([data])
+        # Prepare the data here too, so that the simulation doesn't have to do it when it first reads the data
+        data = Data(asset, df, timestep=ts_unit, quote=quote_asset)
+        data.repair_times_and_fill(data.df.index)
+        return data
 
-        # Add the keys to the self.pandas_data dictionary
-        self.pandas_data.update(pandas_data_update)
-        if PolygonDataBacktesting.MAX_STORAGE_BYTES:
-            self._enforce_storage_limit(self.pandas_data)
-        if update_data_store:
-            # TODO: Why do we have both self.pandas_data and self._data_store?
-            self._data_store.update(pandas_data_update)
-            if PolygonDataBacktesting.MAX_STORAGE_BYTES:
-                self._enforce_storage_limit(self._data_store)
+    def _collect_prefetched_data(self, search_asset, ts_unit, start_datetime):
+        """Wait for and return the prefetched Data for an asset, or None if it was not prefetched (or not usable)."""
+        future = self._prefetch_futures.pop((search_asset, ts_unit), None)
+        if future is None:
+            return None
+
+        try:
+            data = future.result()
+        except Exception as e:
+            logging.info(f"Prefetching data for {search_asset} failed, downloading it again: {e}")
+            return None
+
+        # Make sure that the prefetched data goes back far enough for this request
+        if data is None or (data.df.index[0] - start_datetime) >= START_BUFFER:
+            return None
+
+        return data
 
     def _pull_source_symbol_bars(
         self,
@@ -255,7 +416,7 @@ class PolygonDataBacktesting(PandasData):
     def get_last_price(self, asset, timestep="minute", quote=None, exchange=None, **kwargs):
         try:
             dt = self.get_datetime()
-            self._update_pandas_data(asset, quote, 1, timestep, dt, update_data_store=True)
+            self._update_pandas_data(asset, quote, 1, timestep, dt)
         except Exception as e:
             print(f"Error get_last_price from Polygon: {e}")
             print(f"Error get_last_price from Polygon: {asset=} {quote=} {timestep=} {dt=} {e}")
@@ -329,4 +490,7 @@ class PolygonDataBacktesting(PandasData):
             option_contracts["Exchange"] = exchange
             option_contracts["Chains"][right][exp_date].append(strike)
 
+        if self.PREFETCH_NEAR_THE_MONEY_STRIKES:
+            self.prefetch_option_chain(asset, num_strikes=self.PREFETCH_NEAR_THE_MONEY_STRIKES, chains=option_contracts)
+
         return option_contracts
@@ -15,6 +15,7 @@ from termcolor import colored
 
 from lumibot.data_sources import DataSource
 from lumibot.entities import Asset, Order, Position
+from lumibot.tools.types import to_quantity
 from lumibot.trading_builtins import SafeList
 
 
@@ -38,6 +39,28 @@ class Broker(ABC):
     CASH_SETTLED = "cash_settled"
     ERROR_ORDER = "error"
 
+    # The columns of the trade event log, see _trade_event_log_df
+    TRADE_EVENT_COLUMNS = (
+        "time",
+        "strategy",
+        "exchange",
+        "identifier",
+        "symbol",
+        "side",
+        "type",
+        "status",
+        "price",
+        "filled_quantity",
+        "multiplier",
+        "trade_cost",
+        "time_in_force",
+        "asset.right",
+        "asset.strike",
+        "asset.multiplier",
+        "asset.expiration",
+        "asset.asset_type",
+    )
+
     def __init__(self, name="", connect_stream=True, data_source: DataSource = None, config=None, max_workers=20):
         """Broker constructor"""
         # Shared Variables between threads
@@ -51,7 +74,9 @@ class Broker(ABC):
         self._filled_positions = SafeList(self._lock)
         self._subscribers = SafeList(self._lock)
         self._is_stream_subscribed = False
-        self._trade_event_log_df = pd.DataFrame()
+        # One tuple per trade event (see TRADE_EVENT_COLUMNS), the dataframe is only built when it's used
+        self._trade_event_log = []
+        self._trade_event_log_cache = pd.DataFrame()
         self._hold_trade_events = False
         self._held_trades = []
         self._config = config
@@ -349,7 +374,7 @@ class Broker(ABC):
         """
         return chains[exchange] if exchange in chains else chains
 
-    def get_greeks(self, asset, asset_price, underlying_price, risk_free_rate, query_greeks=False):
+    def get_greeks(self, asset, asset_price, underlying_price, risk_free_rate, query_greeks=False, use_cache=True):
         """
         Get the greeks of an option asset.
 
@@ -366,6 +391,9 @@ class Broker(ABC):
         query_greeks : bool, optional
             Whether to query the greeks from the broker. By default, the greeks are calculated locally, but if the
             broker supports it, they can be queried instead which could theoretically be more precise.
+        use_cache : bool, optional
+            Whether the calculated greeks are looked up in and added to the greeks cache of the data source, by
+            default True.
 
         Returns
         -------
@@ -380,7 +408,9 @@ class Broker(ABC):
                 return greeks
             self.logger.info("Greeks could not be queried from the broker. Calculating locally instead.")
 
-        return self.data_source.calculate_greeks(asset, asset_price, underlying_price, risk_free_rate)
+        return self.data_source.calculate_greeks(
+            asset, asset_price, underlying_price, risk_free_rate, use_cache=use_cache
+        )
 
     def get_multiplier(self, chains, exchange="SMART"):
         """Returns option chain for a particular exchange.
@@ -582,7 +612,7 @@ class Broker(ABC):
 
     def _process_crypto_quote(self, order, quantity, price):
         """Used to process the quote side of a crypto trade."""
-        quote_quantity = Decimal(quantity) * Decimal(price)
+        quote_quantity = to_quantity(quantity) * to_quantity(price)
         if order.side == "buy":
             quote_quantity = -quote_quantity
         position = self.get_tracked_position(order.strategy, order.quote)
@@ -1026,8 +1056,7 @@ class Broker(ABC):
         if filled_quantity is not None:
             error = ValueError(f"filled_quantity must be a positive integer, received {filled_quantity} instead")
             try:
-                if not isinstance(filled_quantity, Decimal):
-                    filled_quantity = Decimal(filled_quantity)
+                filled_quantity = to_quantity(filled_quantity)
                 if filled_quantity < 0:
                     raise error
             except ValueError:
@@ -1063,37 +1092,42 @@ class Broker(ABC):
             self.logger.info(f"Unhandled type event {type_event} for {stored_order}")
 
         current_dt = self.data_source.get_datetime()
-        new_row = {
-            "time": current_dt,
-            "strategy": stored_order.strategy,
-            "exchange": stored_order.exchange,
-            "identifier": stored_order.identifier,
-            "symbol": stored_order.symbol,
-            "side": stored_order.side,
-            "type": stored_order.type,
-            "status": stored_order.status,
-            "price": price,
-            "filled_quantity": filled_quantity,
-            "multiplier": multiplier,
-            "trade_cost": stored_order.trade_cost,
-            "time_in_force": stored_order.time_in_force,
-            "asset.right": stored_order.asset.right,
-            "asset.strike": stored_order.asset.strike,
-            "asset.multiplier": stored_order.asset.multiplier,
-            "asset.expiration": stored_order.asset.expiration,
-            "asset.asset_type": stored_order.asset.asset_type,
-        }
-        # Create a DataFrame with the new row
-        new_row_df = pd.DataFrame(new_row, index=[0])
-
-        # Filter out empty or all-NA columns from new_row_df
-        new_row_df = new_row_df.dropna(axis=1, how="all")
-
-        # Concatenate the filtered new_row_df with the existing _trade_event_log_df
-        self._trade_event_log_df = pd.concat([self._trade_event_log_df, new_row_df], axis=0)
+        self._trade_event_log.append(
+            (
+                current_dt,
+                stored_order.strategy,
+                stored_order.exchange,
+                stored_order.identifier,
+                stored_order.symbol,
+                stored_order.side,
+                stored_order.type,
+                stored_order.status,
+                price,
+                filled_quantity,
+                multiplier,
+                stored_order.trade_cost,
+                stored_order.time_in_force,
+                stored_order.asset.right,
+                stored_order.asset.strike,
+                stored_order.asset.multiplier,
+                stored_order.asset.expiration,
+                stored_order.asset.asset_type,
+            )
+        )
 
         return
 
+    @property
+    def _trade_event_log_df(self):
+        """The trade events as a dataframe, one row per event. Columns without any value are left out."""
+        if len(self._trade_event_log_cache) != len(self._trade_event_log):
+            df = pd.DataFrame.from_records(self._trade_event_log, columns=self.TRADE_EVENT_COLUMNS)
+            df = df.dropna(axis=1, how="all")
+            # Each event used to be concatenated as a single row with the index 0, keep the same index
+            df.index = [0] * len(df)
+            self._trade_event_log_cache = df
+        return self._trade_event_log_cache
+
     def _launch_stream(self):
         """Set the asynchronous actions to be executed after
         when events are sent via socket streams"""
@@ -12,7 +12,7 @@ from alpaca.data.requests import (
 )
 from alpaca.data.timeframe import TimeFrame
 
-from lumibot.entities import Asset, Bars
+from lumibot.entities import Asset, AssetsMapping, Bars
 
 from .data_source import DataSource
 
@@ -133,6 +133,10 @@ class AlpacaData(DataSource):
         else:
             self.version = "v2"
 
+        # Long-lived clients, each keeps its HTTP session (and its connections) open between requests
+        self._stock_client = StockHistoricalDataClient(self.api_key, self.api_secret)
+        self._crypto_client = CryptoHistoricalDataClient()
+
     def get_chains(self, asset: Asset, quote=None, exchange: str = None):
         """
         Alpaca doesn't support option trading. This method is here to comply with the DataSource interface
@@ -142,7 +146,9 @@ class AlpacaData(DataSource):
             "feature, please use a different data source."
         )
 
-    def get_last_price(self, asset, quote=None, exchange=None, **kwargs):
+    @staticmethod
+    def _get_symbol(asset, quote=None):
+        """Returns the Alpaca symbol of an asset (eg. "AAPL" or "BTC/USD") and whether it is a crypto asset."""
         if quote is not None:
             # If the quote is not None, we use it even if the asset is a tuple
             if type(asset) == Asset and asset.asset_type == "stock":
@@ -156,21 +162,15 @@ class AlpacaData(DataSource):
         else:
             symbol = asset.symbol
 
-        if isinstance(asset, tuple) and asset[0].asset_type == "crypto":
-            client = CryptoHistoricalDataClient()
-            quote_params = CryptoLatestQuoteRequest(symbol_or_symbols=symbol)
-            quote = client.get_crypto_latest_quote(quote_params)
+        base_asset = asset[0] if isinstance(asset, tuple) else asset
+        return symbol, base_asset.asset_type == "crypto"
 
-            # Get the first item in the dictionary
-            quote = quote[list(quote.keys())[0]]
-
-            # The price is the average of the bid and ask
-            price = (quote.bid_price + quote.ask_price) / 2
+    def get_last_price(self, asset, quote=None, exchange=None, **kwargs):
+        symbol, is_crypto = self._get_symbol(asset, quote=quote)
 
-        elif isinstance(asset, Asset) and asset.asset_type == "crypto":
-            client = CryptoHistoricalDataClient()
+        if is_crypto:
             quote_params = CryptoLatestQuoteRequest(symbol_or_symbols=symbol)
-            quote = client.get_crypto_latest_quote(quote_params)
+            quote = self._crypto_client.get_crypto_latest_quote(quote_params)
 
             # Get the first item in the dictionary
             quote = quote[list(quote.keys())[0]]
@@ -179,13 +179,66 @@ class AlpacaData(DataSource):
             price = (quote.bid_price + quote.ask_price) / 2
         else:
             # Stocks
-            client = StockHistoricalDataClient(self.api_key, self.api_secret)
             params = StockLatestTradeRequest(symbol_or_symbols=symbol)
-            trade = client.get_stock_latest_trade(params)[symbol]
+            trade = self._stock_client.get_stock_latest_trade(params)[symbol]
             price = trade.price
 
         return price
 
+    def get_last_prices(self, assets, quote=None, exchange=None, **kwargs):
+        """
+        Returns the last prices of assets with multi-symbol requests: the latest trades of the stocks and the latest
+        quotes of the crypto pairs, by chunks of chunk_size symbols, instead of one request per asset.
+
+        Parameters
+        ----------
+        assets : list[Asset]
+            The assets to get the prices for.
+        quote : Asset
+            The quote asset of the crypto assets.
+        exchange : str
+            Not used by Alpaca.
+
+        Returns
+        -------
+        AssetsMapping
+            The last price of each asset. The symbols missing from the responses are requested with get_last_price.
+        """
+        stock_symbols = {}
+        crypto_symbols = {}
+        for asset in assets:
+            symbol, is_crypto = self._get_symbol(asset, quote=quote)
+            (crypto_symbols if is_crypto else stock_symbols).setdefault(symbol, []).append(asset)
+
+        prices = {}
+        for chunk in self._chunks(list(stock_symbols)):
+            trades = self._stock_client.get_stock_latest_trade(StockLatestTradeRequest(symbol_or_symbols=chunk))
+            for symbol, trade in trades.items():
+                prices[symbol] = trade.price
+
+        for chunk in self._chunks(list(crypto_symbols)):
+            quotes = self._crypto_client.get_crypto_latest_quote(CryptoLatestQuoteRequest(symbol_or_symbols=chunk))
+            for symbol, latest_quote in quotes.items():
+                # The price is the average of the bid and ask
+                prices[symbol] = (latest_quote.bid_price + latest_quote.ask_price) / 2
+
+        result = {}
+        for symbols in (stock_symbols, crypto_symbols):
+            missing = [symbol for symbol in symbols if symbol not in prices]
+            if missing:
+                # Same as before the batched requests: get_last_price raises if there is really no price
+                logging.warning(f"Alpaca returned no latest price for {missing}, requesting them one by one")
+                for symbol in missing:
+                    prices[symbol] = self.get_last_price(symbols[symbol][0], quote=quote)
+
+            for symbol, symbol_assets in symbols.items():
+                for asset in symbol_assets:
+                    result[asset] = prices[symbol]
+        return AssetsMapping(result)
+
+    def _chunks(self, symbols):
+        return [symbols[i : i + self.chunk_size] for i in range(0, len(symbols), self.chunk_size)]
+
     def get_historical_prices(
         self, asset, length, timestep="", timeshift=None, quote=None, exchange=None, include_after_hours=True
     ):
@@ -262,18 +315,16 @@ class AlpacaData(DataSource):
             if asset.asset_type == "crypto":
                 symbol = f"{asset.symbol}/{quote.symbol}"
 
-                client = CryptoHistoricalDataClient()
                 params = CryptoBarsRequest(symbol_or_symbols=symbol, timeframe=freq, start=start, end=end)
-                barset = client.get_crypto_bars(params)
+                barset = self._crypto_client.get_crypto_bars(params)
 
             else:
                 symbol = asset.symbol
 
-                client = StockHistoricalDataClient(self.api_key, self.api_secret)
                 params = StockBarsRequest(symbol_or_symbols=symbol, timeframe=freq, start=start, end=end)
 
                 try:
-                    barset = client.get_stock_bars(params)
+                    barset = self._stock_client.get_stock_bars(params)
                 except Exception as e:
                     logging.error(f"Could not get pricing data from Alpaca for {symbol} with the following error: {e}")
                     return None
@@ -9,7 +9,7 @@ from lumibot import LUMIBOT_DEFAULT_PYTZ
 from lumibot.data_sources import DataSourceBacktesting
 from lumibot.entities import Asset, Bars
 
-from lumibot.tools import CcxtCacheDB
+from lumibot.tools import CcxtCacheDB, get_tail_before
 from pandas import DataFrame
 
 from typing import Union,Any
@@ -31,18 +31,23 @@ class CcxtBacktestingData(DataSourceBacktesting):
         # from current date to max data download limit
         download_limit = None
         exchange_id = "binance"
+        concurrent_backfill = False
         if kwargs:
             download_limit = kwargs.pop("max_data_download_limit", download_limit)
             exchange_id = kwargs.pop("exchange_id", exchange_id)
+            concurrent_backfill = kwargs.pop("concurrent_backfill", concurrent_backfill)
 
         super().__init__(*args, **kwargs)
         self.name = exchange_id
         self.auto_adjust = auto_adjust
         self._data_store = {}
+        # Position of the current backtest datetime in the data of each symbol/timestep
+        self._cursors = {}
         # The number of historical data is downloaded earlier than the start date when downloading historical data.
         self._download_start_dt_prebuffer = 300
 
-        self.cache_db = CcxtCacheDB(self.name,max_download_limit=download_limit)
+        self.cache_db = CcxtCacheDB(self.name,max_download_limit=download_limit,
+                                    concurrent_backfill=concurrent_backfill)
 
 
     def _to_utc_timezone(self, dt:datetime)->datetime:
@@ -118,12 +123,7 @@ class CcxtBacktestingData(DataSourceBacktesting):
             end = end - timeshift
 
         end = self.to_default_timezone(end)
-        result_data = data[data.index <= end]
-
-        if length is None:
-            return result_data
-
-        return result_data.tail(length)
+        return get_tail_before(data, end, length=length, inclusive=True, cursors=self._cursors, key=symbol_timestep)
 
 
     def _pull_source_bars(self, assets:tuple[Asset,Asset], length:int, timestep:str=MIN_TIMESTEP,
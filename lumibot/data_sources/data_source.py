@@ -1,11 +1,15 @@
 import logging
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from lumibot import LUMIBOT_DEFAULT_PYTZ, LUMIBOT_DEFAULT_TIMEZONE
 from lumibot.entities import Asset, AssetsMapping
 from lumibot.tools import black_scholes
+from lumibot.tools.volatility_surface import VolatilitySurface
 
 from .exceptions import UnavailabeTimestep
 
@@ -17,6 +21,8 @@ class DataSource(ABC):
     TIMESTEP_MAPPING = []
     DEFAULT_TIMEZONE = LUMIBOT_DEFAULT_TIMEZONE
     DEFAULT_PYTZ = LUMIBOT_DEFAULT_PYTZ
+    # Number of seconds the cached greeks stay valid when trading live. When backtesting they are valid for one bar.
+    GREEKS_CACHE_TTL = 5
 
     def __init__(self, api_key=None, delay=None):
         """
@@ -33,6 +39,13 @@ class DataSource(ABC):
         self._timestep = None
         self._api_key = api_key
         self._delay = timedelta(minutes=delay) if delay else None
+        # Greeks calculated recently, see get_cached_greeks
+        self._greeks_cache = {}
+        self._greeks_cache_datetime = None
+        self.greeks_cache_hits = 0
+        self.greeks_cache_misses = 0
+        # Volatility surfaces kept between bars so they can be updated incrementally, see get_volatility_surface
+        self._volatility_surfaces = {}
 
     # ========Required Implementations ======================
     @abstractmethod
@@ -344,6 +357,23 @@ class DataSource(ABC):
         else:
             return AssetsMapping(result)
 
+    def get_chain_last_prices(self, assets):
+        """Takes a list of option assets, usually of the same option chain, and returns their last known prices as a
+        dict {asset: price}. Data sources that can price a whole chain in one request override this."""
+        # Data sources that download lazily can load all the contracts at once
+        self.prefetch(assets)
+        return {asset: self.get_last_price(asset) for asset in assets}
+
+    def prefetch(self, assets, timestep="minute", quote=None, length=1):
+        """Start loading the data for assets that will probably be requested soon. Data sources that download
+        data lazily (eg. PolygonDataBacktesting) override this, for all other data sources it does nothing."""
+        pass
+
+    def cancel_prefetch(self):
+        """Stop the prefetch downloads that have not started yet and release their threads, eg. at the end of a
+        backtest. Does nothing for data sources that don't prefetch."""
+        pass
+
     def get_strikes(self, asset) -> list:
         """Return a set of strikes for a given asset"""
         chains = self.get_chains(asset)
@@ -378,13 +408,197 @@ class DataSource(ABC):
         asset_price: float,
         underlying_price: float,
         risk_free_rate: float,
+        use_cache: bool = True,
     ):
-        """Returns Greeks in backtesting."""
-        opt_price = asset_price
-        und_price = underlying_price
-        interest = risk_free_rate * 100
+        """Returns Greeks in backtesting. With use_cache=False the greeks cache is not used, for callers that cache
+        the greeks themselves (eg. Strategy.get_greeks)."""
+        if not use_cache:
+            return self.calculate_chain_greeks([asset], [asset_price], underlying_price, risk_free_rate)[0]
+
+        cache_key = ("calculate_greeks", asset, asset_price, underlying_price, risk_free_rate)
+        greeks = self.get_cached_greeks(cache_key)
+        if greeks is None:
+            greeks = self.calculate_chain_greeks([asset], [asset_price], underlying_price, risk_free_rate)[0]
+            self.cache_greeks(cache_key, greeks)
+        return greeks
+
+    def get_cached_greeks(self, key):
+        """Returns the greeks cached under key, or None if they were not cached or are no longer valid.
+
+        When backtesting, cached greeks are valid until the backtest moves to the next bar. When trading live, they
+        are valid for GREEKS_CACHE_TTL seconds. The lookups are counted in greeks_cache_hits and greeks_cache_misses.
+
+        Parameters
+        ----------
+        key : tuple
+            Identifies the calculation, eg. the option asset, the prices and the risk-free rate used.
+
+        Returns
+        -------
+        dict or None
+            A copy of the cached greeks.
+        """
+        now = self.get_datetime()
+        if self.IS_BACKTESTING_DATA_SOURCE and now != self._greeks_cache_datetime:
+            # The backtest moved to another bar, so none of the cached greeks are valid anymore
+            self._greeks_cache.clear()
+            self._greeks_cache_datetime = now
+
+        entry = self._greeks_cache.get(key)
+        if entry is not None:
+            cached_datetime, greeks = entry
+            if self.IS_BACKTESTING_DATA_SOURCE or (now - cached_datetime).total_seconds() <= self.GREEKS_CACHE_TTL:
+                self.greeks_cache_hits += 1
+                return dict(greeks)
+            del self._greeks_cache[key]
+
+        self.greeks_cache_misses += 1
+        return None
+
+    def cache_greeks(self, key, greeks):
+        """Caches greeks under key, see get_cached_greeks."""
+        if not greeks:
+            return
+
+        now = self.get_datetime()
+        if not self.IS_BACKTESTING_DATA_SOURCE and len(self._greeks_cache) >= 10000:
+            # Don't let the cache grow forever when trading live
+            self._greeks_cache = {
+                k: v for k, v in self._greeks_cache.items() if (now - v[0]).total_seconds() <= self.GREEKS_CACHE_TTL
+            }
+        self._greeks_cache[key] = (now, dict(greeks))
+
+    def get_volatility_surface(self, key, option_assets=None, underlying_price=None, risk_free_rate=None):
+        """Returns the volatility surface cached under key, updated with the current prices of option_assets.
+
+        A surface is updated at most once per bar when backtesting, and once every GREEKS_CACHE_TTL seconds when
+        trading live, otherwise the cached surface is returned as is. Updates are incremental: the surface is kept
+        between bars and only the implied volatilities of the options whose inputs changed are solved again.
+
+        Parameters
+        ----------
+        key : tuple
+            Identifies the surface, eg. the underlying asset and the expirations.
+        option_assets : list[Asset]
+            The options of the surface. If None, the cached surface is returned only if it is up to date.
+        underlying_price : float
+            The price of the underlying asset.
+        risk_free_rate : float
+            The risk-free rate used in interest calculations.
+
+        Returns
+        -------
+        VolatilitySurface or None
+            None if option_assets is None and the surface has to be updated.
+        """
+        now = self.get_datetime()
+        entry = self._volatility_surfaces.get(key)
+        if entry is not None:
+            updated_datetime, surface = entry
+            if updated_datetime == now or (
+                not self.IS_BACKTESTING_DATA_SOURCE
+                and (now - updated_datetime).total_seconds() <= self.GREEKS_CACHE_TTL
+            ):
+                return surface
+        if option_assets is None:
+            return None
+
+        if entry is None:
+            surface = VolatilitySurface(underlying_price, risk_free_rate * 100)
+        else:
+            surface.set_underlying_price(underlying_price)
+            surface.set_interest_rate(risk_free_rate * 100)
+
+        expirations = defaultdict(list)
+        for asset in option_assets:
+            expiration = asset.expiration.date() if isinstance(asset.expiration, datetime) else asset.expiration
+            expirations[expiration].append(asset)
+        for expiration in surface.expirations:
+            if expiration not in expirations:
+                surface.remove(expiration)
+
+        prices = self.get_chain_last_prices(option_assets)
+        for expiration, assets in expirations.items():
+            surface.update(
+                expiration,
+                self._get_days_to_expiration(assets[0], now),
+                strikes=[float(asset.strike) for asset in assets],
+                prices=[prices.get(asset) for asset in assets],
+                is_call=[asset.right.upper() == "CALL" for asset in assets],
+            )
+
+        self._volatility_surfaces[key] = (now, surface)
+        return surface
+
+    def calculate_chain_greeks(
+        self,
+        assets: list,
+        asset_prices: list,
+        underlying_price,
+        risk_free_rate: float,
+    ):
+        """Returns the Greeks of several options at once, eg. a whole option chain.
+
+        The implied volatilities and greeks of all the options are solved in one vectorized call.
+
+        Parameters
+        ----------
+        assets : list[Asset]
+            The option assets.
+        asset_prices : list[float]
+            The price of each option asset.
+        underlying_price : float or list[float]
+            The price of the underlying asset, or the price of the underlying of each option asset.
+        risk_free_rate : float
+            The risk-free rate used in interest calculations.
+
+        Returns
+        -------
+        list[dict]
+            The greeks of each option asset, in the same order as `assets` (see `calculate_greeks`). The greeks are
+            None when the implied volatility can't be computed (eg. the option has no price).
+        """
         current_date = self.get_datetime()
+        strikes = np.empty(len(assets))
+        days_to_expiration = np.empty(len(assets))
+        is_call = np.empty(len(assets), dtype=bool)
+        for i, asset in enumerate(assets):
+            right = asset.right.upper()
+            if right not in ("CALL", "PUT"):
+                raise ValueError(f"Invalid option type {asset.right}, cannot get option greeks")
+            is_call[i] = right == "CALL"
+            strikes[i] = float(asset.strike)
+            days_to_expiration[i] = self._get_days_to_expiration(asset, current_date)
+
+        und_prices = np.broadcast_to(np.asarray(underlying_price, dtype=float), strikes.shape)
+        opt_prices = np.array([np.nan if price is None else float(price) for price in asset_prices])
+        interest = risk_free_rate * 100
 
+        iv = black_scholes.bs_implied_volatility(
+            und_prices, strikes, interest, days_to_expiration, opt_prices, is_call
+        )
+        greeks = black_scholes.bs_greeks(und_prices, strikes, interest, days_to_expiration, iv, is_call)
+
+        result = []
+        for i in range(len(assets)):
+            solved = not np.isnan(iv[i])
+            result.append(
+                dict(
+                    implied_volatility=float(iv[i]) if solved else None,
+                    delta=float(greeks["delta"][i]) if solved else None,
+                    option_price=float(greeks["option_price"][i]) if solved else None,
+                    pv_dividend=None,  # (No equiv )
+                    gamma=float(greeks["gamma"][i]) if solved else None,
+                    vega=float(greeks["vega"][i]) if solved else None,
+                    theta=float(greeks["theta"][i]) if solved else None,
+                    underlying_price=float(und_prices[i]),
+                )
+            )
+        return result
+
+    def _get_days_to_expiration(self, asset, current_date):
+        """Returns the days from current_date to the close (4pm New York time) of the expiration date of asset,
+        allowing for fractional days"""
         # If asset expiration is a datetime object, convert it to date
         expiration = asset.expiration
         if isinstance(expiration, datetime):
@@ -396,41 +610,7 @@ class DataSource(ABC):
         expiration = expiration.astimezone(self.DEFAULT_PYTZ)
         expiration = expiration.replace(hour=16, minute=0, second=0, microsecond=0)
 
-        # Calculate the days to expiration, but allow for fractional days
-        days_to_expiration = (expiration - current_date).total_seconds() / (60 * 60 * 24)
-
-        if asset.right.upper() == "CALL":
-            is_call = True
-            iv = black_scholes.BS(
-                [und_price, float(asset.strike), interest, days_to_expiration],
-                callPrice=opt_price,
-            )
-        elif asset.right.upper() == "PUT":
-            is_call = False
-            iv = black_scholes.BS(
-                [und_price, float(asset.strike), interest, days_to_expiration],
-                putPrice=opt_price,
-            )
-        else:
-            raise ValueError(f"Invalid option type {asset.right}, cannot get option greeks")
-
-        c = black_scholes.BS(
-            [und_price, float(asset.strike), interest, days_to_expiration],
-            volatility=iv.impliedVolatility,
-        )
-
-        greeks = dict(
-            implied_volatility=iv.impliedVolatility,
-            delta=c.callDelta if is_call else c.putDelta,
-            option_price=c.callPrice if is_call else c.putPrice,
-            pv_dividend=None,  # (No equiv )
-            gamma=c.gamma,
-            vega=c.vega,
-            theta=c.callTheta if is_call else c.putTheta,
-            underlying_price=und_price,
-        )
-
-        return greeks
+        return (expiration - current_date).total_seconds() / (60 * 60 * 24)
 
     def query_greeks(self, asset):
         """Query for the Greeks as it can be more accurate than calculating locally."""
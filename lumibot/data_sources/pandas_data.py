@@ -22,14 +22,24 @@ class PandasData(DataSourceBacktesting):
     def __init__(self, *args, pandas_data=None, auto_adjust=True, **kwargs):
         super().__init__(*args, **kwargs)
         self.name = "pandas"
-        self.pandas_data = self._set_pandas_data_keys(pandas_data)
+        # Single store of Data objects keyed by (asset, quote). Every Data tracks its own state (raw -> repaired),
+        # so the bars for each asset only ever exist once. The order of the OrderedDict is used for LRU evictions.
+        self._data_store = self._set_pandas_data_keys(pandas_data)
         self.auto_adjust = auto_adjust
-        self._data_store = OrderedDict()
         self._date_index = None
         self._date_supply = None
         self._timestep = "minute"
         self._expiries_exist = False
 
+    @property
+    def pandas_data(self):
+        """The data store, kept under its historical name for backwards compatibility."""
+        return self._data_store
+
+    @pandas_data.setter
+    def pandas_data(self, pandas_data):
+        self._data_store = self._set_pandas_data_keys(pandas_data)
+
     @staticmethod
     def _set_pandas_data_keys(pandas_data):
         # OrderedDict tracks the LRU dataframes for when it comes time to do evictions.
@@ -62,9 +72,8 @@ class PandasData(DataSourceBacktesting):
                 new_pandas_data[key] = data
 
         return new_pandas_data
-    
+
     def load_data(self):
-        self._data_store = self.pandas_data
         self._expiries_exist = (
             len([v.asset.expiration for v in self._data_store.values() if v.asset.expiration is not None]) > 0
         )
@@ -252,7 +261,10 @@ class PandasData(DataSourceBacktesting):
 
         now = self.get_datetime()
         try:
-            res = data.get_bars(now, length=length, timestep=timestep, timeshift=timeshift)
+            # Zero-copy slices of the data when possible, a resampled dataframe otherwise
+            res = data.get_bars_arrays(now, length=length, timestep=timestep, timeshift=timeshift)
+            if res is None:
+                res = data.get_bars(now, length=length, timestep=timestep, timeshift=timeshift)
         # Return None if data.get_bars returns a ValueError
         except ValueError as e:
             logging.info(f"Error getting bars for {asset}: {e}")
@@ -318,7 +330,10 @@ class PandasData(DataSourceBacktesting):
         asset2 = quote
         if isinstance(asset, tuple):
             asset1, asset2 = asset
-        bars = Bars(response, self.SOURCE, asset1, quote=asset2, raw=response)
+        if isinstance(response, dict):
+            bars = Bars.from_arrays(response, self.SOURCE, asset1, quote=asset2, raw=response)
+        else:
+            bars = Bars(response, self.SOURCE, asset1, quote=asset2, raw=response)
         return bars
 
     def get_yesterday_dividend(self, asset, quote=None):
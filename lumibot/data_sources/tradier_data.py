@@ -220,6 +220,35 @@ class TradierData(DataSource):
         price = self.tradier.market.get_last_price(symbol)
         return price
 
+    def get_chain_last_prices(self, assets):
+        """
+        Returns the last prices of option assets with one option chain request per underlying and expiration,
+        instead of one request per option.
+
+        Parameters
+        ----------
+        assets : list[Asset]
+            The option assets to get the prices for.
+
+        Returns
+        -------
+        dict
+            The last price of each asset, None if Tradier has no price for it.
+        """
+        chains = defaultdict(list)
+        for asset in assets:
+            chains[(asset.symbol, asset.expiration)].append(asset)
+
+        prices = {}
+        for (stock_symbol, expiration), chain_assets in chains.items():
+            df_chains = self.tradier.market.get_option_chains(stock_symbol, expiration)
+            last_prices = dict(zip(df_chains["symbol"], df_chains["last"]))
+            for asset in chain_assets:
+                option_symbol = create_options_symbol(stock_symbol, expiration, asset.right, asset.strike)
+                price = last_prices.get(option_symbol)
+                prices[asset] = None if price is None or pd.isna(price) else float(price)
+        return prices
+
     def query_greeks(self, asset: Asset):
         """
         This function returns the greeks of an option as reported by the Tradier API.
@@ -6,7 +6,7 @@ import numpy
 
 from lumibot.data_sources import DataSourceBacktesting
 from lumibot.entities import Asset, Bars
-from lumibot.tools import YahooHelper
+from lumibot.tools import YahooHelper, get_tail_before
 
 
 class YahooData(DataSourceBacktesting):
@@ -21,6 +21,8 @@ class YahooData(DataSourceBacktesting):
         self.name = "yahoo"
         self.auto_adjust = auto_adjust
         self._data_store = {}
+        # Position of the current backtest datetime in the data of each asset
+        self._cursors = {}
 
     def _append_data(self, asset, data):
         """
@@ -88,9 +90,7 @@ class YahooData(DataSourceBacktesting):
             end = end - timeshift
 
         end = self.to_default_timezone(end)
-        result_data = data[data.index < end]
-
-        result = result_data.tail(length)
+        result = get_tail_before(data, end, length=length, cursors=self._cursors, key=asset)
         return result
 
     def _pull_source_bars(
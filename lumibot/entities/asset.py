@@ -1,4 +1,5 @@
 import logging
+import weakref
 from collections import UserDict
 from datetime import date, datetime
 
@@ -30,6 +31,9 @@ class Asset:
         Price multiplier.
         default : 1
 
+    Assets are immutable. Equal assets created with the same arguments are the same object, so use
+    ``Asset(...)`` with the new values instead of changing the attributes of an asset.
+
     Attributes
     ----------
     symbol : string (required)
@@ -111,13 +115,22 @@ class Asset:
         CRYPTO = "crypto"
         INDEX = "index"
 
-    symbol: str
-    asset_type: str = "stock"
-    expiration: date = None
-    strike: float = 0.0
-    right: str = None
-    multiplier: int = 1
-    precision: str = None
+    # Assets are immutable and interned: creating an asset equal to an existing one returns the existing instance, so
+    # equal assets are usually the same object and the dict lookups keyed by assets are identity checks
+    __slots__ = (
+        "symbol",
+        "asset_type",
+        "expiration",
+        "strike",
+        "right",
+        "multiplier",
+        "precision",
+        "_hash",
+        "__weakref__",
+    )
+
+    # The assets in use, by all their fields. They are dropped once they are not referenced anymore.
+    _instances = weakref.WeakValueDictionary()
 
     # Pull the asset types from the AssetType class
     _asset_types: list = [v for k, v in AssetType.__dict__.items() if not k.startswith("__")]
@@ -125,8 +138,8 @@ class Asset:
     # Pull the rights from the OptionRight class
     _right: list = [v for k, v in OptionRight.__dict__.items() if not k.startswith("__")]
 
-    def __init__(
-        self,
+    def __new__(
+        cls,
         symbol: str,
         asset_type: str = "stock",
         expiration: date = None,
@@ -135,28 +148,70 @@ class Asset:
         multiplier: int = 1,
         precision: str = None,
     ):
-        self.symbol = symbol
-        self.asset_type = asset_type
-        self.strike = strike
-        self.multiplier = multiplier
-        self.precision = precision
+        # The type of the strike is part of the key so that 150 and 150.0 stay distinct (they print differently)
+        key = (symbol, asset_type, expiration, strike, type(strike), right, multiplier, precision)
+        try:
+            asset = cls._instances.get(key)
+        except TypeError:
+            # Unhashable field, the asset can't be interned
+            key = None
+            asset = None
+        if asset is not None:
+            return asset
 
         # If the expiration is a datetime object, convert it to date
         if isinstance(expiration, datetime):
-            self.expiration = expiration.date()
-        else:
-            self.expiration = expiration
+            expiration = expiration.date()
 
         # Multiplier for options must always be 100
         if asset_type == "option":
-            self.multiplier = 100
+            multiplier = 100
 
         # Make sure right is upper case
         if right is not None:
-            self.right = right.upper()
-
-        self.asset_type_must_be_one_of(self.asset_type)
-        self.right_must_be_one_of(self.right)
+            right = right.upper()
+
+        cls.asset_type_must_be_one_of(cls, asset_type)
+        cls.right_must_be_one_of(cls, right)
+
+        # The arguments may have been normalized, look for the asset again
+        normalized_key = (symbol, asset_type, expiration, strike, type(strike), right, multiplier, precision)
+        if key is not None:
+            asset = cls._instances.get(normalized_key)
+            if asset is not None:
+                cls._instances[key] = asset
+                return asset
+
+        asset = super().__new__(cls)
+        for name, value in (
+            ("symbol", symbol),
+            ("asset_type", asset_type),
+            ("expiration", expiration),
+            ("strike", strike),
+            ("right", right),
+            ("multiplier", multiplier),
+            ("precision", precision),
+        ):
+            object.__setattr__(asset, name, value)
+        object.__setattr__(asset, "_hash", hash((symbol, asset_type, expiration, strike, right)))
+
+        if key is not None:
+            cls._instances[normalized_key] = asset
+            cls._instances[key] = asset
+        return asset
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Asset objects are immutable, create a new Asset instead of setting {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Asset objects are immutable, {name} can't be deleted")
+
+    def __reduce__(self):
+        # Unpickled and copied assets are interned too
+        return (
+            self.__class__,
+            (self.symbol, self.asset_type, self.expiration, self.strike, self.right, self.multiplier, self.precision),
+        )
 
     @classmethod
     def symbol2asset(cls, symbol: str):
@@ -193,7 +248,7 @@ class Asset:
             return Asset(symbol=symbol)
 
     def __hash__(self):
-        return hash((self.symbol, self.asset_type, self.expiration, self.strike, self.right))
+        return self._hash
 
     def __repr__(self):
         if self.asset_type == "future":
@@ -212,6 +267,10 @@ class Asset:
             return f"{self.symbol}"
 
     def __eq__(self, other):
+        # Interned assets are usually the same object
+        if self is other:
+            return True
+
         # Check if other is None
         if other is None:
             return False
@@ -1,7 +1,9 @@
 import logging
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
 
 from .bar import Bar
 
@@ -80,6 +82,9 @@ class Bars:
     >>> df = bars.df
     >>> self.log_message(df["close"][-1])
 
+    >>> # The columns are also available as numpy arrays, which is faster than building the dataframe
+    >>> self.log_message(bars.close[-1])
+
     >>> # Get the most recent bars for ES futures contract
     >>> asset = Asset(symbol="ES", asset_type="future", multiplier=100)
     >>> bars = bars.get_bars(asset)
@@ -99,9 +104,10 @@ class Bars:
         df columns: open, high, low, close, volume, dividend, stock_splits
         df index: pd.Timestamp localized at the timezone America/New_York
         """
-        if df.shape[0] == 0:
-            logging.warning(f"Unable to get bar data for {asset} {source}")
-        self.df = df
+        self._df = df
+        # The numpy arrays of the columns and of the datetimes when the bars were created with from_arrays
+        self._arrays = None
+        self._timestamps = None
         self.source = source.upper()
         self.asset = asset
         if isinstance(asset, tuple):
@@ -110,6 +116,103 @@ class Bars:
             self.symbol = asset.symbol.upper()
         self.quote = quote
         self._raw = raw
+        if df is not None and df.shape[0] == 0:
+            logging.warning(f"Unable to get bar data for {asset} {source}")
+
+    @classmethod
+    def from_arrays(cls, arrays, source, asset, quote=None, raw=None):
+        """Create bars backed by numpy arrays, the dataframe is only built if the df attribute is used.
+
+        Parameters
+        ----------
+        arrays : dict
+            The "datetime" array of the bars and the arrays of the columns (open, high, low, close, volume, ...), all
+            of the same length. They are not copied, so they should be read-only when they are views of stored data.
+        source : str
+            The source of the data e.g. (yahoo, alpaca, …)
+        asset : Asset
+            The asset for which the bars are holding data.
+        quote : Asset
+            For cryptocurrency only. The quote asset.
+        raw :
+            The raw data the bars were created from.
+
+        Returns
+        -------
+        Bars
+        """
+        bars = cls(None, source, asset, quote=quote, raw=raw)
+        bars._timestamps = arrays["datetime"]
+        bars._arrays = {column: values for column, values in arrays.items() if column != "datetime"}
+        if len(bars._timestamps) == 0:
+            logging.warning(f"Unable to get bar data for {asset} {source}")
+        return bars
+
+    @property
+    def df(self):
+        """The bars as a DataFrame, built on first access for bars created with from_arrays."""
+        if self._df is None:
+            index = pd.DatetimeIndex(self._timestamps, name="datetime")
+            self._df = pd.DataFrame(self._arrays, index=index)
+        return self._df
+
+    @df.setter
+    def df(self, df):
+        self._df = df
+        self._arrays = None
+        self._timestamps = None
+
+    def _n_bars(self):
+        if self._df is None:
+            return len(self._timestamps)
+        return len(self._df)
+
+    def _column(self, column):
+        if self._arrays is not None:
+            return self._arrays[column]
+        return self._df[column].to_numpy()
+
+    def _has_column(self, column):
+        if self._arrays is not None:
+            return column in self._arrays
+        return column in self._df.columns
+
+    def _datetime_index(self):
+        if self._df is not None:
+            return pd.DatetimeIndex(self._df.index)
+        return pd.DatetimeIndex(self._timestamps)
+
+    @property
+    def timestamps(self):
+        """numpy array of the datetimes of the bars."""
+        if self._timestamps is not None:
+            return self._timestamps
+        return self._df.index.to_numpy()
+
+    @property
+    def open(self):
+        """numpy array of the open prices."""
+        return self._column("open")
+
+    @property
+    def high(self):
+        """numpy array of the high prices."""
+        return self._column("high")
+
+    @property
+    def low(self):
+        """numpy array of the low prices."""
+        return self._column("low")
+
+    @property
+    def close(self):
+        """numpy array of the close prices."""
+        return self._column("close")
+
+    @property
+    def volume(self):
+        """numpy array of the volumes."""
+        return self._column("volume")
 
     def __repr__(self):
         return repr(self.df)
@@ -142,18 +245,19 @@ class Bars:
         -------
         list of Bars objects
         """
+        n_bars = self._n_bars()
+        timestamps = self._datetime_index().asi8 // 10**9
+        columns = {}
+        for column in ["open", "high", "low", "close", "volume"]:
+            columns[column] = self._column(column) if self._has_column(column) else [None] * n_bars
+        for column in ["dividend", "stock_splits"]:
+            columns[column] = self._column(column) if self._has_column(column) else [0] * n_bars
+
         result = []
-        for index, row in self.df.iterrows():
-            item = {
-                "timestamp": int(index.timestamp()),
-                "open": row.get("open"),
-                "high": row.get("high"),
-                "low": row.get("low"),
-                "close": row.get("close"),
-                "volume": row.get("volume"),
-                "dividend": row.get("dividend", 0),
-                "stock_splits": row.get("stock_splits", 0),
-            }
+        for i in range(n_bars):
+            item = {"timestamp": int(timestamps[i])}
+            for column, values in columns.items():
+                item[column] = values[i]
             bar = Bar(item)
             result.append(bar)
 
@@ -171,7 +275,7 @@ class Bars:
         float
 
         """
-        return self.df["close"].iloc[-1]
+        return self.close[-1]
 
     def get_last_dividend(self):
         """Return the last dividend of the last bar
@@ -184,8 +288,8 @@ class Bars:
         -------
         float
         """
-        if "dividend" in self.df.columns:
-            return self.df["dividend"].iloc[-1]
+        if self._has_column("dividend"):
+            return self._column("dividend")[-1]
         else:
             logging.debug("Unable to find 'dividend' column in bars")
             return 0
@@ -259,16 +363,27 @@ class Bars:
         volume = df_copy["volume"].sum()
         return volume
 
-    def aggregate_bars(self, frequency, **grouper_kwargs):
+    def aggregate_bars(self, frequency, session_start=None, include_partial=True, **grouper_kwargs):
         """
         Will convert a set of bars to a different timeframe (eg. 1 min to 15 min)
         frequency (string): The new timeframe that the bars should be in, eg. "15Min", "1H", or "1D"
         Returns a new bars object.
 
+        The buckets are computed with integer divisions of the timestamps and the bars are reduced with numpy, which
+        is much faster than a pandas groupby. The buckets are the same as the ones of pd.Grouper(freq=frequency).
+
         Parameters
         ----------
         frequency : str
             The new timeframe that the bars should be in, eg. "15Min", "1H", or "1D"
+        session_start : datetime.time
+            If given, the buckets are aligned on this time of the day instead of midnight. Eg. with time(9, 30), the
+            "1H" bars are 9:30-10:30, 10:30-11:30, ... Only for timeframes shorter than a day.
+        include_partial : bool
+            Whether to keep the last bar if its bucket isn't over yet (eg. a 15 minutes bar with only 7 minutes of
+            data). True by default.
+        grouper_kwargs :
+            Other arguments of pd.Grouper (eg. origin, offset). The bars are then aggregated with pandas.
 
         Returns
         -------
@@ -279,7 +394,20 @@ class Bars:
         >>> # Get the 15 minute bars for the last hour
         >>> bars = self.get_historical_prices("AAPL", 60, "minute")
         >>> bars_agg = bars.aggregate_bars("15Min")
+
+        >>> # Hourly bars starting at the open, without the bar of the current hour
+        >>> bars_agg = bars.aggregate_bars("1H", session_start=time(9, 30), include_partial=False)
         """
+        if grouper_kwargs:
+            new_df = self._aggregate_df_with_pandas(frequency, **grouper_kwargs)
+        else:
+            new_df = self._aggregate_df(frequency, session_start=session_start, include_partial=include_partial)
+
+        new_bars = Bars(new_df, self.source, self.asset)
+
+        return new_bars
+
+    def _aggregate_df_with_pandas(self, frequency, **grouper_kwargs):
         new_df = self.df.groupby(pd.Grouper(freq=frequency, **grouper_kwargs)).agg(
             {
                 "open": "first",
@@ -290,11 +418,58 @@ class Bars:
             }
         )
         new_df.columns = ["open", "close", "low", "high", "volume"]
-        new_df = new_df.dropna()
+        return new_df.dropna()
+
+    def _aggregate_df(self, frequency, session_start=None, include_partial=True):
+        try:
+            step = to_offset(frequency).nanos
+        except ValueError:
+            # Not a fixed duration (eg. weeks anchored on a day, months)
+            step = None
+        has_nan = any(pd.isna(self._column(column)).any() for column in AGGREGATED_COLUMNS)
+        if step is None or has_nan or (session_start is not None and step >= DAY_NANOS):
+            if session_start is not None or not include_partial:
+                raise ValueError(
+                    f"session_start and include_partial are not supported with the frequency {frequency} or with "
+                    f"missing values in the bars."
+                )
+            return self._aggregate_df_with_pandas(frequency)
+
+        index = self._datetime_index()
+        order = None
+        if not index.is_monotonic_increasing:
+            order = np.argsort(index.asi8, kind="stable")
+            index = index[order]
+        columns = {column: self._column(column) for column in AGGREGATED_COLUMNS}
+        if order is not None:
+            columns = {column: values[order] for column, values in columns.items()}
+
+        if len(index) == 0:
+            return pd.DataFrame(columns=AGGREGATED_COLUMNS, index=index)
+
+        labels = _bucket_labels(index, step, session_start)
+        keys = labels.asi8
+        starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        ends = np.concatenate([starts[1:], [len(labels)]])
+
+        new_df = pd.DataFrame(
+            {
+                "open": columns["open"][starts],
+                "close": columns["close"][ends - 1],
+                "low": np.minimum.reduceat(columns["low"], starts),
+                "high": np.maximum.reduceat(columns["high"], starts),
+                "volume": np.add.reduceat(columns["volume"], starts),
+            },
+            index=pd.DatetimeIndex(labels[starts], name=index.name),
+        )
 
-        new_bars = Bars(new_df, self.source, self.asset)
+        if not include_partial and len(index) > 1:
+            # The last bucket is over if it ends no later than one input bar after the last timestamp
+            bar_step = np.diff(index.asi8).min()
+            if keys[-1] + step > index.asi8[-1] + bar_step:
+                new_df = new_df.iloc[:-1]
 
-        return new_bars
+        return new_df
 
 
 class NoBarDataFound(Exception):
@@ -305,33 +480,43 @@ class NoBarDataFound(Exception):
         )
         super(NoBarDataFound, self).__init__(message)
 
-    def aggregate_bars(self, frequency):
-        """
-        Will convert a set of bars to a different timeframe (eg. 1 min to 15 min)
-        frequency (string): The new timeframe that the bars should be in, eg. "15Min", "1H", or "1D"
-        Returns a new bars object.
-        """
-        new_df = self.df.groupby(pd.Grouper(freq=frequency)).agg(
-            {
-                "open": "first",
-                "close": "last",
-                "low": "min",
-                "high": "max",
-                "volume": "sum",
-            }
-        )
-        new_df.columns = ["open", "close", "low", "high", "volume"]
-        new_df = new_df.dropna()
 
-        new_bars = Bars(new_df, self.source, self.asset)
+# The columns of the aggregated bars, in the order of aggregate_bars
+AGGREGATED_COLUMNS = ["open", "close", "low", "high", "volume"]
+DAY_NANOS = 24 * 60 * 60 * 10**9
 
-        return new_bars
 
+def _bucket_labels(index, step, session_start=None):
+    """Returns the start of the bucket of each timestamp of index, as a DatetimeIndex.
 
-class NoBarDataFound(Exception):
-    def __init__(self, source, asset):
-        message = (
-            f"{source} did not return data for symbol {asset}. "
-            f"Make sure there is no symbol typo or use another data source"
-        )
-        super(NoBarDataFound, self).__init__(message)
+    Same buckets as pd.Grouper(freq=step): counted from the midnight of the first day, in wall clock days for daily
+    buckets and in elapsed time otherwise. With session_start, the buckets are aligned on that time of each day.
+    """
+    wall_clock = index.tz_localize(None) if index.tz is not None else index
+    wall = wall_clock.asi8
+    first_midnight = wall_clock[0].normalize().value
+
+    if session_start is not None:
+        # Counted from the session start of each day in wall clock time, so steps that don't divide a day don't drift
+        shift = (session_start.hour * 3600 + session_start.minute * 60 + session_start.second) * 10**9
+        day = wall // DAY_NANOS * DAY_NANOS
+        labels = day + shift + (wall - day - shift) // step * step
+        return _localize_labels(labels, index.tz)
+
+    if step % DAY_NANOS == 0:
+        labels = first_midnight + (wall - first_midnight) // step * step
+        return _localize_labels(labels, index.tz)
+
+    # The origin is the first midnight as an instant, the buckets are counted in elapsed time from there
+    origin = index[0].normalize().value if index.tz is not None else first_midnight
+    labels = pd.DatetimeIndex(origin + (index.asi8 - origin) // step * step)
+    if index.tz is None:
+        return labels
+    return labels.tz_localize("UTC").tz_convert(index.tz)
+
+
+def _localize_labels(labels, tz):
+    labels = pd.DatetimeIndex(labels)
+    if tz is None:
+        return labels
+    return labels.tz_localize(tz, ambiguous="NaT", nonexistent="shift_forward")
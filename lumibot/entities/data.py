@@ -9,6 +9,9 @@ from lumibot.tools.helpers import parse_timestep_qty_and_unit, to_datetime_aware
 from .asset import Asset
 from .dataline import Dataline
 
+# The columns of the bars returned by get_bars
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+
 
 class Data:
     """Input and manage Pandas dataframes for backtesting.
@@ -70,6 +73,10 @@ class Data:
     iter_index : Pandas Series
         Datetime in the index, range count in values. Used to retrieve
         the current df iteration for this data and datetime.
+    state : str
+        Either `Data.State.RAW` (the dataframe is exactly as it was loaded) or
+        `Data.State.REPAIRED` (the dataframe has been reindexed and filled by
+        `repair_times_and_fill` and the datalines are available).
 
     Methods
     -------
@@ -100,6 +107,10 @@ class Data:
         Returns bars in the form of a dataframe.
     """
 
+    class State:
+        RAW = "raw"
+        REPAIRED = "repaired"
+
     MIN_TIMESTEP = "minute"
     TIMESTEP_MAPPING = [
         {"timestep": "day", "representations": ["1D", "day"]},
@@ -143,6 +154,7 @@ class Data:
             )
 
         self.timestep = timestep
+        self.state = self.State.RAW
 
         self.df = self.columns(df)
 
@@ -287,6 +299,9 @@ class Data:
             df.loc[df[col].isna(), col] = df.loc[df[col].isna(), "close"]
 
         self.df = df
+        # Whether the bars are already aligned on the timestep, so get_bars_arrays doesn't need to resample them
+        aligned_index = df.index.normalize() if self.timestep == "day" else df.index.floor("min")
+        self._index_on_timestep = bool((df.index == aligned_index).all())
 
         iter_index = pd.Series(df.index)
         self.iter_index = pd.Series(iter_index.index, index=iter_index)
@@ -294,6 +309,12 @@ class Data:
 
         self.datalines = dict()
         self.to_datalines()
+        self.state = self.State.REPAIRED
+
+    @property
+    def is_repaired(self):
+        """True once the dataframe has been reindexed and filled by repair_times_and_fill."""
+        return getattr(self, "state", None) == self.State.REPAIRED
 
     def to_datalines(self):
         self.datalines.update(
@@ -328,8 +349,9 @@ class Data:
         # known data (this speeds up the process)
         i = None
 
-        # Check if we have the iter_index_dict, if not then repair the times and fill (which will create the iter_index_dict)
-        if getattr(self, "iter_index_dict", None) is None:
+        # Check if the data has been repaired, if not then repair the times and fill
+        # (which will create the iter_index_dict)
+        if not self.is_repaired:
             self.repair_times_and_fill(self.df.index)
 
         # Search for dt in self.iter_index_dict
@@ -357,7 +379,7 @@ class Data:
                 )
 
             # Search for dt in self.iter_index_dict
-            if getattr(self, "iter_index_dict", None) is None:
+            if not self.is_repaired:
                 self.repair_times_and_fill(self.df.index)
 
             if dt in self.iter_index_dict:
@@ -532,6 +554,53 @@ class Data:
 
         return df_result
 
+    def get_bars_arrays(self, dt, length=1, timestep=MIN_TIMESTEP, timeshift=0):
+        """Returns the same bars as get_bars, as zero-copy slices of the datalines instead of a dataframe.
+
+        The slices are read-only views, so the bars handed to a strategy can't change the stored data.
+
+        Only possible when the bars don't need to be resampled, ie. when the timestep is the timestep of the data and
+        there are no missing values. Otherwise None is returned and get_bars should be used.
+
+        Parameters
+        ----------
+        dt : datetime.datetime
+            The datetime to get the data.
+        length : int
+            The number of periods to get the data.
+        timestep : str
+            The frequency of the data to get the data.
+        timeshift : int
+            The number of periods to shift the data.
+
+        Returns
+        -------
+        dict or None
+            The "datetime", "open", "high", "low", "close" and "volume" read-only numpy arrays.
+        """
+        quantity, unit = parse_timestep_qty_and_unit(timestep)
+        if quantity != 1 or unit != self.timestep:
+            return None
+
+        if not self.is_repaired:
+            self.repair_times_and_fill(self.df.index)
+        if not self._index_on_timestep or not all(column in self.datalines for column in BAR_COLUMNS):
+            return None
+
+        data = self._get_bars_dict(dt, length=length, timestep=timestep, timeshift=timeshift)
+        if data is None:
+            return None
+        arrays = {}
+        for column in ["datetime", *BAR_COLUMNS]:
+            values = data[column].view()
+            values.setflags(write=False)
+            arrays[column] = values
+        # get_bars drops the bars with missing values
+        if any(pd.isna(arrays[column]).any() for column in BAR_COLUMNS):
+            return None
+
+        return arrays
+
     def get_bars_between_dates(self, timestep=MIN_TIMESTEP, exchange=None, start_date=None, end_date=None):
         """Returns a dataframe of all the data available between the start and end dates.
 
@@ -2,15 +2,18 @@ import logging
 import uuid
 from collections import namedtuple
 from decimal import Decimal
-from threading import Event
+from threading import Event, Lock
 
 import lumibot.entities as entities
-from lumibot.tools.types import check_positive, check_price, check_quantity
+from lumibot.tools.types import check_positive, check_price, check_quantity, get_numeric_mode
 
 SELL = "sell"
 BUY = "buy"
 
 VALID_STATUS = ["unprocessed", "new", "open", "submitted", "fill", "partial_fill", "canceled", "error", "cash_settled"]
+# Guards the lazy creation of the order events, see Order._get_event
+_EVENTS_LOCK = Lock()
+
 STATUS_ALIAS_MAP = {
     "cancelled": "canceled",
     "cancel": "canceled",
@@ -292,12 +295,9 @@ class Order:
         # Cryptocurrency market.
         self.pair = f"{self.asset.symbol}/{self.quote.symbol}" if self.asset.asset_type == "crypto" else pair
 
-        # setting events
-        self._new_event = Event()
-        self._canceled_event = Event()
-        self._partial_filled_event = Event()
-        self._filled_event = Event()
-        self._closed_event = Event()
+        # The events (new, canceled, partial_filled, filled, closed) that were set, and the threading.Event of the ones
+        # that are waited for. The Events are only created when waited for, backtests never wait for orders.
+        self._events = None
 
         # setting internal variables
         self._raw = None
@@ -547,12 +547,10 @@ class Order:
     @quantity.setter
     def quantity(self, value):
         # All non-crypto assets must be of type 'int'.
-        if not isinstance(value, Decimal):
-            if isinstance(value, float):
-                value = Decimal(str(value))
+        if isinstance(value, float) and get_numeric_mode() == "decimal":
+            value = Decimal(str(value))
 
-        quantity = Decimal(value)
-        self._quantity = check_quantity(quantity, "Order quantity must be a positive Decimal")
+        self._quantity = check_quantity(value, "Order quantity must be a positive Decimal")
 
     def __hash__(self):
         return hash(self.identifier)
@@ -572,13 +570,13 @@ class Order:
         )
 
     def __repr__(self):
-        self.rep_asset = self.symbol
+        rep_asset = self.symbol
         if self.asset.asset_type == "crypto":
-            self.rep_asset = f"{self.pair}"
+            rep_asset = f"{self.pair}"
         elif self.asset.asset_type == "future":
-            self.rep_asset = f"{self.symbol} {self.asset.expiration}"
+            rep_asset = f"{self.symbol} {self.asset.expiration}"
         elif self.asset.asset_type == "option":
-            self.rep_asset = f"{self.symbol} {self.asset.expiration} " f"{self.asset.right} {self.asset.strike}"
+            rep_asset = f"{self.symbol} {self.asset.expiration} " f"{self.asset.right} {self.asset.strike}"
 
         price = None
         for attribute in ["limit_price", "stop_price", "take_profit_price"]:
@@ -588,7 +586,7 @@ class Order:
         if self.is_filled():
             price = self.get_fill_price()
 
-        repr_str = f"{self.type} order of | {self.quantity} {self.rep_asset} {self.side} |"
+        repr_str = f"{self.type} order of | {self.quantity} {rep_asset} {self.side} |"
         if price:
             repr_str = f"{repr_str} at price ${price}"
         if self.order_class:
@@ -691,7 +689,7 @@ class Order:
         self.status = "error"
         self._error = error
         self.error_message = str(error)
-        self._closed_event.set()
+        self._set_event("closed")
 
     def was_transmitted(self):
         return self._transmitted
@@ -726,28 +724,50 @@ class Order:
 
     # ======Setting the events methods===========
 
+    def _set_event(self, name):
+        with _EVENTS_LOCK:
+            if self._events is None:
+                self._events = {}
+            event = self._events.get(name)
+            if isinstance(event, Event):
+                event.set()
+            else:
+                self._events[name] = True
+
+    def _get_event(self, name):
+        with _EVENTS_LOCK:
+            if self._events is None:
+                self._events = {}
+            event = self._events.get(name)
+            if not isinstance(event, Event):
+                is_set = event is True
+                event = self._events[name] = Event()
+                if is_set:
+                    event.set()
+            return event
+
     def set_new(self):
-        self._new_event.set()
+        self._set_event("new")
 
     def set_canceled(self):
-        self._canceled_event.set()
-        self._closed_event.set()
+        self._set_event("canceled")
+        self._set_event("closed")
 
     def set_partially_filled(self):
-        self._partial_filled_event.set()
+        self._set_event("partial_filled")
 
     def set_filled(self):
-        self._filled_event.set()
-        self._closed_event.set()
+        self._set_event("filled")
+        self._set_event("closed")
 
     # =========Waiting methods==================
 
     def wait_to_be_registered(self):
         logging.info("Waiting for order %r to be registered" % self)
-        self._new_event.wait()
+        self._get_event("new").wait()
         logging.info("Order %r registered" % self)
 
     def wait_to_be_closed(self):
         logging.info("Waiting for broker to execute order %r" % self)
-        self._closed_event.wait()
+        self._get_event("closed").wait()
         logging.info("Order %r executed by broker" % self)
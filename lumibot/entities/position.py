@@ -1,6 +1,7 @@
 from decimal import Decimal, getcontext
 
 import lumibot.entities as entities
+from lumibot.tools.types import to_quantity
 
 
 class Position:
@@ -71,7 +72,7 @@ class Position:
 
     @quantity.setter
     def quantity(self, value):
-        self._quantity = Decimal(value)
+        self._quantity = to_quantity(value)
 
     @property
     def hold(self):
@@ -152,6 +153,6 @@ class Position:
 
     def add_order(self, order: entities.Order, quantity: Decimal = Decimal(0)):
         increment = quantity if order.side == "buy" else -quantity
-        self._quantity += Decimal(increment)
+        self._quantity += to_quantity(increment)
         if order not in self.orders:
             self.orders.append(order)
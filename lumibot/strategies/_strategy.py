@@ -9,13 +9,21 @@ import pandas as pd
 from lumibot.backtesting import BacktestingBroker, PolygonDataBacktesting
 from lumibot.entities import Asset, Position
 from lumibot.tools import (
+    BackgroundReports,
+    ChartBuffer,
+    OnlineMetrics,
+    RiskFreeRateCurve,
     create_tearsheet,
     day_deduplicate,
+    get_benchmark_returns,
+    get_numeric_mode,
     get_symbol_returns,
     plot_indicators,
     plot_returns,
+    set_numeric_mode,
     stats_summary,
     to_datetime_aware,
+    to_quantity,
 )
 from lumibot.traders import Trader
 
@@ -76,8 +84,10 @@ class _Strategy:
             Defaults to "1M" (1 minute).
         stats_file : str
             The file name to save the stats to.
-        risk_free_rate : float
-            The risk-free rate to use for calculating the Sharpe ratio.
+        risk_free_rate : float or pd.Series
+            The risk-free rate to use for calculating the Sharpe ratio and the greeks, as a decimal (eg. 0.05 for 5%).
+            Can be a series of rates indexed by date, the rate of the closest date is used. Defaults to the 13 week
+            treasury rate (^IRX).
         benchmark_asset : Asset or str
             The asset to use as the benchmark for the strategy. Defaults to "SPY". Strings are converted to
             Asset objects with an asset_type="stock".
@@ -191,6 +201,11 @@ class _Strategy:
         self._is_backtesting = self.broker.IS_BACKTESTING_BROKER
         self._benchmark_asset = benchmark_asset
 
+        # A fixed rate, a custom curve of rates by date or None to use the 13 week treasury rates
+        if isinstance(risk_free_rate, pd.Series):
+            risk_free_rate = RiskFreeRateCurve(risk_free_rate)
+        self._risk_free_rate = risk_free_rate
+
         # Get the backtesting start and end dates from the broker data source if we are backtesting
         if self._is_backtesting:
             if self.broker.data_source.datetime_start is not None and self.broker.data_source.datetime_end is not None:
@@ -200,11 +215,14 @@ class _Strategy:
         # Force start immediately if we are backtesting
         self.force_start_immediately = force_start_immediately
 
-        # Initialize the chart markers list
-        self._chart_markers_list = []
+        # Initialize the chart markers, a marker is unique by timestamp, name and symbol
+        self._chart_markers = ChartBuffer(
+            ["datetime", "timestamp", "name", "symbol", "color", "size", "value", "detail_text"],
+            key=["timestamp", "name", "symbol"],
+        )
 
-        # Initialize the chart lines list
-        self._chart_lines_list = []
+        # Initialize the chart lines
+        self._chart_lines = ChartBuffer(["datetime", "name", "value", "color", "style", "width", "detail_text"])
 
         # Hold the asset objects for strings for stocks only.
         self._asset_mapping = dict()
@@ -221,7 +239,7 @@ class _Strategy:
                     position = Position(
                         self._name,
                         asset,
-                        Decimal(quantity),
+                        to_quantity(quantity),
                         orders=None,
                         hold=0,
                         available=Decimal(quantity),
@@ -287,6 +305,12 @@ class _Strategy:
         self._stats = None
         self._stats_list = []
         self._analysis = {}
+        # Handle on the reports of the backtest when they are rendered in the background, see backtest_analysis
+        self.backtest_reports = None
+        # Performance metrics updated at each iteration, see Strategy.portfolio_total_return, portfolio_drawdown, etc.
+        self._online_metrics = OnlineMetrics()
+        # Streaming indicators by (asset, timestep, quote), fed before each iteration, see Strategy.add_indicator
+        self._indicator_feeds = {}
 
         # Storing parameters for the initialize method
         if not hasattr(self, "parameters") or not isinstance(self.parameters, dict) or self.parameters is None:
@@ -340,7 +364,7 @@ class _Strategy:
         position = Position(
             self._name,
             self.quote_asset,
-            Decimal(cash),
+            to_quantity(cash),
             orders=None,
             hold=0,
             available=Decimal(cash),
@@ -575,6 +599,10 @@ class _Strategy:
                 # for other timeframes as well
                 backtesting_end_adjusted = self._backtesting_end
 
+                # The returns of the benchmark are cached for the other backtests over the same range (eg. the runs
+                # of a parameter sweep). They are only saved to the disk once the range is over.
+                persist = backtesting_end_adjusted.date() < datetime.date.today()
+
                 # If we are using the polgon data source, then get the benchmark returns from polygon
                 if type(self.broker.data_source) == PolygonDataBacktesting:
                     benchmark_asset = self._benchmark_asset
@@ -587,22 +615,37 @@ class _Strategy:
                     if "D" in str(self._sleeptime):
                         timestep = "day"
 
-                    bars = self.broker.data_source.get_historical_prices_between_dates(
-                        benchmark_asset,
-                        timestep,
-                        start_date=self._backtesting_start,
-                        end_date=backtesting_end_adjusted,
-                        quote=self._quote_asset,
+                    def load_polygon_returns():
+                        bars = self.broker.data_source.get_historical_prices_between_dates(
+                            benchmark_asset,
+                            timestep,
+                            start_date=self._backtesting_start,
+                            end_date=backtesting_end_adjusted,
+                            quote=self._quote_asset,
+                        )
+                        if bars is None:
+                            return None
+                        df = bars.df
+
+                        # Add returns column
+                        df["return"] = df["close"].pct_change()
+
+                        # Add the symbol_cumprod column
+                        df["symbol_cumprod"] = (1 + df["return"]).cumprod()
+                        return df
+
+                    self._benchmark_returns_df = get_benchmark_returns(
+                        (
+                            self.broker.data_source.SOURCE,
+                            benchmark_asset,
+                            self._quote_asset,
+                            timestep,
+                            self._backtesting_start,
+                            backtesting_end_adjusted,
+                        ),
+                        load_polygon_returns,
+                        persist=persist,
                     )
-                    df = bars.df
-
-                    # Add returns column
-                    df["return"] = df["close"].pct_change()
-
-                    # Add the symbol_cumprod column
-                    df["symbol_cumprod"] = (1 + df["return"]).cumprod()
-
-                    self._benchmark_returns_df = df
 
                 # For data sources of type CCXT, benchmark_asset gets bechmark_asset from the CCXT backtest data source.
                 elif self.broker.data_source.SOURCE.upper() == "CCXT":
@@ -621,26 +664,45 @@ class _Strategy:
                     if "D" in str(self._sleeptime):
                         timestep = "day"
 
-                    bars = self.broker.data_source.get_historical_prices_between_dates(
-                        benchmark_asset,
-                        timestep,
-                        start_date=self._backtesting_start,
-                        end_date=backtesting_end_adjusted,
-                        quote=self._quote_asset,
+                    def load_ccxt_returns():
+                        bars = self.broker.data_source.get_historical_prices_between_dates(
+                            benchmark_asset,
+                            timestep,
+                            start_date=self._backtesting_start,
+                            end_date=backtesting_end_adjusted,
+                            quote=self._quote_asset,
+                        )
+                        if bars is None:
+                            return None
+                        df = bars.df
+
+                        # Add the symbol_cumprod column
+                        df["symbol_cumprod"] = (1 + df["return"]).cumprod()
+                        return df
+
+                    self._benchmark_returns_df = get_benchmark_returns(
+                        (
+                            self.broker.data_source.name,
+                            benchmark_asset,
+                            self._quote_asset,
+                            timestep,
+                            self._backtesting_start,
+                            backtesting_end_adjusted,
+                        ),
+                        load_ccxt_returns,
+                        persist=persist,
                     )
-                    df = bars.df
-
-                    # Add the symbol_cumprod column
-                    df["symbol_cumprod"] = (1 + df["return"]).cumprod()
-
-                    self._benchmark_returns_df = df
 
                 # If we are using any other data source, then get the benchmark returns from yahoo
                 else:
-                    self._benchmark_returns_df = get_symbol_returns(
-                        self._benchmark_asset,
-                        self._backtesting_start,
-                        backtesting_end_adjusted,
+                    self._benchmark_returns_df = get_benchmark_returns(
+                        ("yahoo", self._benchmark_asset, "day", self._backtesting_start, backtesting_end_adjusted),
+                        lambda: get_symbol_returns(
+                            self._benchmark_asset,
+                            self._backtesting_start,
+                            backtesting_end_adjusted,
+                        ),
+                        persist=persist,
                     )
 
         for handler in logger.handlers:
@@ -654,23 +716,48 @@ class _Strategy:
         trades_df=None,
         show_plot=True,
     ):
-        if not show_plot:
+        task = self._plot_returns_vs_benchmark_task(plot_file_html, trades_df, show_plot)
+        if task is not None:
+            func, args, kwargs = task
+            func(*args, **kwargs)
+
+    def _update_indicators(self):
+        """Feed the streaming indicators added with add_indicator with the bars since the previous iteration."""
+        if not self._indicator_feeds:
             return
+
+        now = self.get_datetime()
+        for (asset, timestep, quote), feed in self._indicator_feeds.items():
+
+            def get_bars(length):
+                bars = self.get_historical_prices(asset, length, timestep, quote=quote)
+                return bars.df if bars is not None else None
+
+            feed.update(get_bars, now)
+
+    def _plot_returns_vs_benchmark_task(self, plot_file_html, trades_df, show_plot):
+        """Returns the (function, args, kwargs) that plots the returns, None if there is nothing to plot."""
+        if not show_plot:
+            return None
         elif self._strategy_returns_df is None:
             self.logger.warning("Cannot plot returns because the strategy returns are missing")
         elif self._benchmark_returns_df is None:
             self.logger.warning("Cannot plot returns because the benchmark returns are missing")
         else:
-            plot_returns(
-                self._strategy_returns_df,
-                f"{self._log_strat_name()}Strategy",
-                self._benchmark_returns_df,
-                str(self._benchmark_asset),
-                plot_file_html,
-                trades_df,
-                show_plot,
-                initial_budget=self._initial_budget,
+            return (
+                plot_returns,
+                (
+                    self._strategy_returns_df,
+                    f"{self._log_strat_name()}Strategy",
+                    self._benchmark_returns_df,
+                    str(self._benchmark_asset),
+                    plot_file_html,
+                    trades_df,
+                    show_plot,
+                ),
+                dict(initial_budget=self._initial_budget),
             )
+        return None
 
     def tearsheet(
         self,
@@ -678,6 +765,13 @@ class _Strategy:
         tearsheet_file=None,
         show_tearsheet=True,
     ):
+        task = self._tearsheet_task(save_tearsheet, tearsheet_file, show_tearsheet)
+        if task is not None:
+            func, args, kwargs = task
+            func(*args, **kwargs)
+
+    def _tearsheet_task(self, save_tearsheet, tearsheet_file, show_tearsheet):
+        """Returns the (function, args, kwargs) that creates the tearsheet, None if there is nothing to create."""
         if not save_tearsheet and not show_tearsheet:
             return None
 
@@ -686,17 +780,21 @@ class _Strategy:
 
         if self._strategy_returns_df is None:
             self.logger.warning("Cannot create a tearsheet because the strategy returns are missing")
-        else:
-            strat_name = self._name if self._name is not None else "Strategy"
-            create_tearsheet(
+            return None
+
+        strat_name = self._name if self._name is not None else "Strategy"
+        return (
+            create_tearsheet,
+            (
                 self._strategy_returns_df,
                 strat_name,
                 tearsheet_file,
                 self._benchmark_returns_df,
                 self._benchmark_asset,
                 show_tearsheet,
-                risk_free_rate=self.risk_free_rate,
-            )
+            ),
+            dict(risk_free_rate=self.risk_free_rate),
+        )
 
     @classmethod
     def run_backtest(
@@ -732,6 +830,8 @@ class _Strategy:
         indicators_file=None,
         show_indicators=True,
         save_logfile=True,
+        background_reports=False,
+        numeric_mode="decimal",
         **kwargs,
     ):
         """Backtest a strategy.
@@ -753,8 +853,8 @@ class _Strategy:
             The number of seconds to sleep between each iteration of the backtest.
         stats_file : str
             The file to write the stats to.
-        risk_free_rate : float
-            The risk-free rate to use.
+        risk_free_rate : float or pd.Series
+            The risk-free rate to use, or a series of rates by date. Defaults to the 13 week treasury rate.
         logfile : str
             The file to write the log to.
         config : dict
@@ -811,6 +911,14 @@ class _Strategy:
             Whether to show the indicators plot.
         save_logfile : bool
             Whether to save the logfile. Defaults to True. If False, the logfile will not be saved.
+        background_reports : bool
+            Whether to create the plots and the tearsheet in a background process. If True, the results are returned
+            as soon as the backtest is done and `strategy.backtest_reports` can be used to wait for the reports.
+            Defaults to False.
+        numeric_mode : str
+            How the quantities of the orders, positions, fills and fees are stored. "decimal" (the default) keeps an
+            exact decimal accounting, "float" uses native floats, which is faster when exact quantities are not
+            needed. The mode is used during the backtest only, the previous mode is restored at the end.
 
 
         Returns
@@ -949,56 +1057,64 @@ class _Strategy:
             )
             return None
 
-        trader = Trader(logfile=logfile, backtest=True)
-        data_source = datasource_class(
-            backtesting_start,
-            backtesting_end,
-            config=config,
-            auto_adjust=auto_adjust,
-            api_key=api_key,
-            pandas_data=pandas_data,
-            **kwargs,
-        )
-        if hasattr(data_source, "has_paid_subscription"):
-            data_source.has_paid_subscription = polygon_has_paid_subscription
-
-        # if hasattr(data_source, 'pandas_data'):
-        #     data_source.pandas_data = pandas_data
-
-        backtesting_broker = BacktestingBroker(data_source)
-        strategy = cls(
-            backtesting_broker,
-            minutes_before_closing=minutes_before_closing,
-            minutes_before_opening=minutes_before_opening,
-            sleeptime=sleeptime,
-            risk_free_rate=risk_free_rate,
-            stats_file=stats_file,
-            benchmark_asset=benchmark_asset,
-            backtesting_start=backtesting_start,
-            backtesting_end=backtesting_end,
-            pandas_data=pandas_data,
-            quote_asset=quote_asset,
-            starting_positions=starting_positions,
-            name=name,
-            budget=budget,
-            parameters=parameters,
-            buy_trading_fees=buy_trading_fees,
-            sell_trading_fees=sell_trading_fees,
-            **kwargs,
-        )
-        trader.add_strategy(strategy)
+        # Before creating the broker and the strategy, which create the first positions. The previous mode is
+        # restored after the backtest, so it doesn't leak to the other strategies of the process
+        previous_numeric_mode = get_numeric_mode()
+        set_numeric_mode(numeric_mode)
+        try:
+            trader = Trader(logfile=logfile, backtest=True)
+            data_source = datasource_class(
+                backtesting_start,
+                backtesting_end,
+                config=config,
+                auto_adjust=auto_adjust,
+                api_key=api_key,
+                pandas_data=pandas_data,
+                **kwargs,
+            )
+            if hasattr(data_source, "has_paid_subscription"):
+                data_source.has_paid_subscription = polygon_has_paid_subscription
+
+            # if hasattr(data_source, 'pandas_data'):
+            #     data_source.pandas_data = pandas_data
+
+            backtesting_broker = BacktestingBroker(data_source)
+            strategy = cls(
+                backtesting_broker,
+                minutes_before_closing=minutes_before_closing,
+                minutes_before_opening=minutes_before_opening,
+                sleeptime=sleeptime,
+                risk_free_rate=risk_free_rate,
+                stats_file=stats_file,
+                benchmark_asset=benchmark_asset,
+                backtesting_start=backtesting_start,
+                backtesting_end=backtesting_end,
+                pandas_data=pandas_data,
+                quote_asset=quote_asset,
+                starting_positions=starting_positions,
+                name=name,
+                budget=budget,
+                parameters=parameters,
+                buy_trading_fees=buy_trading_fees,
+                sell_trading_fees=sell_trading_fees,
+                **kwargs,
+            )
+            trader.add_strategy(strategy)
 
-        logger = logging.getLogger("backtest_stats")
-        logger.setLevel(logging.INFO)
-        logger.info("Starting backtest...")
-        start = datetime.datetime.now()
+            logger = logging.getLogger("backtest_stats")
+            logger.setLevel(logging.INFO)
+            logger.info("Starting backtest...")
+            start = datetime.datetime.now()
 
-        result = trader.run_all(
-            show_plot=show_plot,
-            show_tearsheet=show_tearsheet,
-            save_tearsheet=save_tearsheet,
-            show_indicators=show_indicators,
-        )
+            result = trader.run_all(
+                show_plot=show_plot,
+                show_tearsheet=show_tearsheet,
+                save_tearsheet=save_tearsheet,
+                show_indicators=show_indicators,
+                background_reports=background_reports,
+            )
+        finally:
+            set_numeric_mode(previous_numeric_mode)
 
         end = datetime.datetime.now()
         backtesting_length = backtesting_end - backtesting_start
@@ -1027,6 +1143,7 @@ class _Strategy:
         trades_file=None,
         settings_file=None,
         indicators_file=None,
+        background_reports=False,
     ):
         name = self._name
 
@@ -1051,30 +1168,47 @@ class _Strategy:
 
         backtesting_broker = self.broker
         backtesting_broker.export_trade_events_to_csv(trades_file)
-        self.plot_returns_vs_benchmark(
+
+        # The reports to create, as (function, args, kwargs)
+        tasks = []
+        task = self._plot_returns_vs_benchmark_task(
             plot_file_html,
             backtesting_broker._trade_event_log_df,
-            show_plot=show_plot,
+            show_plot,
         )
+        if task is not None:
+            tasks.append(task)
         # Create chart lines dataframe
-        chart_lines_df = pd.DataFrame(self._chart_lines_list)
+        chart_lines_df = self._chart_lines.to_df()
         # Create chart markers dataframe
-        chart_markers_df = pd.DataFrame(self._chart_markers_list)
+        chart_markers_df = self._chart_markers.to_df()
 
         # Check if we have at least one indicator to plot
         if chart_markers_df is not None and chart_lines_df is not None:
-            plot_indicators(
-                indicators_file,
-                chart_markers_df,
-                chart_lines_df,
-                f"{self._log_strat_name()}Strategy Indicators",
-                show_indicators=show_indicators,
+            tasks.append(
+                (
+                    plot_indicators,
+                    (
+                        indicators_file,
+                        chart_markers_df,
+                        chart_lines_df,
+                        f"{self._log_strat_name()}Strategy Indicators",
+                    ),
+                    dict(show_indicators=show_indicators),
+                )
             )
-        self.tearsheet(
-            save_tearsheet=save_tearsheet,
-            tearsheet_file=tearsheet_file,
-            show_tearsheet=show_tearsheet,
-        )
+        task = self._tearsheet_task(save_tearsheet, tearsheet_file, show_tearsheet)
+        if task is not None:
+            tasks.append(task)
+
+        if background_reports:
+            # Return right away, the reports are rendered in another process
+            self.backtest_reports = BackgroundReports(
+                tasks, files=[plot_file_html, indicators_file, tearsheet_file]
+            )
+        else:
+            for func, args, kwargs in tasks:
+                func(*args, **kwargs)
 
     @classmethod
     def verify_backtest_inputs(cls, backtesting_start, backtesting_end):
@@ -1140,6 +1274,8 @@ class _Strategy:
         indicators_file=None,
         show_indicators=True,
         save_logfile=True,
+        background_reports=False,
+        numeric_mode="decimal",
         **kwargs,
     ):
         """Backtest a strategy.
@@ -1161,8 +1297,8 @@ class _Strategy:
             The number of seconds to sleep between each iteration of the backtest.
         stats_file : str
             The file to write the stats to.
-        risk_free_rate : float
-            The risk free rate to use.
+        risk_free_rate : float or pd.Series
+            The risk free rate to use, or a series of rates by date. Defaults to the 13 week treasury rate.
         logfile : str
             The file to write the log to.
         config : dict
@@ -1219,6 +1355,12 @@ class _Strategy:
             Whether to show the indicators plot.
         save_logfile : bool
             Whether to save the logs to a file. If False, the logs will not be saved to a file. Default is True.
+        background_reports : bool
+            Whether to create the plots and the tearsheet in a background process, so that the results are returned
+            as soon as the backtest is done. Default is False.
+        numeric_mode : str
+            "decimal" (the default) for an exact decimal accounting of the quantities, or "float" to use native
+            floats, which is faster. See `run_backtest`.
 
         Returns
         -------
@@ -1285,6 +1427,8 @@ class _Strategy:
             indicators_file=indicators_file,
             show_indicators=show_indicators,
             save_logfile=save_logfile,
+            background_reports=background_reports,
+            numeric_mode=numeric_mode,
             **kwargs,
         )
         return results
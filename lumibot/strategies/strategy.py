@@ -20,7 +20,7 @@ import requests
 from termcolor import colored
 
 from lumibot.entities import Asset, Order
-from lumibot.tools import get_risk_free_rate
+from lumibot.tools import IndicatorFeed, RiskFreeRateCurve, get_risk_free_rate
 
 from ._strategy import _Strategy
 
@@ -326,8 +326,103 @@ class Strategy(_Strategy):
     def analysis(self):
         return self._analysis
 
+    @property
+    def portfolio_total_return(self):
+        """Returns the return of the portfolio since the strategy started, updated after each iteration.
+
+        Returns
+        -------
+        float
+            The total return, eg. 0.05 for 5%.
+
+        Example
+        -------
+        >>> self.log_message(f"Total return: {self.portfolio_total_return:.2%}")
+        """
+        return self._online_metrics.total_return
+
+    @property
+    def portfolio_volatility(self):
+        """Returns the annualized volatility of the portfolio returns since the strategy started, updated after each
+        iteration.
+
+        Returns
+        -------
+        float
+            The annualized standard deviation of the returns, 0 until there are enough returns.
+        """
+        return self._online_metrics.volatility
+
+    @property
+    def portfolio_sharpe_ratio(self):
+        """Returns the Sharpe ratio of the portfolio since the strategy started, updated after each iteration.
+
+        Returns
+        -------
+        float
+            (CAGR - risk free rate) / volatility, 0 until there are enough returns.
+        """
+        if self._online_metrics.volatility == 0:
+            return 0.0
+        return self._online_metrics.sharpe(self.risk_free_rate or 0)
+
+    @property
+    def portfolio_high_water_mark(self):
+        """Returns the highest portfolio value since the strategy started, updated after each iteration.
+
+        Returns
+        -------
+        float or None
+            The highest portfolio value, None before the first iteration.
+        """
+        return self._online_metrics.high_water_mark
+
+    @property
+    def portfolio_drawdown(self):
+        """Returns the current drawdown of the portfolio, updated after each iteration.
+
+        Returns
+        -------
+        float
+            The drop of the portfolio value from the high water mark, eg. 0.1 for 10% below it.
+
+        Example
+        -------
+        >>> # Stop trading after a 20% drawdown
+        >>> if self.portfolio_drawdown > 0.2:
+        >>>     self.sell_all()
+        """
+        return self._online_metrics.drawdown
+
+    @property
+    def portfolio_max_drawdown(self):
+        """Returns the biggest drawdown of the portfolio since the strategy started, updated after each iteration.
+
+        Returns
+        -------
+        float
+            The biggest drop of the portfolio value from a high water mark, eg. 0.1 for 10%.
+        """
+        return self._online_metrics.max_drawdown
+
     @property
     def risk_free_rate(self):
+        """Returns the risk-free rate at the current datetime, as a decimal (eg. 0.05 for 5%).
+
+        This is the rate passed to the strategy (a fixed rate or a series of rates by date) or by default the 13 week
+        treasury rate (^IRX) of the closest day.
+
+        Returns
+        -------
+        float
+            The risk-free rate, 0 if it is not available.
+        """
+        if isinstance(self._risk_free_rate, RiskFreeRateCurve):
+            rate = self._risk_free_rate.get_rate(self.get_datetime())
+            return rate if rate is not None else 0
+        if self._risk_free_rate is not None:
+            return self._risk_free_rate
+
         # Get the current datetime
         now = self.get_datetime()
 
@@ -2208,6 +2303,10 @@ class Strategy(_Strategy):
         and rates are expensive, so they should be passed in as arguments
         most of the time.
 
+        The greeks are cached, so asking again for the same option during
+        the same bar (or within a few seconds when trading live, see
+        DataSource.GREEKS_CACHE_TTL) doesn't query the prices again.
+
         Parameters
         ----------
         asset : Asset
@@ -2264,25 +2363,200 @@ class Strategy(_Strategy):
             )
             return None
 
-        # Do the expensize API calls here if needed
-        opt_price = asset_price if asset_price is not None else self.get_last_price(asset)
         if risk_free_rate is not None:
             risk_free_rate = risk_free_rate
         else:
             risk_free_rate = self.risk_free_rate
+
+        # The same contract is often requested several times per iteration (sizing, hedging, logging...), so
+        # reuse the greeks and skip the price lookups below when possible
+        data_source = self.broker.data_source
+        cache_key = ("get_greeks", asset, asset_price, underlying_price, risk_free_rate)
+        greeks = data_source.get_cached_greeks(cache_key)
+        if greeks is not None:
+            return greeks
+
+        # Do the expensize API calls here if needed
+        opt_price = asset_price if asset_price is not None else self.get_last_price(asset)
         if underlying_price is None:
             underlying_asset = Asset(symbol=asset.symbol, asset_type="stock")
             und_price = self.get_last_price(underlying_asset)
         else:
             und_price = underlying_price
 
-        return self.broker.get_greeks(
+        greeks = self.broker.get_greeks(
             asset,
             asset_price=opt_price,
             underlying_price=und_price,
             risk_free_rate=risk_free_rate,
+            # Already cached here, under a key that doesn't need the prices
+            use_cache=False,
+        )
+        data_source.cache_greeks(cache_key, greeks)
+        return greeks
+
+    def get_chain_greeks(
+        self,
+        asset,
+        expiration,
+        right=None,
+        strikes=None,
+        underlying_price=None,
+        risk_free_rate=None,
+        chains=None,
+    ):
+        """Returns the greeks of every option of a chain for one expiration, as a DataFrame.
+
+        The prices of all the options are fetched in bulk and the implied volatilities and greeks are computed in
+        one vectorized call, which is much faster than calling `get_greeks` for each strike.
+
+        Parameters
+        ----------
+        asset : Asset or str
+            The underlying asset of the option chain.
+        expiration : datetime.date
+            The expiration date of the options.
+        right : str, optional
+            "CALL" or "PUT". By default both calls and puts are returned.
+        strikes : list of float, optional
+            The strikes to return. By default all the strikes of the chain for the expiration.
+        underlying_price : float, optional
+            The price of the underlying asset, by default the last price.
+        risk_free_rate : float, optional
+            The risk-free rate used in interest calculations, by default `self.risk_free_rate`.
+        chains : dict, optional
+            The chains returned by `get_chains`, to avoid getting them again.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per option, sorted by right and strike, with the columns asset, right, strike, expiration,
+            option_price, implied_volatility, delta, gamma, vega, theta and underlying_price. The greeks are NaN
+            for options without a price.
+
+        Example
+        -------
+        >>> # Will return the call of SPY with the delta closest to 0.3
+        >>> df = self.get_chain_greeks("SPY", expiration=date(2023, 8, 18), right="CALL")
+        >>> call = df.loc[(df["delta"] - 0.3).abs().idxmin(), "asset"]
+        """
+        asset = self._sanitize_user_asset(asset)
+        if isinstance(expiration, datetime.datetime):
+            expiration = expiration.date()
+        if chains is None:
+            chains = self.get_chains(asset)
+
+        option_assets = self._get_chain_option_assets(asset, chains, expiration, right=right, strikes=strikes)
+
+        columns = ["asset", "right", "strike", "expiration", "option_price", "implied_volatility", "delta", "gamma",
+                   "vega", "theta", "underlying_price"]
+        if not option_assets:
+            return pd.DataFrame(columns=columns)
+
+        if risk_free_rate is None:
+            risk_free_rate = self.risk_free_rate
+        if underlying_price is None:
+            underlying_price = self.get_last_price(asset)
+
+        data_source = self.broker.data_source
+        prices = data_source.get_chain_last_prices(option_assets)
+        greeks = data_source.calculate_chain_greeks(
+            option_assets, [prices.get(option) for option in option_assets], underlying_price, risk_free_rate
         )
 
+        df = pd.DataFrame(greeks)
+        df.insert(0, "asset", option_assets)
+        df.insert(1, "right", [option.right for option in option_assets])
+        df.insert(2, "strike", [float(option.strike) for option in option_assets])
+        df.insert(3, "expiration", expiration)
+        # The market prices, not the theoretical prices returned by calculate_chain_greeks
+        df["option_price"] = [prices.get(option) for option in option_assets]
+        return df[columns]
+
+    def get_volatility_surface(
+        self,
+        asset,
+        expirations,
+        strikes=None,
+        underlying_price=None,
+        risk_free_rate=None,
+        chains=None,
+    ):
+        """Returns the implied volatility surface of an option chain, by expiration and strike.
+
+        The surface is updated at most once per bar (or every few seconds when trading live) and is cached in
+        between, so it can be queried for any strike and expiration without pricing the chain again. The surface is
+        kept from one bar to the next and only the implied volatilities whose inputs changed (the option price, the
+        underlying price or the time to expiration) are solved again, when the surface is first queried.
+
+        Parameters
+        ----------
+        asset : Asset or str
+            The underlying asset of the option chain.
+        expirations : list of datetime.date
+            The expirations of the options in the surface.
+        strikes : list of float, optional
+            The strikes of the options in the surface. By default all the strikes of the chain.
+        underlying_price : float, optional
+            The price of the underlying asset, by default the last price.
+        risk_free_rate : float, optional
+            The risk-free rate used in interest calculations, by default `self.risk_free_rate`.
+        chains : dict, optional
+            The chains returned by `get_chains`, to avoid getting them again.
+
+        Returns
+        -------
+        VolatilitySurface
+            Volatilities are in percent (see `lumibot.tools.VolatilitySurface`).
+
+        Example
+        -------
+        >>> surface = self.get_volatility_surface("SPY", expirations=[date(2023, 8, 18), date(2023, 9, 15)])
+        >>> # The skew of an expiration that is not in the chain, between 95% and 105% of the underlying price
+        >>> ivs = surface.implied_volatility(date(2023, 9, 1), [0.95 * surface.underlying_price,
+        ...                                                     1.05 * surface.underlying_price])
+        >>> skew = ivs[0] - ivs[1]
+        >>> # The fair value of a call with the interpolated volatility
+        >>> price = surface.price(date(2023, 9, 1), 450, is_call=True)
+        """
+        asset = self._sanitize_user_asset(asset)
+        expirations = sorted(exp.date() if isinstance(exp, datetime.datetime) else exp for exp in expirations)
+        key = (asset, tuple(expirations), None if strikes is None else tuple(sorted(strikes)))
+
+        data_source = self.broker.data_source
+        surface = data_source.get_volatility_surface(key)
+        if surface is not None:
+            return surface
+
+        if chains is None:
+            chains = self.get_chains(asset)
+        option_assets = []
+        for expiration in expirations:
+            option_assets.extend(self._get_chain_option_assets(asset, chains, expiration, strikes=strikes))
+
+        if risk_free_rate is None:
+            risk_free_rate = self.risk_free_rate
+        if underlying_price is None:
+            underlying_price = self.get_last_price(asset)
+
+        return data_source.get_volatility_surface(key, option_assets, underlying_price, risk_free_rate)
+
+    def _get_chain_option_assets(self, asset, chains, expiration, right=None, strikes=None):
+        """Returns the option assets of chains for one expiration, sorted by right and strike."""
+        rights = [right.upper()] if right is not None else ["CALL", "PUT"]
+        option_assets = []
+        for option_right in rights:
+            # Depending on the data source, the expirations are dates or "%Y-%m-%d" strings
+            right_chains = chains["Chains"][option_right]
+            chain_strikes = right_chains.get(expiration, right_chains.get(expiration.strftime("%Y-%m-%d"), []))
+            if strikes is not None:
+                chain_strikes = [strike for strike in chain_strikes if strike in strikes]
+            for strike in sorted(chain_strikes):
+                option_assets.append(
+                    Asset(asset.symbol, asset_type="option", expiration=expiration, strike=strike, right=option_right)
+                )
+        return option_assets
+
     # ======= Data Source Methods =================
 
     @property
@@ -2662,13 +2936,6 @@ class Strategy(_Strategy):
         if value is None:
             value = self.get_portfolio_value()
 
-        # Check for duplicate markers
-        if len(self._chart_markers_list) > 0:
-            timestamp = dt.timestamp()
-            for marker in self._chart_markers_list:
-                if marker["timestamp"] == timestamp and marker["name"] == name and marker["symbol"] == symbol:
-                    return None
-
         new_marker = {
             "datetime": dt,
             "timestamp": dt.timestamp(),  # This is to speed up the process of finding duplicate markers
@@ -2680,7 +2947,9 @@ class Strategy(_Strategy):
             "detail_text": detail_text,
         }
 
-        self._chart_markers_list.append(new_marker)
+        # Duplicate markers (same timestamp, name and symbol) are ignored
+        if not self._chart_markers.append(**new_marker):
+            return None
 
         return new_marker
 
@@ -2693,7 +2962,7 @@ class Strategy(_Strategy):
             The markers on the indicator chart.
         """
 
-        df = pd.DataFrame(self._chart_markers_list)
+        df = self._chart_markers.to_df()
 
         return df
 
@@ -2771,16 +3040,14 @@ class Strategy(_Strategy):
             dt = self.get_datetime()
 
         # Whenever you want to add a new line, use the following code
-        self._chart_lines_list.append(
-            {
-                "datetime": dt,
-                "name": name,
-                "value": value,
-                "color": color,
-                "style": style,
-                "width": width,
-                "detail_text": detail_text,
-            }
+        self._chart_lines.append(
+            datetime=dt,
+            name=name,
+            value=value,
+            color=color,
+            style=style,
+            width=width,
+            detail_text=detail_text,
         )
 
     def get_lines_df(self):
@@ -2792,7 +3059,7 @@ class Strategy(_Strategy):
             The lines on the indicator chart.
         """
 
-        df = pd.DataFrame(self._chart_lines_list)
+        df = self._chart_lines.to_df()
 
         return df
 
@@ -2819,6 +3086,57 @@ class Strategy(_Strategy):
             json = jsonpickle.encode(settings)
             outfile.write(json)
 
+    def add_indicator(self, indicator, asset, timestep="day", quote=None):
+        """Adds a streaming indicator (SMA, EMA, RSI, MACD, ATR, BollingerBands, VWAP) of an asset.
+
+        The indicator is warmed up with the last bars of the asset, then updated with each new bar before every
+        trading iteration. Only the new bars are fetched and the indicator is updated in constant time, so it's much
+        faster than computing the indicator over the full window of get_historical_prices at each iteration.
+
+        Parameters
+        ----------
+        indicator : StreamingIndicator
+            The indicator, eg. RSI(14). It should only be added once.
+        asset : Asset or str
+            The asset whose bars update the indicator.
+        timestep : str
+            The timestep of the bars, "day" by default. Eg. "minute", "15 minutes", "day".
+        quote : Asset
+            The quote currency for crypto currencies. Default is the quote asset for the strategy.
+
+        Returns
+        -------
+        StreamingIndicator
+            The indicator, already warmed up. Its value is in indicator.value (None if there isn't enough data yet).
+
+        Example
+        -------
+        >>> from lumibot.tools import MACD, RSI
+        >>>
+        >>> def initialize(self):
+        >>>     self.rsi = self.add_indicator(RSI(14), "SPY")
+        >>>     self.macd = self.add_indicator(MACD(), "SPY")
+        >>>
+        >>> def on_trading_iteration(self):
+        >>>     if self.rsi.ready and self.macd.ready and self.rsi.value < 30 and self.macd.histogram > 0:
+        >>>         self.submit_order(self.create_order("SPY", 10, "buy"))
+        """
+        if quote is None:
+            quote = self.quote_asset
+        asset = self._sanitize_user_asset(asset)
+
+        key = (asset, timestep, quote)
+        feed = self._indicator_feeds.get(key)
+        if feed is None:
+            step, _ = self.broker.data_source.convert_timestep_str_to_timedelta(timestep)
+            feed = self._indicator_feeds[key] = IndicatorFeed(step)
+        feed.add(indicator)
+
+        # Warm the indicator up right away so it can be used in the current iteration
+        self._update_indicators()
+
+        return indicator
+
     def get_historical_prices(
         self,
         asset: Union[Asset, str],
@@ -3069,6 +3387,35 @@ class Strategy(_Strategy):
             exchange=exchange,
         )
 
+    def prefetch_data(self, assets, timestep="minute", length=1):
+        """Declare the assets that the strategy will probably need soon.
+
+        In backtesting, data sources that support it (eg. PolygonDataBacktesting) will start downloading the data
+        for these assets in the background while the backtest keeps running, so the download time overlaps with
+        the simulation instead of blocking it. For other data sources this does nothing.
+
+        Parameters
+        ----------
+        assets : list of Asset objects or str
+            The assets that will probably be requested soon.
+        timestep : str
+            The timestep that will be requested. For example, "minute" or "day".
+        length : int
+            The number of bars that will be requested.
+
+        Returns
+        -------
+        None
+
+        Example
+        -------
+        >>> # Start downloading the option contracts we will probably trade tomorrow
+        >>> asset = Asset("SPY", asset_type="option", expiration=expiration, strike=400, right="CALL")
+        >>> self.prefetch_data([asset], timestep="minute")
+        """
+        assets = [self._sanitize_user_asset(asset) for asset in assets]
+        self.broker.data_source.prefetch(assets, timestep=timestep, quote=self.quote_asset, length=length)
+
     def start_realtime_bars(self, asset, keep_bars=30):
         """Starts a real time stream of tickers for Interactive Broker
         only.
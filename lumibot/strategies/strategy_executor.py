@@ -299,6 +299,7 @@ class StrategyExecutor(Thread):
         result["portfolio_value"] = self.strategy.portfolio_value
         result["cash"] = self.strategy.cash
         self.strategy._append_row(result)
+        self.strategy._online_metrics.update(result["portfolio_value"], result["datetime"])
         return result
 
     # =======Lifecycle methods====================
@@ -366,6 +367,7 @@ class StrategyExecutor(Thread):
 
         # Time-consuming
         try:
+            self.strategy._update_indicators()
             on_trading_iteration()
 
             self.strategy._first_iteration = False
@@ -910,36 +912,41 @@ class StrategyExecutor(Thread):
         #####
         # The main loop for running any strategy
         ####
-        while self.broker.should_continue() and self.should_continue:
-            try:
-                self._run_trading_session()
-            except Exception as e:
-                # The bot crashed so log the error, call the on_bot_crash method, and continue
-                self.strategy.logger.error(e)
-                self.strategy.logger.error(traceback.format_exc())
+        try:
+            while self.broker.should_continue() and self.should_continue:
                 try:
-                    self._on_bot_crash(e)
-                except Exception as e1:
-                    self.strategy.logger.error(e1)
+                    self._run_trading_session()
+                except Exception as e:
+                    # The bot crashed so log the error, call the on_bot_crash method, and continue
+                    self.strategy.logger.error(e)
                     self.strategy.logger.error(traceback.format_exc())
+                    try:
+                        self._on_bot_crash(e)
+                    except Exception as e1:
+                        self.strategy.logger.error(e1)
+                        self.strategy.logger.error(traceback.format_exc())
 
-                # In BackTesting, we want to stop the bot if it crashes so there isn't an infinite loop
-                if self.strategy.is_backtesting:
-                    raise RuntimeError("Exception encountered, stopping BackTest.") from e
+                    # In BackTesting, we want to stop the bot if it crashes so there isn't an infinite loop
+                    if self.strategy.is_backtesting:
+                        raise RuntimeError("Exception encountered, stopping BackTest.") from e
 
-                # Only stop the strategy if it's time, otherwise keep running the bot
-                if not self._strategy_sleep():
-                    self.result = self.strategy._analysis
-                    return False
+                    # Only stop the strategy if it's time, otherwise keep running the bot
+                    if not self._strategy_sleep():
+                        self.result = self.strategy._analysis
+                        return False
 
-        try:
-            self._on_strategy_end()
-        except Exception as e:
-            self.strategy.logger.error(e)
-            self.strategy.logger.error(traceback.format_exc())
-            self._on_bot_crash(e)
-            self.result = self.strategy._analysis
-            return False
+            try:
+                self._on_strategy_end()
+            except Exception as e:
+                self.strategy.logger.error(e)
+                self.strategy.logger.error(traceback.format_exc())
+                self._on_bot_crash(e)
+                self.result = self.strategy._analysis
+                return False
 
-        self.result = self.strategy._analysis
-        return True
+            self.result = self.strategy._analysis
+            return True
+        finally:
+            if self.strategy.is_backtesting:
+                # Don't let queued prefetch downloads keep running (and the interpreter waiting) after the backtest
+                self.broker.data_source.cancel_prefetch()
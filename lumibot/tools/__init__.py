@@ -5,7 +5,11 @@
 # TODO: is being loaded when simply trying to load anything from the tools module. It's better to import the specific
 # TODO: functions and classes that you need from the tools module. This has made everything from black_scholes to
 # TODO: yahoo_helper all interrelated and it's a mess.
+from .background_reports import BackgroundReports
+from .benchmark_returns import get_benchmark_returns
 from .black_scholes import BS
+from .chart_buffer import ChartBuffer
+from .coverage_index import CoverageIndex
 from .debugers import *
 from .decorators import append_locals, execute_after, snatch_locals, staticdecorator
 from .helpers import *
@@ -25,7 +29,21 @@ from .indicators import (
     total_return,
     volatility,
 )
+from .metrics import OnlineMetrics, compute_metrics
 from .pandas import *
+from .risk_free_rate import RiskFreeRateCurve
+from .streaming_indicators import (
+    ATR,
+    EMA,
+    MACD,
+    RSI,
+    SMA,
+    VWAP,
+    BollingerBands,
+    IndicatorFeed,
+    StreamingIndicator,
+)
 from .types import *
+from .volatility_surface import VolatilitySurface
 from .yahoo_helper import YahooHelper
 from .ccxt_data_store import CcxtCacheDB
@@ -0,0 +1,77 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+
+def render_reports(tasks):
+    """Run the report tasks one after the other. Each task is a tuple (function, args, kwargs).
+
+    A failing report is logged and doesn't prevent the next ones from being rendered.
+
+    Returns
+    -------
+    list
+        The names of the functions that failed.
+    """
+    failed = []
+    for func, args, kwargs in tasks:
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logging.exception(f"Could not create the report {func.__name__}")
+            failed.append(func.__name__)
+    return failed
+
+
+class BackgroundReports:
+    """Handle on backtest reports (plots, tearsheet, ...) that are rendered in a background process.
+
+    The reports are rendered one after the other in a single separate process, so the backtest results can be used
+    right away. Python waits for the reports to be done before exiting.
+
+    Parameters
+    ----------
+    tasks : list[tuple]
+        The reports to render, as (function, args, kwargs) tuples. Everything must be picklable.
+    files : list[str]
+        The files that the reports write, for reference.
+
+    Example
+    -------
+    >>> result, strategy = MyStrategy.run_backtest(..., background_reports=True)
+    >>> # Use the result right away, then wait for the reports if needed
+    >>> strategy.backtest_reports.wait()
+    """
+
+    def __init__(self, tasks, files=None):
+        self.files = list(files or [])
+        executor = ProcessPoolExecutor(max_workers=1)
+        self._future = executor.submit(render_reports, tasks)
+        # Don't block, the worker exits once the reports are rendered
+        executor.shutdown(wait=False)
+
+    def __repr__(self):
+        return f"BackgroundReports(done={self.done()}, files={self.files})"
+
+    def done(self):
+        """Returns True once all the reports were rendered (or failed)."""
+        return self._future.done()
+
+    def wait(self, timeout=None):
+        """Wait for the reports to be rendered.
+
+        Parameters
+        ----------
+        timeout : float
+            The maximum number of seconds to wait, None to wait until they are done.
+
+        Returns
+        -------
+        list[str]
+            The names of the reports that failed, see render_reports.
+
+        Raises
+        ------
+        concurrent.futures.TimeoutError
+            If the reports are not done after timeout seconds.
+        """
+        return self._future.result(timeout=timeout)
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from lumibot import LUMIBOT_CACHE_FOLDER
+
+BENCHMARK_RETURNS_CACHE_FOLDER = Path(LUMIBOT_CACHE_FOLDER) / "benchmark_returns"
+# The only columns the plots and the tearsheet use, the other ones are not cached
+BENCHMARK_COLUMNS = ("open", "high", "low", "close", "return", "symbol_cumprod")
+
+# Benchmark returns already loaded in this process, by key
+_benchmark_returns = {}
+_benchmark_returns_lock = threading.Lock()
+
+
+def get_benchmark_returns(key, loader, persist=True):
+    """Returns the benchmark returns cached under key, calling loader to get them the first time.
+
+    The returns are kept in memory for the other backtests of the process (eg. the runs of a parameter sweep) and, if
+    persist is True, saved to a feather file in the lumibot cache folder for the next processes. Only the columns
+    used by the plots and the tearsheet are kept (see BENCHMARK_COLUMNS), as float64.
+
+    Parameters
+    ----------
+    key : tuple
+        Identifies the returns, eg. (data source, asset, timestep, start, end).
+    loader : callable
+        Takes no argument and returns the returns DataFrame, or None if there are no returns.
+    persist : bool
+        Whether to save the returns to the disk. Should be False when the range isn't over yet, as more data will come.
+
+    Returns
+    -------
+    pd.DataFrame or None
+        A copy of the cached returns, so callers can modify it.
+    """
+    key = tuple(str(part) for part in key)
+    with _benchmark_returns_lock:
+        df = _benchmark_returns.get(key)
+        if df is None:
+            cache_file = get_benchmark_returns_file(key)
+            if cache_file.exists():
+                df = _read_returns(cache_file)
+            else:
+                df = loader()
+                if df is None:
+                    return None
+                df = _compact(df)
+                if persist:
+                    _write_returns(cache_file, df)
+            _benchmark_returns[key] = df
+    return df.copy()
+
+
+def get_benchmark_returns_file(key):
+    """The file where the benchmark returns cached under key are saved."""
+    digest = hashlib.sha1(repr(tuple(str(part) for part in key)).encode()).hexdigest()
+    return BENCHMARK_RETURNS_CACHE_FOLDER / f"{digest}.feather"
+
+
+def clear_benchmark_returns_cache():
+    """Forget the benchmark returns kept in memory. The files saved to the disk are kept."""
+    with _benchmark_returns_lock:
+        _benchmark_returns.clear()
+
+
+def _compact(df):
+    columns = [column for column in df.columns if str(column).lower() in BENCHMARK_COLUMNS]
+    df = df[columns].astype("float64")
+    df.index.name = "datetime"
+    return df
+
+
+def _write_returns(cache_file, df):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        df.reset_index(names="datetime").to_feather(cache_file)
+    except Exception as e:
+        # Not being able to cache the returns is not a reason to fail the backtest
+        logging.warning(f"Could not save the benchmark returns to {cache_file}: {e}")
+
+
+def _read_returns(cache_file):
+    df = pd.read_feather(cache_file)
+    return df.set_index("datetime")
@@ -1,6 +1,9 @@
 from math import e, log
 
+import numpy as np
+
 try:
+    from scipy.special import ndtr
     from scipy.stats import norm
 except ImportError:
     print("Mibian requires scipy to work properly")
@@ -618,3 +621,214 @@ class Me:
             - self.underlyingPrice
             + (self.strikePrice / ((1 + self.interestRate) ** self.daysToExpiration))
         )
+
+
+# ===================Vectorized Black-Scholes==========================
+# The functions below take numpy arrays (or scalars, which are broadcast) so that a whole option chain is priced
+# in one call. They use the same units as the BS class: interest rates and volatilities in percent, time in days.
+
+
+def _as_result(value):
+    """Return 0-d arrays (all the arguments were scalars) as numpy scalars."""
+    return value[()] if value.ndim == 0 else value
+
+
+def _bs_inputs(underlying_price, strike_price, interest_rate, days_to_expiration, is_call):
+    underlying_price, strike_price, interest_rate, days_to_expiration, is_call = np.broadcast_arrays(
+        np.asarray(underlying_price, dtype=float),
+        np.asarray(strike_price, dtype=float),
+        np.asarray(interest_rate, dtype=float) / 100,
+        np.asarray(days_to_expiration, dtype=float) / 365,
+        np.asarray(is_call, dtype=bool),
+    )
+    return underlying_price, strike_price, interest_rate, days_to_expiration, is_call
+
+
+def _bs_price_vega(underlying_price, strike_price, interest_rate, years, volatility, is_call):
+    """Price and vega (per unit of volatility) of options with years > 0 and volatility > 0 (as decimals)."""
+    sqrt_years = np.sqrt(years)
+    a = volatility * sqrt_years
+    d1 = (np.log(underlying_price / strike_price) + (interest_rate + volatility**2 / 2) * years) / a
+    d2 = d1 - a
+    discounted_strike = strike_price * np.exp(-interest_rate * years)
+    call = underlying_price * ndtr(d1) - discounted_strike * ndtr(d2)
+    put = discounted_strike * ndtr(-d2) - underlying_price * ndtr(-d1)
+    vega = underlying_price * np.exp(-(d1**2) / 2) / np.sqrt(2 * np.pi) * sqrt_years
+    return np.where(is_call, call, put), vega
+
+
+def bs_greeks(underlying_price, strike_price, interest_rate, days_to_expiration, volatility, is_call=True):
+    """Returns the Black-Scholes price and greeks of European options, vectorized over all the arguments.
+
+    Parameters
+    ----------
+    underlying_price : float or np.ndarray
+    strike_price : float or np.ndarray
+    interest_rate : float or np.ndarray
+        Interest rate in percent, eg. 5 for 5%.
+    days_to_expiration : float or np.ndarray
+    volatility : float or np.ndarray
+        Volatility in percent, eg. 20 for 20%.
+    is_call : bool or np.ndarray
+        True for calls, False for puts.
+
+    Returns
+    -------
+    dict
+        option_price, delta, gamma, vega, theta and rho, each an array (or a scalar if all the arguments were
+        scalars). Vega and rho are per 1% change and theta is per day, like the BS class. Expired options and
+        options with no volatility are valued at their intrinsic value.
+    """
+    underlying_price, strike_price, interest_rate, years, is_call = _bs_inputs(
+        underlying_price, strike_price, interest_rate, days_to_expiration, is_call
+    )
+    volatility = np.broadcast_to(np.asarray(volatility, dtype=float) / 100, underlying_price.shape)
+
+    # Expired options and options without volatility are valued at their intrinsic value
+    live = (years > 0) & (volatility > 0)
+    safe_years = np.where(live, years, 1.0)
+    safe_volatility = np.where(live, volatility, 1.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt_years = np.sqrt(safe_years)
+        a = safe_volatility * sqrt_years
+        d1 = (np.log(underlying_price / strike_price) + (interest_rate + safe_volatility**2 / 2) * safe_years) / a
+        d2 = d1 - a
+        discount = np.exp(-interest_rate * safe_years)
+        pdf_d1 = np.exp(-(d1**2) / 2) / np.sqrt(2 * np.pi)
+        sign = np.where(is_call, 1.0, -1.0)
+        cdf_d1 = ndtr(sign * d1)
+        cdf_d2 = ndtr(sign * d2)
+
+        price = sign * (underlying_price * cdf_d1 - strike_price * discount * cdf_d2)
+        delta = sign * cdf_d1
+        gamma = pdf_d1 / (underlying_price * a)
+        vega = underlying_price * pdf_d1 * sqrt_years / 100
+        theta = (
+            -underlying_price * pdf_d1 * safe_volatility / (2 * sqrt_years)
+            - sign * interest_rate * strike_price * discount * cdf_d2
+        ) / 365
+        rho = sign * strike_price * safe_years * discount * cdf_d2 / 100
+
+    intrinsic = np.maximum(np.where(is_call, underlying_price - strike_price, strike_price - underlying_price), 0.0)
+    in_the_money = np.where(is_call, underlying_price > strike_price, underlying_price < strike_price)
+    greeks = dict(
+        option_price=np.where(live, price, intrinsic),
+        delta=np.where(live, delta, np.where(in_the_money, np.where(is_call, 1.0, -1.0), 0.0)),
+        gamma=np.where(live, gamma, 0.0),
+        vega=np.where(live, vega, 0.0),
+        theta=np.where(live, theta, 0.0),
+        rho=np.where(live, rho, 0.0),
+    )
+    return {key: _as_result(value) for key, value in greeks.items()}
+
+
+def bs_price(underlying_price, strike_price, interest_rate, days_to_expiration, volatility, is_call=True):
+    """Returns the Black-Scholes price of European options, vectorized over all the arguments (see bs_greeks)."""
+    return bs_greeks(underlying_price, strike_price, interest_rate, days_to_expiration, volatility, is_call)[
+        "option_price"
+    ]
+
+
+def bs_implied_volatility(
+    underlying_price,
+    strike_price,
+    interest_rate,
+    days_to_expiration,
+    option_price,
+    is_call=True,
+    high=500.0,
+    low=0.0,
+    tolerance=1e-8,
+    max_iterations=100,
+):
+    """Returns the Black-Scholes implied volatility (in percent) of European options, vectorized over all the
+    arguments.
+
+    Each volatility is solved with Newton's method on the option vega, falling back to a bisection step whenever
+    the Newton step leaves the bracket [low, high] that is known to contain the solution, so it always converges.
+
+    Like impliedVolatility, `high` is returned when the price is above the price at the highest volatility and
+    0.001 when the option price is below its intrinsic value. Options with no price or that are expired get NaN.
+
+    Parameters
+    ----------
+    underlying_price : float or np.ndarray
+    strike_price : float or np.ndarray
+    interest_rate : float or np.ndarray
+        Interest rate in percent, eg. 5 for 5%.
+    days_to_expiration : float or np.ndarray
+    option_price : float or np.ndarray
+    is_call : bool or np.ndarray
+        True for calls, False for puts.
+    high : float
+        Highest volatility searched, in percent.
+    low : float
+        Lowest volatility searched, in percent.
+    tolerance : float
+        The solver stops once the model price is within this distance of the option price.
+    max_iterations : int
+
+    Returns
+    -------
+    np.ndarray or float
+    """
+    underlying_price, strike_price, interest_rate, years, is_call = _bs_inputs(
+        underlying_price, strike_price, interest_rate, days_to_expiration, is_call
+    )
+    option_price = np.broadcast_to(np.asarray(option_price, dtype=float), underlying_price.shape)
+    high = high / 100
+    low = low / 100
+
+    iv = np.full(underlying_price.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        valid = (option_price > 0) & (years > 0) & (underlying_price > 0) & (strike_price > 0)
+        below_intrinsic = valid & np.where(
+            is_call, underlying_price > strike_price + option_price, strike_price > underlying_price + option_price
+        )
+        iv[below_intrinsic] = 0.001 / 100
+        valid &= ~below_intrinsic
+
+        max_price, _ = _bs_price_vega(underlying_price, strike_price, interest_rate, np.where(valid, years, 1.0),
+                                      high, is_call)
+        above_high = valid & (max_price < option_price)
+        iv[above_high] = high
+        valid &= ~above_high
+
+        # Solve the remaining options, dropping them from the working arrays as they converge
+        idx = np.flatnonzero(valid.ravel())
+        s = underlying_price.ravel()[idx]
+        k = strike_price.ravel()[idx]
+        r = interest_rate.ravel()[idx]
+        t = years.ravel()[idx]
+        target = option_price.ravel()[idx]
+        calls = is_call.ravel()[idx]
+        lo = np.full(idx.shape, low)
+        hi = np.full(idx.shape, high)
+        # Brenner-Subrahmanyam approximation as the starting point
+        sigma = np.clip(np.sqrt(2 * np.pi / t) * target / s, max(low, 1e-4), high)
+        result = iv.ravel()
+
+        for _ in range(max_iterations):
+            if not len(idx):
+                break
+            price, vega = _bs_price_vega(s, k, r, t, sigma, calls)
+            diff = price - target
+            done = np.abs(diff) < tolerance
+            result[idx[done]] = sigma[done]
+
+            keep = ~done
+            idx, s, k, r, t, target, calls = idx[keep], s[keep], k[keep], r[keep], t[keep], target[keep], calls[keep]
+            sigma, diff, vega, lo, hi = sigma[keep], diff[keep], vega[keep], lo[keep], hi[keep]
+
+            # The price increases with the volatility, so the solution is below sigma if the price is too high
+            hi = np.where(diff > 0, sigma, hi)
+            lo = np.where(diff < 0, sigma, lo)
+            newton = sigma - diff / vega
+            use_bisection = ~np.isfinite(newton) | (newton <= lo) | (newton >= hi)
+            sigma = np.where(use_bisection, (lo + hi) / 2, newton)
+
+        # Best estimate for the options that did not converge
+        result[idx] = sigma
+
+    return _as_result(result.reshape(iv.shape) * 100)
@@ -1,14 +1,19 @@
+import asyncio
+import atexit
 import logging
+import threading
 import time
 import duckdb
 import os
 import uuid
 import ccxt
-from datetime import datetime
+import ccxt.async_support as ccxt_async
+from datetime import datetime, timedelta
 from tabulate import tabulate
 import pandas as pd
 from pandas import DataFrame
 from lumibot import LUMIBOT_CACHE_FOLDER
+from lumibot.tools.coverage_index import CoverageIndex
 import math
 import numpy as np
 from typing import Union
@@ -22,30 +27,62 @@ class CcxtCacheDB:
     """A ccxt data cache class using duckdb.
     The data being cached is OHLCV data and is stored in UTC.
     After importing the data, you'll need to change the timezone if necessary.
-    Create an exchange_id folder in the cache folder, and create a symbol_timeframe.duckdb file under it.
-    ex) Create a BTC_USDT_1m.duckdb file in the binance folder.
+    Create an exchange_id folder in the cache folder, and create a single exchange_id.duckdb file under it
+    that holds the data of every symbol and timeframe of the exchange.
+    ex) Create a binance.duckdb file in the binance folder.
+    The database is opened once per exchange and the connection is shared by every CcxtCacheDB of that exchange
+    (each call uses its own cursor, so the cache can be used from several threads).
     If there is an existing cache file, it will use it to fetch the data, otherwise it will use ccxt to fetch the data.
     If a cache file exists, but the requested data range is not in the cache file, the data will be fetched using ccxt.
     For example, if the cache file contains data from 2023-01-01 to 2023-01-10, and you request data from 2023-01-05 to 2023-01-15,
     the data from 2023-01-05 to 2023-01-10 will be fetched from the cache file, and the data from 2023-01-11 to 2023-01-15 will be fetched using ccxt.
     The newly fetched data is stored in the cache file and the range of data stored in the cache file is updated to 2023-01-05 ~ 2023-01-15.
     The cache file uses two tables to store the data using duckdb.
-    The candles table, which stores the OHLCV data, has the columns open, high, low, close, volume, and missing.
-    The cache_dt_ranges table, which stores the ranges of the cached data, has the following columns: id, start_dt, end_dt.
+    The candles table, which stores the OHLCV data, has the columns symbol, timeframe, datetime, open, high, low, close,
+    volume, and missing.
+    The cache_dt_ranges table, which stores the ranges of the cached data, has the following columns:
+    id, symbol, timeframe, start_dt, end_dt.
+    Cache files created by older versions (one symbol_timeframe.duckdb file per symbol) are imported into the
+    exchange database the first time the symbol is used.
     We use the missing column to fill in missing data in the time series data.
     The missing column is 1 for missing data and 0 for non-missing data.
 
     If max_download_limit is not set, both 1m and 1d will be set to 50000.
     Raise an error if 'end_datetime - start_datetime' is greater than max_download_limit.
     max_download_limit can be set in __init__.
+
+    If concurrent_backfill is set in __init__, the missing ranges are split into pages of BACKFILL_PAGE_LIMIT candles
+    that are downloaded concurrently with ccxt's async support (at most BACKFILL_MAX_CONCURRENCY requests in flight,
+    paced by the exchange rate limit) and each page is written to the cache as soon as it arrives.
+    The async client and the concurrency limit are shared by every CcxtCacheDB of an exchange, so concurrent
+    downloads stay within the budget of the exchange.
+    download_ohlcv_many always backfills this way, for all the requested symbols at once.
     """
 
-    def __init__(self, exchange_id:str,max_download_limit:int=None):
+    # Number of candles requested per page
+    BACKFILL_PAGE_LIMIT = 300
+    # Maximum number of concurrent requests to the exchange when backfilling
+    BACKFILL_MAX_CONCURRENCY = 8
+    # Number of times a page is retried after a network error
+    BACKFILL_MAX_RETRIES = 3
+
+    # Shared duckdb connections, one per cache file (ie. one per exchange)
+    _connections = {}
+    _connections_lock = threading.Lock()
+
+    # The event loop the backfills run on, in a background thread, and the async client and request semaphore of
+    # each exchange, created on that loop the first time the exchange is backfilled
+    _loop = None
+    _loop_lock = threading.Lock()
+    _async_clients = {}
+
+    def __init__(self, exchange_id:str,max_download_limit:int=None, concurrent_backfill:bool=False):
         """Initialize the CcxtCacheDB class.
 
         Args:
             exchange_id (str): "binance","coinbase","kraken" etc.
             max_download_limit (int, optional): Maximum number of data to be downloaded at once using CCXT. Defaults to None.
+            concurrent_backfill (bool, optional): Download the missing pages concurrently. Defaults to False.
 
         """
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -64,16 +101,13 @@ class CcxtCacheDB:
         # Recommended two or less api calls per second.
         self.api.enableRateLimit = True
         self.max_download_limit = 50000 if max_download_limit is None else max_download_limit
+        self.concurrent_backfill = concurrent_backfill
 
 
-    def get_cache_file_name(self, symbol:str, timeframe:str)->str:
+    def get_cache_file_name(self)->str:
         """Returns the cache file name. If the cache folder does not exist, it is created.
-        cache folder is created under LUMIBOT_CACHE_FOLDER with exchange_id and symbol_timeframe.duckdb file.
-        e.g. BTC_USDT_1m.duckdb file is created under binance folder.
-
-        Args:
-            symbol (str): BTC/USDT, ETH/USDT etc.
-            timeframe (str): 1m, 1d etc.
+        cache folder is created under LUMIBOT_CACHE_FOLDER with exchange_id and exchange_id.duckdb file.
+        e.g. binance.duckdb file is created under binance folder.
 
         Raises:
             Exception: OSError if the cache folder cannot be created.
@@ -81,16 +115,132 @@ class CcxtCacheDB:
         Returns:
             str: cache full file name
         """
+        cache_folder = self._get_cache_folder()
+        return os.path.join(cache_folder, f"{self.exchange_id}.duckdb")
+
+
+    def _get_cache_folder(self)->str:
         cache_folder = os.path.join(LUMIBOT_CACHE_FOLDER,self.exchange_id)
         try:
             if not os.path.exists(cache_folder):
                 os.makedirs(cache_folder)
         except OSError:
             raise Exception("Could not create cache folder at {}".format(cache_folder))
+        return cache_folder
+
+
+    def _get_legacy_cache_file_name(self, symbol:str, timeframe:str)->str:
+        """Returns the symbol_timeframe.duckdb file name used by older versions of the cache."""
+        return os.path.join(self._get_cache_folder(),
+                            f"{symbol.replace('/', '_')}_{timeframe}.duckdb")
+
+
+    def _cursor(self)->duckdb.DuckDBPyConnection:
+        """Returns a cursor on the shared connection of the exchange database.
+        The connection is opened (and the tables created) the first time it is requested.
+        Cursors can be used from any thread and closing them leaves the shared connection open.
+        """
+        cache_file = self.get_cache_file_name()
+        with CcxtCacheDB._connections_lock:
+            con = CcxtCacheDB._connections.get(cache_file)
+            if con is None:
+                con = duckdb.connect(database=cache_file)
+                con.execute("""CREATE TABLE IF NOT EXISTS candles (
+                                symbol VARCHAR, timeframe VARCHAR, datetime DATETIME,
+                                open DOUBLE, high DOUBLE, low DOUBLE, close DOUBLE, volume DOUBLE, missing INTEGER)""")
+                con.execute("""CREATE TABLE IF NOT EXISTS cache_dt_ranges (
+                                id STRING, symbol VARCHAR, timeframe VARCHAR,
+                                start_dt DATETIME, end_dt DATETIME)""")
+                CcxtCacheDB._connections[cache_file] = con
+            return con.cursor()
+
+
+    @classmethod
+    def close_connections(cls)->None:
+        """Close the shared connections of every exchange database.
+        They are opened again the next time the cache is used.
+        """
+        with cls._connections_lock:
+            for con in cls._connections.values():
+                con.close()
+            cls._connections.clear()
+
+
+    @classmethod
+    def close_async_clients(cls)->None:
+        """Close the shared async clients of every exchange.
+        They are created again the next time an exchange is backfilled.
+        """
+        with cls._loop_lock:
+            loop = cls._loop
+        if loop is None:
+            return
+
+        async def close_clients():
+            for api, _ in cls._async_clients.values():
+                await api.close()
+            cls._async_clients.clear()
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_clients(), loop).result(timeout=10)
+        except Exception as e:
+            logging.warning(f"Could not close the ccxt async clients: {e}")
+
+
+    def clear_cache(self, symbol:str, timeframe:str)->None:
+        """Delete the cached data and cache ranges of a symbol and timeframe.
+
+        Args:
+            symbol (str): BTC/USDT, ETH/USDT etc.
+            timeframe (str): 1m, 1d etc.
+        """
+        with self._cursor() as con:
+            con.execute("BEGIN TRANSACTION")
+            con.execute("DELETE FROM candles WHERE symbol = ? AND timeframe = ?", (symbol, timeframe))
+            con.execute("DELETE FROM cache_dt_ranges WHERE symbol = ? AND timeframe = ?", (symbol, timeframe))
+            con.execute("COMMIT")
+
+
+    def get_cache_ranges(self, symbol:str, timeframe:str)->DataFrame:
+        """Returns the ranges of the cached data of a symbol and timeframe.
+
+        Args:
+            symbol (str): BTC/USDT, ETH/USDT etc.
+            timeframe (str): 1m, 1d etc.
 
-        cache_file = os.path.join(cache_folder,
-                                  f"{symbol.replace('/', '_')}_{timeframe}.duckdb")
-        return cache_file
+        Returns:
+            DataFrame: id, start_dt, end_dt columns.
+        """
+        self._import_legacy_cache(symbol, timeframe)
+        with self._cursor() as con:
+            return con.execute("""select id, start_dt, end_dt
+                               from cache_dt_ranges
+                               where symbol = ? and timeframe = ?
+                               order by start_dt asc""", (symbol, timeframe)).df()
+
+
+    def get_arrays_from_cache(self, symbol:str, timeframe:str,
+                              start:datetime, end:datetime)->dict[str, np.ndarray]:
+        """Fetch data in the range start and end from the cache as numpy arrays.
+
+        Args:
+            symbol (str): BTC/USDT, ETH/USDT etc.
+            timeframe (str): 1m, 1d etc.
+            start (datetime): datetime object, ex) datetime(2023, 3, 2), datetime(2023, 3, 2, 12, 1, 0, 0)
+            end (datetime): datetime object, ex) datetime(2023, 3, 4), datetime(2023, 3, 4, 10, 14, 0, 0)
+
+        Returns:
+            dict[str, np.ndarray]: datetime, open, high, low, close, volume, missing arrays sorted by datetime.
+        """
+        start = start.replace(tzinfo=None)
+        end = end.replace(tzinfo=None)
+
+        with self._cursor() as con:
+            return con.execute("""select datetime, open, high, low, close, volume, missing
+                               from candles
+                               where symbol = ? and timeframe = ? and datetime between ? and ?
+                               order by datetime asc
+                               """, (symbol, timeframe, start, end)).fetchnumpy()
 
 
     def get_data_from_cache(self, symbol:str, timeframe:str,
@@ -113,22 +263,13 @@ class CcxtCacheDB:
                        datetime, open, high, low, close, volume, missing columns.
         """
 
-        cache_file = self.get_cache_file_name(symbol, timeframe)
+        cache_file = self.get_cache_file_name()
         if not os.path.exists(cache_file):
             raise Exception(f"Cache file {cache_file} does not exist")
 
-        start = start.replace(tzinfo=None)
-        end = end.replace(tzinfo=None)
-
-        with duckdb.connect(database = cache_file) as con:
-            df = con.execute("""select datetime, open, high, low, close, volume, missing
-                             from candles
-                             where datetime  between  ? and ?
-                             order by datetime asc
-                             """,(start,end)).fetch_df()
-        df.drop_duplicates(inplace=True,subset=['datetime'])
-        df.set_index("datetime", inplace=True)
-        return df
+        arrays = self.get_arrays_from_cache(symbol, timeframe, start, end)
+        index = pd.DatetimeIndex(arrays.pop("datetime").astype("datetime64[ns]"), name="datetime")
+        return pd.DataFrame(arrays, index=index)
 
 
     # timeframes: 1m, 1h, 1d
@@ -160,6 +301,71 @@ class CcxtCacheDB:
         if end is None:
             end = datetime.utcnow()
 
+        download_ranges,coverage = self._plan_download(symbol, timeframe, start, end, limit)
+
+        if self.concurrent_backfill and download_ranges:
+            data_range = self._run_async(self._backfill_async({symbol: download_ranges}, timeframe)).get(symbol)
+        else:
+            data_range = None
+            for download_start,download_end in download_ranges:
+                range_cnt = self._count_candles(timeframe, download_start, download_end)
+                df = self._get_barset_from_api(symbol, timeframe,
+                                               range_cnt, download_start, download_end)
+                if df is None or df.empty:
+                    continue
+                df = self._fill_missing_data(df, timeframe)
+                self._cache_ohlcv(symbol, df, timeframe)
+                if data_range is None:
+                    data_range = (df.datetime.min(), df.datetime.max())
+                else:
+                    data_range = (min(data_range[0], df.datetime.min()), max(data_range[1], df.datetime.max()))
+
+        self._update_cache_ranges(symbol, timeframe, coverage, download_ranges, data_range)
+
+        df_cache = self.get_data_from_cache(symbol, timeframe, start, end)
+        return df_cache
+
+
+    def download_ohlcv_many(self, symbols:list[str], timeframe:str,
+                            start:datetime, end:datetime, limit:int=None)->dict[str, DataFrame]:
+        """Download data for several symbols at once.
+        The ranges missing from the cache of every symbol are downloaded concurrently (see download_ohlcv).
+
+        Args:
+            symbols (list[str]): BTC/USDT, ETH/USDT etc.
+            timeframe (str): 1m, 1d etc.
+            start (datetime): datetime object, ex) datetime(2023, 3, 2), datetime(2023, 3, 2, 12, 1, 0, 0)
+            end (datetime): datetime object, ex) datetime(2023, 3, 4), datetime(2023, 3, 4, 10, 14, 0, 0)
+            limit (int, optional): max download limit per symbol. Defaults to None.
+
+        Raises:
+            Exception: Raise an exception if the max download limit is exceeded.
+
+        Returns:
+            dict[str, DataFrame]: Data fetched from cache for each symbol.
+        """
+        if end is None:
+            end = datetime.utcnow()
+
+        plans = {symbol: self._plan_download(symbol, timeframe, start, end, limit) for symbol in symbols}
+        download_ranges = {symbol: plan[0] for symbol, plan in plans.items() if plan[0]}
+        data_ranges = self._run_async(self._backfill_async(download_ranges, timeframe)) if download_ranges else {}
+
+        result = {}
+        for symbol, (ranges, coverage) in plans.items():
+            self._update_cache_ranges(symbol, timeframe, coverage, ranges, data_ranges.get(symbol))
+            result[symbol] = self.get_data_from_cache(symbol, timeframe, start, end)
+        return result
+
+
+    def _plan_download(self, symbol:str, timeframe:str,
+                       start:datetime, end:datetime,
+                       limit:int=None)->tuple[list[tuple[datetime, datetime]],CoverageIndex]:
+        """Returns the ranges to download (see _calc_download_ranges) for a download_ohlcv request.
+
+        Raises:
+            Exception: Raise an exception if the max download limit is exceeded.
+        """
         if limit is None:
             limit = self.max_download_limit
 
@@ -170,81 +376,247 @@ class CcxtCacheDB:
         start_dt = start_dt.replace(hour=0, minute=0, second=0, microsecond=0)
         end_dt = end_dt.replace(hour=23, minute=59, second=59, microsecond=999999)
 
-        download_ranges,overap_range_ids,cache_range = self._calc_download_ranges(symbol, timeframe,start_dt, end_dt)
+        download_ranges,coverage = self._calc_download_ranges(symbol, timeframe,start_dt, end_dt)
 
-        self.logger.info(f"download ranges :\n{self._table_str(download_ranges,headers=['from','to'])}")
+        self.logger.info(f"{symbol} download ranges :\n{self._table_str(download_ranges,headers=['from','to'])}")
 
         for download_start,download_end in download_ranges:
-            range_cnt = download_end - download_start
-            if timeframe == "1m":
-                range_cnt = math.ceil(range_cnt.total_seconds() / 60)
-            elif timeframe == "1d":
-                range_cnt = range_cnt.days
-
+            range_cnt = self._count_candles(timeframe, download_start, download_end)
             if range_cnt > limit:
                 raise Exception(f"Request download range {range_cnt} is greater than download limit {limit}")
 
-            df = self._get_barset_from_api(symbol, timeframe,
-                                           range_cnt, download_start, download_end)
-            df = self._fill_missing_data(df, timeframe)
-            self._cache_ohlcv(symbol, df, timeframe)
+        return download_ranges,coverage
 
-        cache_file = self.get_cache_file_name(symbol, timeframe)
 
-        if download_ranges:
-            if len(overap_range_ids) > 0:
-                start_dt = cache_range[0]
-                end_dt = cache_range[1]
-            else:
-                start_dt = df.datetime.min()
-                end_dt = df.datetime.max()
-
-            with duckdb.connect(cache_file) as con:
-                # insert new cache data range
-                con.execute("""INSERT INTO cache_dt_ranges VALUES (?, ?, ?)""",
-                            (str(uuid.uuid4().hex),start_dt,end_dt))
-                # delete overlapping ranges
-                if len(overap_range_ids) > 0:
-                    params = [(id,) for id in overap_range_ids]
-                    con.executemany("""DELETE FROM  cache_dt_ranges WHERE id = ?""", params)
-
-        with duckdb.connect(cache_file) as con:
-            df = con.execute("""select * from cache_dt_ranges""").fetch_df()
-        self.logger.info(f"cache ranges:\n{self._table_str(df[['start_dt', 'end_dt']],headers=['from','to'])}")
+    def _count_candles(self, timeframe:str, start:datetime, end:datetime)->int:
+        range_cnt = end - start
+        if timeframe == "1m":
+            range_cnt = math.ceil(range_cnt.total_seconds() / 60)
+        elif timeframe == "1d":
+            range_cnt = range_cnt.days
+        return range_cnt
 
-        df_cache = self.get_data_from_cache(symbol, timeframe, start, end)
-        return df_cache
+
+    def _update_cache_ranges(self, symbol:str, timeframe:str, coverage:CoverageIndex,
+                             download_ranges:list[tuple[datetime, datetime]], data_range:Union[tuple, None])->None:
+        """Add the downloaded ranges of a symbol to its cache ranges and save them.
+        The exchange has no candles before the first downloaded one, so the start of the ranges is covered,
+        but the candles after the last downloaded one may not be available yet, so the ranges end with it.
+
+        Args:
+            symbol (str): BTC/USDT, ETH/USDT etc.
+            timeframe (str): 1m, 1d etc.
+            coverage (CoverageIndex): the cache ranges of the symbol before the download
+            download_ranges (list[tuple[datetime, datetime]]): the downloaded ranges
+            data_range (tuple): first and last datetime of the downloaded data, None if nothing was downloaded
+        """
+        if download_ranges and data_range is not None:
+            for download_start, download_end in download_ranges:
+                coverage.add(download_start, min(download_end, data_range[1]))
+
+            with self._cursor() as con:
+                con.execute("BEGIN TRANSACTION")
+                con.execute("DELETE FROM cache_dt_ranges WHERE symbol = ? AND timeframe = ?", (symbol, timeframe))
+                con.executemany("""INSERT INTO cache_dt_ranges VALUES (?, ?, ?, ?, ?)""",
+                                [(str(uuid.uuid4().hex),symbol,timeframe,start_dt,end_dt)
+                                 for start_dt, end_dt in coverage])
+                con.execute("COMMIT")
+
+        df = self.get_cache_ranges(symbol, timeframe)
+        self.logger.info(f"{symbol} cache ranges:\n{self._table_str(df[['start_dt', 'end_dt']],headers=['from','to'])}")
+
+
+    @classmethod
+    def _get_loop(cls)->asyncio.AbstractEventLoop:
+        """The event loop shared by all the backfills, started in a daemon thread the first time it is needed."""
+        with cls._loop_lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="ccxt-backfill", daemon=True).start()
+                cls._loop = loop
+            return cls._loop
+
+
+    def _run_async(self, coroutine):
+        """Run a coroutine to completion on the shared backfill loop, from synchronous code (or from another loop,
+        eg. in a notebook)."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop()).result()
+
+
+    def _get_async_client(self)->tuple:
+        """The async client and the request semaphore of the exchange, shared by every backfill of the exchange.
+        Only called from the backfill loop, so the clients don't need a lock.
+        """
+        client = CcxtCacheDB._async_clients.get(self.exchange_id)
+        if client is None:
+            api = getattr(ccxt_async, self.exchange_id)({"enableRateLimit": True})
+            # Reuse the markets loaded by the synchronous api instead of loading them again
+            api.set_markets(self.api.markets, self.api.currencies)
+            client = (api, asyncio.Semaphore(self.BACKFILL_MAX_CONCURRENCY))
+            CcxtCacheDB._async_clients[self.exchange_id] = client
+        return client
+
+
+    async def _backfill_async(self, download_ranges:dict[str, list[tuple[datetime, datetime]]],
+                              timeframe:str)->dict[str, tuple]:
+        """Download the given ranges page by page, concurrently, and write every page to the cache as it arrives.
+
+        Args:
+            download_ranges (dict[str, list[tuple[datetime, datetime]]]): ranges to download for each symbol
+            timeframe (str): 1m, 1d etc.
+
+        Returns:
+            dict[str, tuple]: first and last datetime of the downloaded data of each symbol that returned data.
+        """
+        api, semaphore = self._get_async_client()
+        page_ms = self.BACKFILL_PAGE_LIMIT * self.api.parse_timeframe(timeframe) * 1000
+
+        tasks = []
+        for symbol, ranges in download_ranges.items():
+            if symbol not in self.api.markets:
+                logging.error(
+                    f"A request for market data for {symbol} was submitted. " f"The market for that pair does not exist"
+                )
+                continue
+            for download_start, download_end in ranges:
+                since = self.api.parse8601(download_start.strftime("%Y-%m-%d %H:%M:%S"))
+                end_ms = self.api.parse8601(download_end.strftime("%Y-%m-%d %H:%M:%S"))
+                while since <= end_ms:
+                    until = min(since + page_ms, end_ms + 1)
+                    tasks.append(self._backfill_page(api, semaphore, symbol, timeframe, since, until))
+                    since = until
+
+        pages = await asyncio.gather(*tasks)
+
+        data_ranges = {}
+        for symbol, page_range in pages:
+            if page_range is None:
+                continue
+            if symbol in data_ranges:
+                page_range = (min(data_ranges[symbol][0], page_range[0]), max(data_ranges[symbol][1], page_range[1]))
+            data_ranges[symbol] = page_range
+
+        # Pages are filled independently, so fill the gaps that span page boundaries
+        for symbol, (start_dt, end_dt) in data_ranges.items():
+            self._fill_cached_gaps(symbol, timeframe, start_dt, end_dt)
+
+        return data_ranges
+
+
+    async def _backfill_page(self, api, semaphore:asyncio.Semaphore, symbol:str, timeframe:str,
+                             since:int, until:int)->tuple[str, Union[tuple, None]]:
+        """Download the candles of one page (since <= timestamp < until, in ms) and cache them.
+
+        Returns:
+            tuple[str, Union[tuple, None]]: symbol and the first and last datetime of the page, None if it is empty.
+        """
+        async with semaphore:
+            for attempt in range(self.BACKFILL_MAX_RETRIES + 1):
+                try:
+                    candles = await api.fetch_ohlcv(symbol, timeframe, since=since,
+                                                    limit=self.BACKFILL_PAGE_LIMIT, params={})
+                    break
+                except ccxt.NetworkError:
+                    if attempt == self.BACKFILL_MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(2 ** attempt)
+
+        df = pd.DataFrame(candles, columns=["datetime",
+                                            "open", "high", "low", "close", "volume"])
+        df = df[(df["datetime"] >= since) & (df["datetime"] < until)].drop_duplicates(subset=["datetime"])
+        if df.empty:
+            return symbol, None
+
+        df["datetime"] = pd.to_datetime(df["datetime"], unit="ms")
+        df = self._fill_missing_data(df.reset_index(drop=True), timeframe)
+        self._cache_ohlcv(symbol, df, timeframe)
+        return symbol, (df.datetime.min(), df.datetime.max())
+
+
+    def _fill_cached_gaps(self, symbol:str, timeframe:str, start:datetime, end:datetime)->None:
+        """Fill the missing candles between start and end in the cache, like _fill_missing_data."""
+        df = self.get_data_from_cache(symbol, timeframe, start, end)
+        freq = "D" if timeframe == "1d" else "T"
+        dt_range = pd.date_range(start=start, end=end, freq=freq)
+        if len(df) >= len(dt_range):
+            return
+
+        df_gaps = df.reindex(dt_range).ffill()
+        df_gaps = df_gaps[~dt_range.isin(df.index)]
+        df_gaps["missing"] = 1
+        df_gaps.insert(0, "datetime", df_gaps.index)
+        with self._cursor() as con:
+            con.register("df_gaps", df_gaps)
+            con.execute("""INSERT INTO candles
+                        SELECT ?, ?, datetime, open, high, low, close, volume, missing
+                        FROM df_gaps""", (symbol, timeframe))
+            con.unregister("df_gaps")
 
 
     def _cache_ohlcv(self, symbol:str, df:DataFrame, timeframe:str)->None:
         """ccxt에서 가져온 데이터를 cache에 저장한다.
+        Cached rows in the range of df are replaced, so overlapping downloads do not create duplicates.
 
         Args:
             symbol (str): BCH/USDT, ETH/USDT etc.
             df (DataFrame): DataFrame to store in cache(datetime, open, high, low, close, volume, missing columns)
             timeframe (str): 1m, 1d etc.
         """
-        cache_file = self.get_cache_file_name(symbol, timeframe)
-
-        with duckdb.connect(cache_file) as con:
-            con.execute("""CREATE TABLE IF NOT EXISTS candles (
-                            datetime DATETIME,
-                            open FLOAT, high FLOAT, low FLOAT, close FLOAT, volume INTEGER, missing INTEGER)""")
-
-            # cache ranges table
-            con.execute("""CREATE TABLE  IF NOT EXISTS cache_dt_ranges (
-                            id STRING ,
-                            start_dt DATETIME ,
-                            end_dt DATETIME)""")
-            # insert df to cache db
-            con.execute("""INSERT INTO candles SELECT *  from df""")
+        if df is None or len(df) == 0:
+            return
+
+        with self._cursor() as con:
+            con.register("df_candles", df)
+            con.execute("BEGIN TRANSACTION")
+            con.execute("""DELETE FROM candles
+                        WHERE symbol = ? AND timeframe = ? AND datetime BETWEEN ? AND ?""",
+                        (symbol, timeframe, df.datetime.min(), df.datetime.max()))
+            con.execute("""INSERT INTO candles
+                        SELECT ?, ?, datetime, open, high, low, close, volume, missing
+                        FROM df_candles""", (symbol, timeframe))
+            con.execute("COMMIT")
+            con.unregister("df_candles")
+
+
+    def _import_legacy_cache(self, symbol:str, timeframe:str)->None:
+        """Move the data of an older symbol_timeframe.duckdb cache file into the exchange database
+        and remove the old file.
+        """
+        legacy_file = self._get_legacy_cache_file_name(symbol, timeframe)
+        if not os.path.exists(legacy_file):
+            return
+
+        # Attached databases are shared by all cursors of the connection, so use a unique name
+        legacy_db = f"legacy_{uuid.uuid4().hex}"
+        escaped_file = legacy_file.replace("'", "''")
+        with self._cursor() as con:
+            con.execute(f"ATTACH '{escaped_file}' AS {legacy_db} (READ_ONLY)")
+            try:
+                con.execute("BEGIN TRANSACTION")
+                con.execute("DELETE FROM candles WHERE symbol = ? AND timeframe = ?", (symbol, timeframe))
+                con.execute("DELETE FROM cache_dt_ranges WHERE symbol = ? AND timeframe = ?", (symbol, timeframe))
+                con.execute(f"""INSERT INTO candles
+                            SELECT DISTINCT ON (datetime) ?, ?, datetime, open, high, low, close, volume, missing
+                            FROM {legacy_db}.candles""", (symbol, timeframe))
+                con.execute(f"""INSERT INTO cache_dt_ranges
+                            SELECT id, ?, ?, start_dt, end_dt FROM {legacy_db}.cache_dt_ranges""",
+                            (symbol, timeframe))
+                con.execute("COMMIT")
+            except duckdb.Error as e:
+                con.execute("ROLLBACK")
+                self.logger.warning(f"Could not import the cache file {legacy_file}: {e}")
+                return
+            finally:
+                con.execute(f"DETACH {legacy_db}")
+
+        os.remove(legacy_file)
 
 
     def _calc_download_ranges(self,symbol:str,timeframe:str,
                              start:datetime,
-                             end:datetime)->tuple[list[tuple[datetime, datetime]],list[str]]:
+                             end:datetime)->tuple[list[tuple[datetime, datetime]],CoverageIndex]:
         """Checks for duplicates between the data stored in the cache and the requested data,
-        and returns a range of non-duplicate download data ranges, overap ranges ids, new cache range.
+        and returns the ranges of the requested data that are not in the cache and the cache ranges.
         For example, suppose you have the following data ranges stored in cache
         ----------------------------------
         | id |   start_dt   |   end_dt   |
@@ -254,9 +626,8 @@ class CcxtCacheDB:
         | id3 | 2023-05-01 | 2023-06-07  |
         ----------------------------------
 
-        If the requested data is 2023-01-05 to 2023-03-07, return 2023-01-11 to 2023-02-02 as the new download range,
-        overlapping range ids returns [id1,id2].
-        And the new cache_range returns (2023-01-01,2023-03-11).
+        If the requested data is 2023-01-05 to 2023-03-07 with the 1d timeframe,
+        return 2023-01-11 to 2023-02-02 as the new download range.
 
         Args:
             symbol (str): BTC/USDT, ETH/USDT etc.
@@ -267,76 +638,12 @@ class CcxtCacheDB:
                   ex) datetime(2023, 3, 7), datetime(2023, 3, 7, 10, 14, 0, 0)
 
         Returns:
-            tuple[list[tuple[datetime, datetime]],list[str]]: (new download ranges,overap range ids,new cache range)
+            tuple[list[tuple[datetime, datetime]],CoverageIndex]: (new download ranges,cache ranges)
         """
-        cache_file = self.get_cache_file_name(symbol, timeframe)
-        if not os.path.exists(cache_file):
-            return [(start, end)],[],(start, end)
-        if os.path.exists(cache_file):
-            # get cache data ranges (id, start_dt, end_dt)
-            with duckdb.connect(cache_file) as con:
-                df = con.execute("""select * from cache_dt_ranges""").fetch_df()
-        if len(df) > 0:
-            return self._find_non_overlapping_range(df,start, end)
-        else:
-            return [(start, end)],[],(start, end)
-
-
-    def _find_non_overlapping_range(self,df:DataFrame,
-                                    new_start:datetime, new_end:datetime)->list[list,list,tuple]:
-        """Checks for duplicates between the data stored in the cache and the requested data,
-        and returns a range of non-duplicate download data ranges, overap ranges ids, new cache range.
-
-        Args:
-            df (DataFrame): data ranges stored in cache (id, start_dt, end_dt)
-            new_start (datetime): Data request start date time,ex) datetime(2023, 1, 5), datetime(2023, 1, 5, 12, 1, 0, 0)
-            new_end (datetime): Data request end date time, ex) datetime(2023, 3, 7), datetime(2023, 3, 7, 10, 14, 0, 0)
-
-        Returns:
-            list[list,list,tuple]: (new download ranges,overap range ids,new cache range)
-        """
-
-        # find overlapping ranges
-        def find_overlapping_range(row):
-            id=row['id']
-            e=row['end_dt']
-            s=row['start_dt']
-            if (s < new_start and new_start < e) or (new_start < s and e < new_end) or (s < new_end and new_end < e):
-                return  id, s, e
-            else:
-                return pd.NaT,pd.NaT,pd.NaT
-
-        overap = df.apply(find_overlapping_range, axis=1)
-        df['id'], df['start_dt'],df['end_dt'] = zip(*overap)
-        df.dropna(inplace=True)
-
-        if len(df) == 0:
-            return [(new_start,new_end)],[], (new_start,new_end)
-
-        df.sort_values(by='start_dt', inplace=True)
-        df.reset_index(drop=True, inplace=True)
-        dt_start,dt_end = df.start_dt.min(),df.end_dt.max()
-
-        ranges = []
-
-        start = new_start
-        end = new_end
-
-        if new_start < dt_start:
-            ranges.append((new_start,df.start_dt.iloc[0]))
-        else:
-            start = dt_start
-
-        if len(df) > 1:
-            for i in  range(0,len(df)-1):
-                ranges.append((df.end_dt.iloc[i], df.start_dt.iloc[i+1]))
-
-        if new_end > dt_end:
-            ranges.append((df.end_dt.iloc[-1],new_end))
-        else:
-            end = dt_end
-
-        return ranges, df.id.tolist(), (start,end)
+        step = timedelta(seconds=self.api.parse_timeframe(timeframe))
+        df = self.get_cache_ranges(symbol, timeframe)
+        coverage = CoverageIndex(step, intervals=zip(df.start_dt.tolist(), df.end_dt.tolist()))
+        return coverage.gaps(start, end),coverage
 
 
     def _get_barset_from_api(self, symbol:str, timeframe:str,
@@ -462,6 +769,10 @@ class CcxtCacheDB:
     def _table_str(self, df, headers="keys"):
         return tabulate(df, headers=headers, tablefmt='psql')
 
+
+atexit.register(CcxtCacheDB.close_connections)
+atexit.register(CcxtCacheDB.close_async_clients)
+
 if __name__ == "__main__":
     exchange_id = "binance"
     symbol = "SOL/USDT"
@@ -469,10 +780,8 @@ if __name__ == "__main__":
 
     cache = CcxtCacheDB(exchange_id)
 
-    cache_file_path = cache.get_cache_file_name(symbol,timeframe)
-     # Remove cache file if exists.
-    if os.path.exists(cache_file_path):
-        os.remove(cache_file_path)
+    # Remove cached data if exists.
+    cache.clear_cache(symbol,timeframe)
 
     # no overap new download range
     start = datetime(2023, 3, 1)
@@ -0,0 +1,62 @@
+import pandas as pd
+
+
+class ChartBuffer:
+    """Rows of chart data (markers, lines, ...) stored column by column.
+
+    Appending a row is a few list appends and the DataFrame is built straight from the columns, so strategies can add
+    a data point on every bar without slowing the backtest down. If key columns are given, rows with the same key as
+    a row already in the buffer are ignored, the check being a set lookup instead of a scan of the previous rows.
+
+    Parameters
+    ----------
+    columns : list[str]
+        The columns of the rows, in order.
+    key : list[str]
+        Optional columns that identify a row, used to ignore duplicates.
+
+    Example
+    -------
+    >>> markers = ChartBuffer(["datetime", "name", "value"], key=["datetime", "name"])
+    >>> markers.append(datetime=dt, name="Overbought", value=80)
+    True
+    >>> markers.append(datetime=dt, name="Overbought", value=81)
+    False
+    >>> markers.to_df()
+    """
+
+    def __init__(self, columns, key=None):
+        self.columns = list(columns)
+        self.key = list(key) if key else None
+        self._data = {column: [] for column in self.columns}
+        self._keys = set()
+
+    def __len__(self):
+        return len(self._data[self.columns[0]])
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def append(self, **row):
+        """Adds a row, the missing columns are None. Returns False if the row is a duplicate and was not added."""
+        if self.key is not None:
+            key = tuple(row.get(column) for column in self.key)
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+
+        for column, values in self._data.items():
+            values.append(row.get(column))
+        return True
+
+    def clear(self):
+        """Removes all the rows."""
+        for values in self._data.values():
+            values.clear()
+        self._keys.clear()
+
+    def to_df(self):
+        """Returns the rows as a DataFrame, an empty DataFrame without columns if there are no rows."""
+        if len(self) == 0:
+            return pd.DataFrame()
+        return pd.DataFrame(self._data, columns=self.columns)
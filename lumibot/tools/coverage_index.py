@@ -0,0 +1,134 @@
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+import pandas as pd
+
+
+class CoverageIndex:
+    """The set of ranges a cache already holds, stored as sorted, disjoint and inclusive [start, end] intervals.
+
+    Every data source uses it the same way to work out what it still needs to download: record what was downloaded
+    with `add` and ask for the missing ranges with `gaps`. Both are binary searches over the intervals, so they stay
+    fast on fragmented caches.
+
+    `step` is the smallest unit of the data (eg. one day for daily bars, one minute for minute bars). Intervals that
+    are less than one step apart are merged and the gaps are returned as inclusive ranges too, so a gap between the
+    covered intervals [a, b] and [c, d] is [b + step, c - step].
+
+    Parameters
+    ----------
+    step : timedelta or number
+        The smallest unit of the values stored in the index.
+    intervals : list[tuple]
+        Optional initial (start, end) intervals, they don't need to be sorted or disjoint.
+
+    Example
+    -------
+    >>> coverage = CoverageIndex(timedelta(days=1))
+    >>> coverage.add(date(2023, 1, 1), date(2023, 1, 10))
+    >>> coverage.add(date(2023, 1, 21), date(2023, 1, 31))
+    >>> coverage.gaps(date(2023, 1, 5), date(2023, 2, 3))
+    [(date(2023, 1, 11), date(2023, 1, 20)), (date(2023, 2, 1), date(2023, 2, 3))]
+    """
+
+    def __init__(self, step, intervals=None):
+        self.step = step
+        self._starts = []
+        self._ends = []
+        for start, end in intervals or []:
+            self.add(start, end)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def __repr__(self):
+        return f"CoverageIndex({self.intervals})"
+
+    @property
+    def intervals(self):
+        """The covered (start, end) intervals, sorted by start."""
+        return list(zip(self._starts, self._ends))
+
+    def add(self, start, end):
+        """Mark the range [start, end] as covered, merging it with the intervals it overlaps or touches."""
+        if start > end:
+            return
+
+        # Intervals that end at most one step before `start` and start at most one step after `end`
+        lo = bisect_left(self._ends, start - self.step)
+        hi = bisect_right(self._starts, end + self.step)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def covers(self, start, end=None):
+        """Return True if the whole range [start, end] is covered. If end is None, check the single value start."""
+        if end is None:
+            end = start
+        i = bisect_right(self._starts, start) - 1
+        return i >= 0 and self._ends[i] >= end
+
+    def gaps(self, start, end):
+        """Return the ranges of [start, end] that are not covered, as a list of inclusive (start, end) tuples."""
+        gaps = []
+        if start > end:
+            return gaps
+
+        cursor = start
+        i = bisect_left(self._ends, start)
+        while i < len(self._starts) and self._starts[i] <= end:
+            gap_end = self._starts[i] - self.step
+            if gap_end >= cursor:
+                gaps.append((cursor, gap_end))
+            cursor = max(cursor, self._ends[i] + self.step)
+            i += 1
+
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    @classmethod
+    def from_values(cls, values, step):
+        """Build the index of a collection of values, eg. the dates or datetimes of the bars in a cache.
+        Consecutive values (one step apart) are merged into one interval."""
+        index = cls(step)
+        values = sorted(set(values))
+        if not values:
+            return index
+
+        start = end = values[0]
+        for value in values[1:]:
+            if value - end > step:
+                index._starts.append(start)
+                index._ends.append(end)
+                start = value
+            end = value
+        index._starts.append(start)
+        index._ends.append(end)
+        return index
+
+    def to_df(self):
+        return pd.DataFrame({"start": self._starts, "end": self._ends})
+
+    @classmethod
+    def from_df(cls, df, step):
+        """Build the index from a DataFrame with start and end columns (see `to_df`)."""
+        return cls(step, intervals=zip(df["start"].tolist(), df["end"].tolist()))
+
+    def save(self, path):
+        """Save the intervals to a feather file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.to_df().to_feather(path)
+
+    @classmethod
+    def load(cls, path, step):
+        """Load the intervals saved by `save`. Returns None if the file does not exist."""
+        if not Path(path).exists():
+            return None
+        return cls.from_df(pd.read_feather(path), step)
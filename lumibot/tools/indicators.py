@@ -6,6 +6,7 @@ import webbrowser
 from datetime import datetime
 from decimal import Decimal
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import quantstats_lumi as qs
@@ -14,6 +15,8 @@ from plotly.subplots import make_subplots
 from lumibot import LUMIBOT_DEFAULT_TIMEZONE
 from lumibot.tools import to_datetime_aware
 
+from .metrics import compute_metrics
+from .risk_free_rate import get_risk_free_rate_curve
 from .yahoo_helper import YahooHelper as yh
 
 
@@ -126,13 +129,21 @@ def romad(_df):
 
 
 def stats_summary(_df, risk_free_rate):
+    """Calculate all of our performance indicators in one pass (see compute_metrics)
+    The dataframe _df must include a column "return" that
+    has the return for that time period (eg. daily)
+    """
+    metrics = compute_metrics(_df["return"].to_numpy(dtype=float), _df.index, risk_free_rate)
     return {
-        "cagr": cagr(_df),
-        "volatility": volatility(_df),
-        "sharpe": sharpe(_df, risk_free_rate),
-        "max_drawdown": max_drawdown(_df),
-        "romad": romad(_df),
-        "total_return": total_return(_df),
+        "cagr": metrics["cagr"],
+        "volatility": metrics["volatility"],
+        "sharpe": metrics["sharpe"],
+        "sortino": metrics["sortino"],
+        "max_drawdown": {"drawdown": metrics["max_drawdown"], "date": metrics["max_drawdown_date"]},
+        "romad": metrics["romad"],
+        "calmar": metrics["calmar"],
+        "total_return": metrics["total_return"],
+        "exposure": metrics["exposure"],
     }
 
 
@@ -141,17 +152,17 @@ def performance(_df, risk_free, prefix=""):
     The dataframe _df must include a column "return" that
     has the return for that time period (eg. daily)
     """
-    cagr_adj = cagr(_df)
-    vol_adj = volatility(_df)
-    sharpe_adj = sharpe(_df, risk_free)
-    maxdown_adj = max_drawdown(_df)
-    romad_adj = romad(_df)
-
-    print(f"{prefix} CAGR {cagr_adj*100:,.2f}%")
-    print(f"{prefix} Volatility {vol_adj*100:,.2f}%")
-    print(f"{prefix} Sharpe {sharpe_adj:0.2f}")
+    stats = stats_summary(_df, risk_free)
+    maxdown_adj = stats["max_drawdown"]
+
+    print(f"{prefix} CAGR {stats['cagr']*100:,.2f}%")
+    print(f"{prefix} Volatility {stats['volatility']*100:,.2f}%")
+    print(f"{prefix} Sharpe {stats['sharpe']:0.2f}")
+    print(f"{prefix} Sortino {stats['sortino']:0.2f}")
     print(f"{prefix} Max Drawdown {maxdown_adj['drawdown']*100:,.2f}% on {maxdown_adj['date']:%Y-%m-%d}")
-    print(f"{prefix} RoMaD {romad_adj*100:,.2f}%")
+    print(f"{prefix} RoMaD {stats['romad']*100:,.2f}%")
+    print(f"{prefix} Calmar {stats['calmar']:0.2f}")
+    print(f"{prefix} Exposure {stats['exposure']*100:,.2f}%")
 
 
 def get_symbol_returns(symbol, start=datetime(1900, 1, 1), end=datetime.now()):
@@ -198,12 +209,140 @@ def calculate_returns(symbol, start=datetime(1900, 1, 1), end=datetime.now()):
     performance(benchmark_df, risk_free_rate, symbol)
 
 
+# The lines of the plots are downsampled to about this many points, a few per pixel of a wide screen. Without it the
+# html files of minute backtests get too big to open. Trade and chart markers are never downsampled.
+PLOT_MAX_POINTS = 5000
+
+
+def downsample_min_max(values, max_points=PLOT_MAX_POINTS):
+    """Returns the positions of the points to keep to draw a line of values with about max_points points.
+
+    The values are split in buckets of consecutive points and the first point, the lowest and the highest values of
+    each bucket are kept (min/max decimation), so the spikes and the shape of the line look the same once drawn.
+    The last point is always kept.
+
+    Parameters
+    ----------
+    values : array-like
+        The y values of the line, in the order they are drawn. NaN values are never kept, unless a whole bucket is NaN.
+    max_points : int
+        The approximate number of points to keep. None to keep all the points.
+
+    Returns
+    -------
+    np.ndarray
+        The sorted positions of the points to keep.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+
+    # First, min and max of each bucket
+    bucket_size = int(np.ceil(n / max(max_points // 3, 1)))
+    n_buckets = int(np.ceil(n / bucket_size))
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = values
+    buckets = padded.reshape(n_buckets, bucket_size)
+    is_nan = np.isnan(buckets)
+    starts = np.arange(n_buckets) * bucket_size
+    lows = starts + np.where(is_nan, np.inf, buckets).argmin(axis=1)
+    highs = starts + np.where(is_nan, -np.inf, buckets).argmax(axis=1)
+
+    return np.unique(np.concatenate([starts, lows, highs, [n - 1]]))
+
+
+def _downsample_series(series, max_points=PLOT_MAX_POINTS):
+    """Drop the NaN values of series and downsample it, see downsample_min_max."""
+    series = series.dropna()
+    return series.iloc[downsample_min_max(series.to_numpy(dtype=float), max_points)]
+
+
+def _value_plotly_text(df):
+    """The hover text of chart markers and lines, "Value: <value>" followed by their detail_text if they have one."""
+    text = "Value: " + df["value"].astype(str)
+    has_detail = df["detail_text"].notna()
+    text[has_detail] = text[has_detail] + "<br>" + df.loc[has_detail, "detail_text"].astype(str)
+    return text
+
+
+def _decimal_text(values, places):
+    """Format values as Decimals rounded to places, with commas for thousands."""
+    quantum = Decimal(1).scaleb(-places)
+    return pd.Series(
+        [Decimal(value).quantize(quantum).__format__(",f") for value in values], index=values.index, dtype=object
+    )
+
+
+def _buysell_plotly_text(trades):
+    """The hover text of the buy and sell ticks, one per trade, None for the orders that were canceled or new."""
+    # Work by position, the trades can share the same datetime index
+    index = trades.index
+    traded = (~trades["status"].isin(["canceled", "new"])).to_numpy()
+    trades = trades.loc[traded].reset_index(drop=True)
+
+    # Round to 2 decimal places and add commas for thousands
+    amounts = pd.Series(
+        [
+            (
+                (Decimal(price) if price else 0)
+                * (Decimal(quantity) if quantity else 0)
+                * (Decimal(multiplier) if multiplier else 0)
+            )
+            .quantize(Decimal("0.01"))
+            .__format__(",f")
+            for price, quantity, multiplier in zip(
+                trades["price"], trades["filled_quantity"], trades["asset.multiplier"]
+            )
+        ],
+        dtype=object,
+    )
+
+    text = trades["status"] + "<br>" + _decimal_text(trades["filled_quantity"], 2) + " " + trades["symbol"]
+    is_option = trades["asset.asset_type"] == "option"
+    if is_option.any():
+        options = trades.loc[is_option]
+        text[is_option] = (
+            text[is_option]
+            + " "
+            + options["asset.right"]
+            + " Option"
+            + "<br>"
+            + "Strike: "
+            + options["asset.strike"].astype(str)
+            + "<br>"
+            + "Expiration: "
+            + options["asset.expiration"].astype(str)
+        )
+    text = (
+        text
+        + "<br>"
+        + "Price: "
+        + _decimal_text(trades["price"], 4)
+        + "<br>"
+        + "Order Type: "
+        + trades["type"]
+        + "<br>"
+        + "Amount Transacted: "
+        + amounts
+        + "<br>"
+        + "Trade Cost: "
+        + _decimal_text(trades["trade_cost"], 2)
+        + "<br>"
+    )
+
+    result = np.full(len(index), None, dtype=object)
+    result[traded] = text.to_numpy(dtype=object)
+    return pd.Series(result, index=index, dtype=object)
+
+
 def plot_indicators(
     plot_file_html="indicators.html",
     chart_markers_df=None,
     chart_lines_df=None,
     strategy_name=None,
     show_indicators=True,
+    max_points=PLOT_MAX_POINTS,
 ):
     # If show plot is False, then we don't want to open the plot in the browser
     if not show_indicators:
@@ -220,16 +359,10 @@ def plot_indicators(
     # Chart Markers
     ###############################
 
-    def generate_marker_plotly_text(row):
-        if row["detail_text"] is None:
-            return "Value: " + str(row["value"])
-        else:
-            return "Value: " + str(row["value"]) + "<br>" + row["detail_text"]
-
     # Plot the chart markers
     if chart_markers_df is not None and not chart_markers_df.empty:
         chart_markers_df = chart_markers_df.copy()
-        chart_markers_df["detail_text"] = chart_markers_df.apply(generate_marker_plotly_text, axis=1)
+        chart_markers_df["detail_text"] = _value_plotly_text(chart_markers_df)
 
         # Loop over the marker names and create a new trace for each one
         for marker_name in chart_markers_df["name"].unique():
@@ -264,21 +397,14 @@ def plot_indicators(
     # Chart Lines
     ###############################
 
-    def generate_line_plotly_text(row):
-        if row["detail_text"] is None:
-            return "Value: " + str(row["value"])
-        else:
-            return "Value: " + str(row["value"]) + "<br>" + row["detail_text"]
-
     # Plot the chart lines
     if chart_lines_df is not None and not chart_lines_df.empty:
-        chart_lines_df = chart_lines_df.copy()
-        chart_lines_df["detail_text"] = chart_lines_df.apply(generate_line_plotly_text, axis=1)
-
         # Loop over the line names and create a new trace for each one
         for line_name in chart_lines_df["name"].unique():
-            # Get the line data for this line name
+            # Get the line data for this line name, downsampled so that long backtests stay light
             line_df = chart_lines_df.loc[chart_lines_df["name"] == line_name]
+            line_df = line_df.iloc[downsample_min_max(line_df["value"].to_numpy(dtype=float), max_points)]
+            line_text = _value_plotly_text(line_df)
 
             # Get the color for this line name
             color = line_df["color"].iloc[0]
@@ -292,7 +418,7 @@ def plot_indicators(
                     name=line_name,
                     line_color=color,
                     hovertemplate=f"{line_name}<br>%{{text}}<br>%{{x|%b %d %Y %I:%M:%S %p}}<extra></extra>",
-                    text=line_df["detail_text"],
+                    text=line_text,
                 )
             )
 
@@ -344,6 +470,7 @@ def plot_returns(
     trades_df=None,
     show_plot=True,
     initial_budget=1,
+    max_points=PLOT_MAX_POINTS,
     # chart_markers_df=None,
     # chart_lines_df=None,
 ):
@@ -401,14 +528,19 @@ def plot_returns(
     # The x-axis is not displayed correctly in plotly when not converted to DatetimeIndex type
     df_final.index = pd.to_datetime(df_final.index,utc=True).tz_convert(LUMIBOT_DEFAULT_TIMEZONE)
 
+    # Downsampled lines, the buy and sell ticks below still use all the trades
+    strategy_line = _downsample_series(df_final[strategy_name], max_points)
+    benchmark_line = _downsample_series(df_final[benchmark_name], max_points)
+    cash_line = _downsample_series(df_final["cash"], max_points)
+
     # fig = go.Figure()
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
     # Strategy line
     fig.add_trace(
         go.Scatter(
-            x=df_final.index,
-            y=df_final[strategy_name],
+            x=strategy_line.index,
+            y=strategy_line,
             mode="lines",
             name=strategy_name,
             connectgaps=True,
@@ -419,8 +551,8 @@ def plot_returns(
     # Benchmark line
     fig.add_trace(
         go.Scatter(
-            x=df_final.index,
-            y=df_final[benchmark_name],
+            x=benchmark_line.index,
+            y=benchmark_line,
             mode="lines",
             name=benchmark_name,
             connectgaps=True,
@@ -431,8 +563,8 @@ def plot_returns(
     # Cash line
     fig.add_trace(
         go.Scatter(
-            x=df_final.index,
-            y=df_final["cash"],
+            x=cash_line.index,
+            y=cash_line,
             mode="lines",
             name="cash",
             connectgaps=True,
@@ -451,81 +583,7 @@ def plot_returns(
     buys[strategy_name] = buys[strategy_name].bfill()
     buys = buys.loc[df_final["side"] == "buy"]
 
-    def generate_buysell_plotly_text(row):
-        if row["status"] != "canceled" and row["status"] != "new":
-            if row["asset.asset_type"] == "option":
-                return (
-                    row["status"]
-                    + "<br>"
-                    + str(row["filled_quantity"].quantize(Decimal("0.01")).__format__(",f"))
-                    + " "
-                    + row["symbol"]
-                    + " "
-                    + row["asset.right"]
-                    + " Option"
-                    + "<br>"
-                    + "Strike: "
-                    + str(row["asset.strike"])
-                    + "<br>"
-                    + "Expiration: "
-                    + str(row["asset.expiration"])
-                    + "<br>"
-                    + "Price: "
-                    + str(Decimal(row["price"]).quantize(Decimal("0.0001")).__format__(",f"))
-                    + "<br>"
-                    + "Order Type: "
-                    + row["type"]
-                    + "<br>"
-                    + "Amount Transacted: "
-                    + str(
-                        # Round to 2 decimal places and add commas for thousands
-                        (
-                            (Decimal(row["price"]) if row["price"] else 0)
-                            * (Decimal(row["filled_quantity"]) if row["filled_quantity"] else 0)
-                            * (Decimal(row["asset.multiplier"]) if row["asset.multiplier"] else 0)
-                        )
-                        .quantize(Decimal("0.01"))
-                        .__format__(",f")
-                    )
-                    + "<br>"
-                    + "Trade Cost: "
-                    + str(Decimal(row["trade_cost"]).quantize(Decimal("0.01")).__format__(",f"))
-                    + "<br>"
-                )
-            else:
-                return (
-                    row["status"]
-                    + "<br>"
-                    + str(row["filled_quantity"].quantize(Decimal("0.01")).__format__(",f"))
-                    + " "
-                    + row["symbol"]
-                    + "<br>"
-                    + "Price: "
-                    + str(Decimal(row["price"]).quantize(Decimal("0.0001")).__format__(",f"))
-                    + "<br>"
-                    + "Order Type: "
-                    + row["type"]
-                    + "<br>"
-                    + "Amount Transacted: "
-                    + str(
-                        # Round to 2 decimal places and add commas for thousands
-                        (
-                            (Decimal(row["price"]) if row["price"] else 0)
-                            * (Decimal(row["filled_quantity"]) if row["filled_quantity"] else 0)
-                            * (Decimal(row["asset.multiplier"]) if row["asset.multiplier"] else 0)
-                        )
-                        .quantize(Decimal("0.01"))
-                        .__format__(",f")
-                    )
-                    + "<br>"
-                    + "Trade Cost: "
-                    + str(Decimal(row["trade_cost"]).quantize(Decimal("0.01")).__format__(",f"))
-                    + "<br>"
-                )
-        else:
-            return None
-
-    buy_ticks_df = buys.apply(generate_buysell_plotly_text, axis=1)
+    buy_ticks_df = _buysell_plotly_text(buys)
 
     # Plot the buy ticks
     if not buy_ticks_df.empty:
@@ -563,7 +621,7 @@ def plot_returns(
     sells[strategy_name] = sells[strategy_name].bfill()
     sells = sells.loc[df_final["side"] == "sell"]
 
-    sells_ticks_df = sells.apply(generate_buysell_plotly_text, axis=1)
+    sells_ticks_df = _buysell_plotly_text(sells)
 
     # Plot the sell ticks
     if not sells_ticks_df.empty:
@@ -726,9 +784,18 @@ def create_tearsheet(
 
 def get_risk_free_rate(dt: datetime = None):
     try:
-        result = yh.get_risk_free_rate(dt=dt)
+        if dt is None:
+            result = yh.get_risk_free_rate()
+        else:
+            # The rates are loaded once per process and looked up with a binary search
+            curve = get_risk_free_rate_curve()
+            result = curve.get_rate(dt) if curve is not None else None
     except Exception as e:
         logging.error(f"Error getting the risk free rate: {e}")
+        result = None
+
+    # Without rates, the metrics are computed with a rate of 0
+    if result is None:
         result = 0
 
     return result
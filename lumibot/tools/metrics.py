@@ -0,0 +1,243 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+NANOSECONDS_PER_DAY = 86_400 * 10**9
+DAYS_PER_YEAR = 365.25
+# Calmar ratio is computed over the trailing 3 years
+CALMAR_YEARS = 3
+
+
+def compute_metrics(returns, timestamps, risk_free_rate):
+    """Computes all the performance metrics of returns in one vectorized pass.
+
+    The metrics are the same as the ones of `cagr`, `volatility`, `sharpe`, `max_drawdown`, `romad` and
+    `total_return` in `lumibot.tools.indicators`, but the cumulative returns and drawdowns are computed only once
+    and shared between them. `returns` can also be a 2-D array with one column per run (eg. the results of a parameter
+    sweep over the same period), in which case every metric is an array with one value per run.
+
+    Missing (NaN) returns are skipped, like pandas does.
+
+    Parameters
+    ----------
+    returns : np.ndarray
+        The return of each period (eg. daily), with shape (periods,) or (periods, runs).
+    timestamps : pd.DatetimeIndex or array-like of datetimes
+        The timestamp of each period. It doesn't need to be sorted.
+    risk_free_rate : float
+        The annual risk-free rate, eg. 0.05 for 5%. None is the same as 0.
+
+    Returns
+    -------
+    dict
+        - cagr: Compound Annual Growth Rate
+        - volatility: annualized standard deviation of the returns
+        - sharpe: (cagr - risk_free_rate) / volatility
+        - sortino: (cagr - risk_free_rate) / annualized downside deviation
+        - max_drawdown: biggest percentage drop from peak to trough
+        - max_drawdown_date: the timestamp of the bottom of the max drawdown
+        - romad: cagr / max_drawdown
+        - calmar: cagr / max_drawdown, over the last 3 years
+        - total_return: cumulative return
+        - exposure: fraction of the periods with a non-zero return, ie. when the strategy was invested
+
+    Example
+    -------
+    >>> returns = np.random.normal(0.0005, 0.01, (252, 1000))  # 1000 runs
+    >>> metrics = compute_metrics(returns, pd.date_range("2023-01-01", periods=252), 0.05)
+    >>> best_run = metrics["sharpe"].argmax()
+    """
+    if risk_free_rate is None:
+        risk_free_rate = 0
+
+    index = pd.DatetimeIndex(timestamps)
+    returns = np.asarray(returns, dtype=float)
+    if not index.is_monotonic_increasing:
+        order = index.argsort(kind="stable")
+        index = index[order]
+        returns = returns[order]
+
+    is_1d = returns.ndim == 1
+    if is_1d:
+        returns = returns[:, None]
+
+    nanos = index.asi8
+    period_years = ((nanos[-1] - nanos[0]) // NANOSECONDS_PER_DAY) / DAYS_PER_YEAR
+
+    missing = np.isnan(returns)
+    growth = np.where(missing, 1.0, 1.0 + returns)
+    cum_return = np.cumprod(growth, axis=0)
+
+    # Like pandas' cumprod, a missing last return leaves the cumulative return undefined
+    final = np.where(missing[-1], np.nan, cum_return[-1])
+    total_return = final - 1
+    cagr = _cagr(final, period_years)
+
+    count = (~missing).sum(axis=0)
+    volatility = np.zeros(returns.shape[1])
+    downside = np.zeros(returns.shape[1])
+    if period_years != 0:
+        ratio_to_annual = count / period_years
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(returns, axis=0) / count
+            variance = np.nansum((returns - mean) ** 2, axis=0) / (count - 1)
+            volatility = np.sqrt(variance) * np.sqrt(ratio_to_annual)
+            downside = np.sqrt(np.nansum(np.minimum(returns, 0) ** 2, axis=0) / count) * np.sqrt(ratio_to_annual)
+    sharpe = _ratio(cagr - risk_free_rate, volatility)
+    sortino = _ratio(cagr - risk_free_rate, downside)
+
+    max_drawdown, max_drawdown_pos = _max_drawdown(cum_return, missing)
+    romad = _ratio(cagr, max_drawdown)
+
+    # Calmar ratio, over the trailing CALMAR_YEARS years
+    window_start = nanos[-1] - int(CALMAR_YEARS * DAYS_PER_YEAR * NANOSECONDS_PER_DAY)
+    start = int(np.searchsorted(nanos, window_start))
+    if start == 0:
+        calmar = romad
+    else:
+        window_years = ((nanos[-1] - nanos[start]) // NANOSECONDS_PER_DAY) / DAYS_PER_YEAR
+        window_cum_return = np.cumprod(growth[start:], axis=0)
+        window_final = np.where(missing[-1], np.nan, window_cum_return[-1])
+        window_drawdown, _ = _max_drawdown(window_cum_return, missing[start:])
+        calmar = _ratio(_cagr(window_final, window_years), window_drawdown)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        exposure = ((returns != 0) & ~missing).sum(axis=0) / count
+
+    metrics = {
+        "cagr": cagr,
+        "volatility": volatility,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_date": index[max_drawdown_pos],
+        "romad": romad,
+        "calmar": calmar,
+        "total_return": total_return,
+        "exposure": exposure,
+    }
+    if is_1d:
+        metrics = {key: value[0] for key, value in metrics.items()}
+    return metrics
+
+
+def _cagr(final, period_years):
+    if period_years == 0:
+        return np.zeros_like(final)
+    return final ** (1 / period_years) - 1
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, 0 where the denominator is 0"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator == 0, 0.0, numerator / np.where(denominator == 0, 1, denominator))
+
+
+def _max_drawdown(cum_return, missing):
+    """Returns the max drawdown of each column and the position of its bottom, 0 if there is no drawdown."""
+    if cum_return.shape[0] == 1:
+        return np.zeros(cum_return.shape[1]), np.zeros(cum_return.shape[1], dtype=int)
+
+    # Like pandas' cummax, the periods without a return are not peaks
+    cum_return = np.where(missing, np.nan, cum_return)
+    peak = np.fmax.accumulate(cum_return, axis=0)
+    drawdown = (peak - cum_return) / peak
+    all_missing = np.isnan(drawdown).all(axis=0)
+    drawdown[:, all_missing] = 0
+    position = np.nanargmax(drawdown, axis=0)
+    max_drawdown = drawdown[position, np.arange(drawdown.shape[1])]
+    return max_drawdown, position
+
+
+class OnlineMetrics:
+    """Performance metrics of a portfolio that are updated in O(1) with each new portfolio value.
+
+    The return volatility uses Welford's algorithm, so nothing has to be recomputed from the history of the portfolio
+    values. The metrics are annualized like the ones of `compute_metrics`.
+
+    Example
+    -------
+    >>> metrics = OnlineMetrics()
+    >>> metrics.update(100_000, datetime(2023, 1, 3))
+    >>> metrics.update(101_000, datetime(2023, 1, 4))
+    >>> metrics.drawdown, metrics.high_water_mark
+    (0.0, 101000.0)
+    """
+
+    def __init__(self):
+        self.start_value = None
+        self.last_value = None
+        self.start_datetime = None
+        self.last_datetime = None
+        self.high_water_mark = None
+        self.max_drawdown = 0.0
+        # Welford's running count, mean and sum of squared differences of the returns
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, portfolio_value, dt):
+        """Add the portfolio value at the datetime dt. Values that are None or NaN are ignored."""
+        if portfolio_value is None:
+            return
+        value = float(portfolio_value)
+        if math.isnan(value):
+            return
+
+        if self.start_value is None:
+            self.start_value = value
+            self.start_datetime = dt
+            self.high_water_mark = value
+        elif self.last_value != 0:
+            ret = value / self.last_value - 1
+            self.count += 1
+            delta = ret - self._mean
+            self._mean += delta / self.count
+            self._m2 += delta * (ret - self._mean)
+
+        self.last_value = value
+        self.last_datetime = dt
+        self.high_water_mark = max(self.high_water_mark, value)
+        self.max_drawdown = max(self.max_drawdown, self.drawdown)
+
+    @property
+    def period_years(self):
+        if self.start_datetime is None:
+            return 0
+        return (self.last_datetime - self.start_datetime).days / DAYS_PER_YEAR
+
+    @property
+    def total_return(self):
+        if not self.start_value:
+            return 0.0
+        return self.last_value / self.start_value - 1
+
+    @property
+    def cagr(self):
+        period_years = self.period_years
+        if period_years == 0 or not self.start_value:
+            return 0.0
+        return (self.last_value / self.start_value) ** (1 / period_years) - 1
+
+    @property
+    def volatility(self):
+        """Annualized standard deviation of the returns."""
+        period_years = self.period_years
+        if period_years == 0 or self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - 1)) * math.sqrt(self.count / period_years)
+
+    @property
+    def drawdown(self):
+        """The current drop from the high water mark, as a fraction of it."""
+        if not self.high_water_mark:
+            return 0.0
+        return (self.high_water_mark - self.last_value) / self.high_water_mark
+
+    def sharpe(self, risk_free_rate=0.0):
+        """(cagr - risk_free_rate) / volatility, 0 if there is no volatility yet."""
+        volatility = self.volatility
+        if volatility == 0:
+            return 0.0
+        return (self.cagr - (risk_free_rate or 0)) / volatility
@@ -42,3 +42,41 @@ def fill_void(df_, interval, end):
     df_ = pd.concat([df_, missing_lines])
     df_ = df_.sort_index()
     return df_
+
+
+def get_tail_before(df_, end, length=None, inclusive=False, cursors=None, key=None):
+    """Return the last `length` rows of df_ (sorted by its DatetimeIndex) that are before `end`.
+
+    The rows are found with a binary search on the index and returned as a positional slice (a view), instead of
+    building a boolean mask over the whole history and copying the result.
+
+    Parameters
+    ----------
+    df_ : pd.DataFrame
+        DataFrame with a sorted DatetimeIndex.
+    end : datetime
+        Only rows before this datetime are returned.
+    length : int or None
+        The number of rows to return. If None, all rows before `end` are returned.
+    inclusive : bool
+        If True, a row at exactly `end` is included.
+    cursors : dict or None
+        Optional cache of the last position found for each key. Repeated calls for the same key and `end`
+        (eg. several requests for the same asset during one backtest iteration) reuse the position.
+    key : hashable
+        The key of df_ in `cursors`.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    cursor = cursors.get(key) if cursors is not None else None
+    if cursor is not None and cursor[:3] == (end, inclusive, len(df_)):
+        end_position = cursor[3]
+    else:
+        end_position = df_.index.searchsorted(end, side="right" if inclusive else "left")
+        if cursors is not None:
+            cursors[key] = (end, inclusive, len(df_), end_position)
+
+    start_position = 0 if length is None else max(end_position - length, 0)
+    return df_.iloc[start_position:end_position]
@@ -1,6 +1,7 @@
 # This file contains helper functions for getting data from Polygon.io
 import logging
 import time
+from bisect import bisect_left, bisect_right
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
@@ -16,6 +17,7 @@ from tqdm import tqdm
 from lumibot import LUMIBOT_CACHE_FOLDER
 from lumibot.entities import Asset
 from lumibot import LUMIBOT_DEFAULT_PYTZ
+from lumibot.tools.coverage_index import CoverageIndex
 
 WAIT_TIME = 60
 POLYGON_QUERY_COUNT = 0  # This is a variable that updates every time we query Polygon
@@ -76,13 +78,15 @@ def get_price_data_from_polygon(
     force_cache_update = validate_cache(force_cache_update, asset, cache_file, api_key)
 
     df_all = None
+    coverage = CoverageIndex(timedelta(days=1))
     # Load from the cache file if it exists.  
     if cache_file.exists() and not force_cache_update:
         logging.debug(f"Loading pricing data for {asset} / {quote_asset} with '{timespan}' timespan from cache file...")
         df_all = load_cache(cache_file)
+        coverage = load_coverage(cache_file, df_all)
 
     # Check if we need to get more data
-    missing_dates = get_missing_dates(df_all, asset, start, end)
+    missing_dates = get_missing_dates(df_all, asset, start, end, coverage=coverage)
     if not missing_dates:
         # TODO: Do this upstream so we don't called repeatedly for known-to-be-missing bars.
         # Drop the rows with all NaN values that were added to the feather for symbols that have missing bars.
@@ -153,10 +157,16 @@ def get_price_data_from_polygon(
     # Close the progress bar when done
     pbar.close()
 
-    # Recheck for missing dates so they can be added in the feather update.
+    # Recheck for missing dates so they can be added in the feather update. Uses the bars of df_all, not the coverage
+    # from before the download, so placeholders are only added for the days Polygon has no bars for.
     missing_dates = get_missing_dates(df_all, asset, start, end)
     update_cache(cache_file, df_all, missing_dates)
 
+    # Every date of the request has now been queried, whether Polygon had bars for it or not
+    coverage.add(*get_requested_date_range(asset, start, end))
+    if cache_file.exists():
+        coverage.save(build_coverage_filename(cache_file))
+
     # TODO: Do this upstream so we don't have to reload feather repeatedly for known-to-be-missing bars.
     # Drop the rows with all NaN values that were added to the feather for symbols that have missing bars.
     if df_all is not None:
@@ -337,7 +347,42 @@ def build_cache_filename(asset: Asset, timespan: str):
     return cache_file
 
 
-def get_missing_dates(df_all, asset, start, end):
+def build_coverage_filename(cache_file: Path):
+    """Helper function to create the filename of the coverage index saved next to a cache file"""
+    return Path(str(cache_file).rpartition(".feather")[0] + "_coverage.feather")
+
+
+def load_coverage(cache_file, df_all):
+    """
+    Load the coverage index (the dates that were already queried from Polygon) of a cache file. Cache files saved
+    without a coverage index are covered on the dates they have bars for.
+
+    Parameters
+    ----------
+    cache_file : Path
+        The path to the cache file
+    df_all : pd.DataFrame
+        Data loaded from the cache file
+
+    Returns
+    -------
+    CoverageIndex
+    """
+    coverage = CoverageIndex.load(build_coverage_filename(cache_file), timedelta(days=1))
+    if coverage is None:
+        coverage = CoverageIndex.from_values(df_all.index.date, timedelta(days=1))
+    return coverage
+
+
+def get_requested_date_range(asset, start, end):
+    """The first and last date of a request, options are not requested past their expiration date"""
+    end_date = end.date()
+    if asset.asset_type == "option":
+        end_date = min(end_date, asset.expiration)
+    return start.date(), end_date
+
+
+def get_missing_dates(df_all, asset, start, end, coverage=None):
     """
     Check if we have data for the full range
     Later Query to Polygon will pad an extra full day to start/end dates so that there should never
@@ -353,6 +398,8 @@ def get_missing_dates(df_all, asset, start, end):
         Start date for the data requested
     end : datetime
         End date for the data requested
+    coverage : CoverageIndex
+        The dates already queried from Polygon. If None, the dates of the bars in df_all are used.
 
     Returns
     -------
@@ -365,14 +412,23 @@ def get_missing_dates(df_all, asset, start, end):
     if asset.asset_type == "option":
         trading_dates = [x for x in trading_dates if x <= asset.expiration]
 
-    if df_all is None or not len(df_all):
+    if coverage is None:
+        if df_all is None or not len(df_all):
+            return trading_dates
+
+        # It is possible to have full day gap in the data if previous queries were far apart
+        # Example: Query for 8/1/2023, then 8/31/2023, then 8/7/2023
+        # Whole days are easy to check for because we can just check the dates in the index
+        coverage = CoverageIndex.from_values(df_all.index.date, timedelta(days=1))
+
+    if not trading_dates:
         return trading_dates
 
-    # It is possible to have full day gap in the data if previous queries were far apart
-    # Example: Query for 8/1/2023, then 8/31/2023, then 8/7/2023
-    # Whole days are easy to check for because we can just check the dates in the index
-    dates = pd.Series(df_all.index.date).unique()
-    missing_dates = sorted(set(trading_dates) - set(dates))
+    missing_dates = []
+    for gap_start, gap_end in coverage.gaps(trading_dates[0], trading_dates[-1]):
+        missing_dates.extend(
+            trading_dates[bisect_left(trading_dates, gap_start):bisect_right(trading_dates, gap_end)]
+        )
 
     return missing_dates
 
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from lumibot import LUMIBOT_DEFAULT_PYTZ
+
+from .yahoo_helper import YahooHelper as yh
+
+# 13 Week Treasury Rate
+RISK_FREE_RATE_SYMBOL = "^IRX"
+
+
+class RiskFreeRateCurve:
+    """Risk-free rates by date, looked up with a binary search.
+
+    The rate at a datetime is the rate of the closest date of the curve, before or after it.
+
+    Parameters
+    ----------
+    rates : pd.Series
+        The rates indexed by date or datetime, as decimals (eg. 0.05 for 5%). Naive datetimes are considered to be in
+        the lumibot default timezone.
+
+    Example
+    -------
+    >>> curve = RiskFreeRateCurve(pd.Series([0.045, 0.047], index=pd.to_datetime(["2023-06-01", "2023-07-03"])))
+    >>> curve.get_rate(datetime(2023, 6, 5))
+    0.045
+    """
+
+    def __init__(self, rates):
+        rates = rates.dropna()
+        index = pd.DatetimeIndex(rates.index)
+        if index.tz is None:
+            index = index.tz_localize(LUMIBOT_DEFAULT_PYTZ)
+        order = np.argsort(index.asi8, kind="stable")
+        self._times = index.asi8[order]
+        self._rates = rates.to_numpy(dtype=float)[order]
+
+    def __len__(self):
+        return len(self._rates)
+
+    def get_rate(self, dt=None):
+        """Returns the rate of the date closest to dt, or the last rate if dt is None. None if the curve is empty."""
+        if len(self._rates) == 0:
+            return None
+        if dt is None:
+            return float(self._rates[-1])
+
+        dt = pd.Timestamp(dt)
+        if dt.tzinfo is None:
+            dt = dt.tz_localize(LUMIBOT_DEFAULT_PYTZ)
+        time = dt.value
+
+        i = int(np.searchsorted(self._times, time))
+        if i == len(self._times):
+            i -= 1
+        elif i > 0 and time - self._times[i - 1] <= self._times[i] - time:
+            i -= 1
+        return float(self._rates[i])
+
+    @classmethod
+    def from_yahoo(cls, symbol=RISK_FREE_RATE_SYMBOL):
+        """The curve of the daily close of a Yahoo treasury rate index, ^IRX by default. None if there is no data."""
+        df = yh.get_symbol_data(symbol)
+        if df is None or df.empty:
+            return None
+        return cls(df["Close"] / 100)
+
+
+# Seconds to wait before trying to load the rates again after a failed load
+RETRY_SECONDS = 60
+
+# The treasury rate curve, loaded once per process (and again the next day) by get_risk_free_rate_curve
+_curve = None
+_curve_date = None
+_retry_time = None
+_curve_lock = threading.Lock()
+
+
+def get_risk_free_rate_curve():
+    """Returns the ^IRX risk-free rate curve, loaded from Yahoo the first time it is needed each day.
+
+    If the rates can't be loaded, the curve of the previous day is returned if there is one, None otherwise, and the
+    load is tried again after RETRY_SECONDS.
+    """
+    global _curve, _curve_date, _retry_time
+    with _curve_lock:
+        today = date.today()
+        if _curve_date != today and (_retry_time is None or time.monotonic() >= _retry_time):
+            try:
+                curve = RiskFreeRateCurve.from_yahoo()
+            except Exception as e:
+                logging.error(f"Error getting the risk free rates: {e}")
+                curve = None
+
+            if curve is None:
+                _retry_time = time.monotonic() + RETRY_SECONDS
+            else:
+                _curve = curve
+                _curve_date = today
+                _retry_time = None
+        return _curve
+
+
+def clear_risk_free_rate_curve():
+    """Forget the loaded curve, the next call to get_risk_free_rate_curve loads it again."""
+    global _curve, _curve_date, _retry_time
+    with _curve_lock:
+        _curve = None
+        _curve_date = None
+        _retry_time = None
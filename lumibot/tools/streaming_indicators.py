@@ -0,0 +1,457 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class StreamingIndicator:
+    """Base class of the indicators that are updated one bar at a time in constant time.
+
+    An indicator is either warmed up at once from a DataFrame of bars with `warmup` (vectorized), or updated bar by
+    bar with `update`. Both give the same state, so a warmed up indicator can then be updated with the next bars.
+
+    Parameters
+    ----------
+    warmup : int
+        The number of bars to warm the indicator up with, see `warmup_length`. Defaults to a few times the period.
+
+    Attributes
+    ----------
+    value : float or None
+        The last value of the indicator, None until it is ready.
+    count : int
+        The number of bars the indicator was updated with.
+    """
+
+    def __init__(self, warmup=None):
+        self.warmup_length = warmup if warmup is not None else self._default_warmup()
+        self.reset()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(value={self.value})"
+
+    def _default_warmup(self):
+        return 1
+
+    @property
+    def ready(self):
+        """True once the indicator had enough bars to have a value."""
+        return self.value is not None
+
+    def reset(self):
+        """Forget all the bars."""
+        self.count = 0
+        self.value = None
+
+    def update(self, dt, open, high, low, close, volume):
+        """Update the indicator with the next bar and return its value (None if it isn't ready yet)."""
+        raise NotImplementedError
+
+    def warmup(self, df):
+        """Reset the indicator and update it with all the bars of df at once.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The bars, with open, high, low, close and volume columns and sorted by datetime.
+        """
+        self.reset()
+        for row in df[OHLCV_COLUMNS].itertuples():
+            self.update(row.Index, row.open, row.high, row.low, row.close, row.volume)
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average of the close prices."""
+
+    def __init__(self, period=20, warmup=None):
+        self.period = period
+        super().__init__(warmup)
+
+    def _default_warmup(self):
+        return self.period
+
+    def reset(self):
+        super().reset()
+        self._window = deque(maxlen=self.period)
+        self._total = 0.0
+
+    def update(self, dt, open, high, low, close, volume):
+        if len(self._window) == self.period:
+            self._total -= self._window[0]
+        self._window.append(close)
+        self._total += close
+        self.count += 1
+        if self.count >= self.period:
+            self.value = self._total / self.period
+        return self.value
+
+    def warmup(self, df):
+        self.reset()
+        closes = df["close"].to_numpy(dtype=float)[-self.period :]
+        self._window.extend(closes)
+        self._total = float(closes.sum())
+        self.count = len(df)
+        if self.count >= self.period:
+            self.value = self._total / self.period
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average of the close prices, seeded with the first close (like pandas' ewm)."""
+
+    def __init__(self, period=20, warmup=None):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        super().__init__(warmup)
+
+    def _default_warmup(self):
+        return 5 * self.period
+
+    def reset(self):
+        super().reset()
+        self._ema = None
+
+    def update(self, dt, open, high, low, close, volume):
+        self._ema = close if self._ema is None else self._ema + self.alpha * (close - self._ema)
+        self.count += 1
+        if self.count >= self.period:
+            self.value = self._ema
+        return self.value
+
+    def warmup(self, df):
+        self._warmup_values(df["close"])
+
+    def _warmup_values(self, values):
+        self.reset()
+        if len(values) == 0:
+            return
+        self._ema = float(values.ewm(alpha=self.alpha, adjust=False).mean().iloc[-1])
+        self.count = len(values)
+        if self.count >= self.period:
+            self.value = self._ema
+
+
+class RSI(StreamingIndicator):
+    """Relative strength index of the close prices, with Wilder's smoothing of the gains and losses."""
+
+    def __init__(self, period=14, warmup=None):
+        self.period = period
+        self.alpha = 1 / period
+        super().__init__(warmup)
+
+    def _default_warmup(self):
+        return 5 * self.period
+
+    def reset(self):
+        super().reset()
+        self._previous_close = None
+        self._average_gain = None
+        self._average_loss = None
+
+    def update(self, dt, open, high, low, close, volume):
+        if self._previous_close is not None:
+            change = close - self._previous_close
+            gain = max(change, 0.0)
+            loss = max(-change, 0.0)
+            if self._average_gain is None:
+                self._average_gain, self._average_loss = gain, loss
+            else:
+                self._average_gain += self.alpha * (gain - self._average_gain)
+                self._average_loss += self.alpha * (loss - self._average_loss)
+        self._previous_close = close
+        self.count += 1
+        if self.count > self.period:
+            self.value = self._rsi()
+        return self.value
+
+    def warmup(self, df):
+        self.reset()
+        closes = df["close"].astype(float)
+        if len(closes) == 0:
+            return
+        self._previous_close = float(closes.iloc[-1])
+        self.count = len(closes)
+        if len(closes) > 1:
+            changes = closes.diff().iloc[1:]
+            self._average_gain = float(changes.clip(lower=0).ewm(alpha=self.alpha, adjust=False).mean().iloc[-1])
+            self._average_loss = float((-changes).clip(lower=0).ewm(alpha=self.alpha, adjust=False).mean().iloc[-1])
+        if self.count > self.period:
+            self.value = self._rsi()
+
+    def _rsi(self):
+        if self._average_loss == 0:
+            return 50.0 if self._average_gain == 0 else 100.0
+        return 100 - 100 / (1 + self._average_gain / self._average_loss)
+
+
+class MACD(StreamingIndicator):
+    """Moving average convergence divergence of the close prices.
+
+    `value` is the MACD line (fast EMA - slow EMA), `signal` its EMA and `histogram` the difference of both.
+    """
+
+    def __init__(self, fast=12, slow=26, signal=9, warmup=None):
+        self.fast = fast
+        self.slow = slow
+        self.signal_period = signal
+        super().__init__(warmup)
+
+    def _default_warmup(self):
+        return 5 * self.slow + self.signal_period
+
+    def reset(self):
+        super().reset()
+        self.signal = None
+        self.histogram = None
+        self._fast_ema = EMA(self.fast)
+        self._slow_ema = EMA(self.slow)
+        self._signal_ema = EMA(self.signal_period)
+
+    def update(self, dt, open, high, low, close, volume):
+        self._fast_ema.update(dt, open, high, low, close, volume)
+        self._slow_ema.update(dt, open, high, low, close, volume)
+        macd = self._fast_ema._ema - self._slow_ema._ema
+        self._signal_ema.update(dt, macd, macd, macd, macd, volume)
+        self.count += 1
+        self._set_value(macd)
+        return self.value
+
+    def warmup(self, df):
+        self.reset()
+        closes = df["close"].astype(float)
+        if len(closes) == 0:
+            return
+        self._fast_ema._warmup_values(closes)
+        self._slow_ema._warmup_values(closes)
+        macd_line = closes.ewm(alpha=self._fast_ema.alpha, adjust=False).mean() - closes.ewm(
+            alpha=self._slow_ema.alpha, adjust=False
+        ).mean()
+        self._signal_ema._warmup_values(macd_line)
+        self.count = len(closes)
+        self._set_value(self._fast_ema._ema - self._slow_ema._ema)
+
+    def _set_value(self, macd):
+        if self.count >= self.slow + self.signal_period - 1:
+            self.value = macd
+            self.signal = self._signal_ema._ema
+            self.histogram = macd - self.signal
+
+
+class ATR(StreamingIndicator):
+    """Average true range, with Wilder's smoothing. The true range of the first bar is its high - low."""
+
+    def __init__(self, period=14, warmup=None):
+        self.period = period
+        self.alpha = 1 / period
+        super().__init__(warmup)
+
+    def _default_warmup(self):
+        return 5 * self.period
+
+    def reset(self):
+        super().reset()
+        self._previous_close = None
+        self._atr = None
+
+    def update(self, dt, open, high, low, close, volume):
+        true_range = high - low
+        if self._previous_close is not None:
+            true_range = max(true_range, abs(high - self._previous_close), abs(low - self._previous_close))
+        self._atr = true_range if self._atr is None else self._atr + self.alpha * (true_range - self._atr)
+        self._previous_close = close
+        self.count += 1
+        if self.count >= self.period:
+            self.value = self._atr
+        return self.value
+
+    def warmup(self, df):
+        self.reset()
+        if len(df) == 0:
+            return
+        high = df["high"].to_numpy(dtype=float)
+        low = df["low"].to_numpy(dtype=float)
+        close = df["close"].to_numpy(dtype=float)
+        previous_close = np.concatenate([[np.nan], close[:-1]])
+        # fmax ignores the missing previous close of the first bar
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+        self._atr = float(pd.Series(true_range).ewm(alpha=self.alpha, adjust=False).mean().iloc[-1])
+        self._previous_close = float(close[-1])
+        self.count = len(df)
+        if self.count >= self.period:
+            self.value = self._atr
+
+
+class BollingerBands(StreamingIndicator):
+    """Bollinger bands of the close prices.
+
+    `value` is the middle band (the simple moving average), `upper` and `lower` are num_std population standard
+    deviations above and below it.
+    """
+
+    def __init__(self, period=20, num_std=2.0, warmup=None):
+        self.period = period
+        self.num_std = num_std
+        super().__init__(warmup)
+
+    def _default_warmup(self):
+        return self.period
+
+    def reset(self):
+        super().reset()
+        self.upper = None
+        self.lower = None
+        self._window = deque(maxlen=self.period)
+        self._total = 0.0
+        self._total_squares = 0.0
+
+    def update(self, dt, open, high, low, close, volume):
+        if len(self._window) == self.period:
+            oldest = self._window[0]
+            self._total -= oldest
+            self._total_squares -= oldest * oldest
+        self._window.append(close)
+        self._total += close
+        self._total_squares += close * close
+        self.count += 1
+        self._set_value()
+        return self.value
+
+    def warmup(self, df):
+        self.reset()
+        closes = df["close"].to_numpy(dtype=float)[-self.period :]
+        self._window.extend(closes)
+        self._total = float(closes.sum())
+        self._total_squares = float((closes * closes).sum())
+        self.count = len(df)
+        self._set_value()
+
+    def _set_value(self):
+        if self.count < self.period:
+            return
+        mean = self._total / self.period
+        # The running sums can make the variance slightly negative when the prices don't move
+        std = math.sqrt(max(self._total_squares / self.period - mean * mean, 0.0))
+        self.value = mean
+        self.upper = mean + self.num_std * std
+        self.lower = mean - self.num_std * std
+
+
+class VWAP(StreamingIndicator):
+    """Volume weighted average of the typical price ((high + low + close) / 3), reset at the start of each day.
+
+    The default warmup (1440 bars) covers a full day of minute bars.
+    """
+
+    def _default_warmup(self):
+        return 1440
+
+    def reset(self):
+        super().reset()
+        self._session = None
+        self._total_price_volume = 0.0
+        self._total_volume = 0.0
+
+    def update(self, dt, open, high, low, close, volume):
+        session = pd.Timestamp(dt).date()
+        if session != self._session:
+            self._session = session
+            self._total_price_volume = 0.0
+            self._total_volume = 0.0
+        typical_price = (high + low + close) / 3
+        self._total_price_volume += typical_price * volume
+        self._total_volume += volume
+        self.count += 1
+        self.value = self._total_price_volume / self._total_volume if self._total_volume > 0 else typical_price
+        return self.value
+
+    def warmup(self, df):
+        self.reset()
+        if len(df) == 0:
+            return
+        sessions = pd.DatetimeIndex(df.index).date
+        session = df[sessions == sessions[-1]]
+        typical_price = (session["high"] + session["low"] + session["close"]).to_numpy(dtype=float) / 3
+        volume = session["volume"].to_numpy(dtype=float)
+        self._session = sessions[-1]
+        self._total_price_volume = float((typical_price * volume).sum())
+        self._total_volume = float(volume.sum())
+        self.count = len(df)
+        self.value = (
+            self._total_price_volume / self._total_volume if self._total_volume > 0 else float(typical_price[-1])
+        )
+
+
+class IndicatorFeed:
+    """Streaming indicators of one asset and timestep, fed with the new bars of the data source.
+
+    Each time `update` is called, only the bars since the previous update are fetched and given to the indicators,
+    so the cost of an update doesn't grow with the length of the indicators. The indicators are warmed up at once,
+    with their vectorized `warmup`, when they are added and when bars were missed (eg. after a long sleep).
+
+    Parameters
+    ----------
+    step : timedelta
+        The duration of a bar, used to work out how many bars were added since the previous update.
+    """
+
+    def __init__(self, step):
+        self.step = step
+        self.indicators = []
+        self.last_dt = None
+        self._pending = []
+
+    def add(self, indicator):
+        """Add an indicator, it is warmed up on the next update."""
+        self.indicators.append(indicator)
+        self._pending.append(indicator)
+        return indicator
+
+    def update(self, get_bars, now):
+        """Feed the indicators with the bars added since the previous update.
+
+        Parameters
+        ----------
+        get_bars : callable
+            Takes a number of bars and returns a DataFrame of the last bars of the asset (see
+            StreamingIndicator.warmup), or None if there are none.
+        now : datetime
+            The current datetime.
+        """
+        warm = [indicator for indicator in self.indicators if indicator not in self._pending]
+        length = max((indicator.warmup_length for indicator in self._pending), default=1)
+        new_bars_length = 0
+        if warm:
+            # Upper bound of the number of bars since the previous update
+            new_bars_length = math.ceil(max((now - self.last_dt) / self.step, 0)) + 1
+            length = max(length, min(new_bars_length, max(indicator.warmup_length for indicator in warm)))
+
+        df = get_bars(length)
+        if df is None or len(df) == 0:
+            return
+        df = _ohlcv(df)
+
+        for indicator in self._pending:
+            indicator.warmup(df)
+        self._pending = []
+
+        if warm:
+            new_bars = df[df.index > self.last_dt]
+            if len(new_bars) == len(df) and new_bars_length > len(df):
+                # Some bars may have been missed, start over
+                for indicator in warm:
+                    indicator.warmup(df)
+            else:
+                for row in new_bars.itertuples():
+                    for indicator in warm:
+                        indicator.update(row.Index, row.open, row.high, row.low, row.close, row.volume)
+
+        self.last_dt = df.index[-1]
+
+
+def _ohlcv(df):
+    df = df.sort_index()
+    if "volume" not in df.columns:
+        df = df.assign(volume=0.0)
+    return df[OHLCV_COLUMNS].astype(float)
@@ -1,6 +1,31 @@
 import warnings
 from decimal import Decimal
 
+# How the quantities (orders, positions, fills, fees) are stored. "decimal" keeps an exact decimal accounting,
+# "float" uses native floats all the way through, which is faster for backtests that don't need exact quantities.
+NUMERIC_MODES = ("decimal", "float")
+_numeric_mode = "decimal"
+
+
+def set_numeric_mode(mode):
+    """Set how the quantities are stored, see NUMERIC_MODES. Should be set before creating orders and positions."""
+    global _numeric_mode
+    if mode not in NUMERIC_MODES:
+        raise ValueError(f"Invalid numeric mode {mode!r}, must be one of {NUMERIC_MODES}")
+    _numeric_mode = mode
+
+
+def get_numeric_mode():
+    """Returns the current numeric mode, "decimal" or "float"."""
+    return _numeric_mode
+
+
+def to_quantity(value):
+    """Converts value to the quantity type of the current numeric mode, a Decimal or a float."""
+    if _numeric_mode == "float":
+        return float(value)
+    return value if isinstance(value, Decimal) else Decimal(value)
+
 
 def check_numeric(
     input, type, error_message, positive=True, strict=False, nullable=False, ratio=False
@@ -52,18 +77,15 @@ def check_positive(input, type, custom_message="", strict=False):
     return result
 
 def check_quantity(quantity, custom_message=""):
-    error_message = "%r is not a positive Decimal." % quantity
+    quantity = to_quantity(quantity)
+    # Called for every order, so the error message is only built when the quantity is invalid
+    if quantity > 0:
+        return quantity
+
+    error_message = "%r is not a positive quantity." % quantity
     if custom_message:
         error_message = f"{error_message} {custom_message}"
-
-    quantity = Decimal(quantity)
-    result = check_numeric(
-        quantity,
-        Decimal,
-        error_message,
-        strict=True,
-    )
-    return result
+    raise ValueError(error_message)
 
 
 def check_price(price, custom_message="", nullable=True):
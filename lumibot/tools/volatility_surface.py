@@ -0,0 +1,230 @@
+from datetime import date
+
+import numpy as np
+
+from .black_scholes import bs_greeks, bs_implied_volatility, bs_price
+
+
+class VolatilitySurface:
+    """Implied volatilities of an option chain by expiration and strike, with interpolation.
+
+    The option prices are added with `update`, one expiration at a time, and the implied volatilities are only solved
+    when the surface is queried. Only the options whose price changed since the last query are solved again, unless
+    the underlying price or the interest rate changed, or the time to the expiration moved by more than
+    DAYS_TOLERANCE since the volatilities were solved, so a surface that is kept and updated at every bar costs a lot
+    less than repricing the whole chain.
+
+    For each expiration, the smile uses the implied volatility of the out of the money option of each strike (the put
+    below the underlying price and the call above it) and is linearly interpolated between the strikes. Between two
+    expirations the total variance (volatility² × time) is linearly interpolated in time. The volatility is flat
+    outside of the strikes and expirations of the surface.
+
+    Units are the ones of `black_scholes`: the interest rate and the volatilities are in percent and the time to
+    expiration is in days.
+
+    Parameters
+    ----------
+    underlying_price : float
+        The price of the underlying asset.
+    interest_rate : float
+        The risk-free rate in percent, eg. 5 for 5%.
+
+    Example
+    -------
+    >>> surface = VolatilitySurface(underlying_price=382.0, interest_rate=4.0)
+    >>> surface.update(date(2023, 2, 17), 45.3, strikes=[370, 380, 390], prices=[6.2, 11.9, 6.8],
+    ...                is_call=[False, True, True])
+    >>> surface.implied_volatility(date(2023, 2, 17), 385)
+    >>> surface.price(date(2023, 3, 17), 385, is_call=True)
+    """
+
+    # The implied volatilities of an expiration are solved again once its time to expiration moved by more than this
+    # number of days, the time passing between two updates barely changes them
+    DAYS_TOLERANCE = 1 / 24
+
+    def __init__(self, underlying_price, interest_rate):
+        self.underlying_price = float(underlying_price)
+        self.interest_rate = float(interest_rate)
+        # expiration -> {"days": float, "solved_days": float, "contracts": {(strike, is_call): [price, iv]},
+        # "stale": set of contracts}, solved_days being the time to expiration the volatilities were solved with
+        self._expirations = {}
+        # expiration -> (strikes, ivs), rebuilt when the implied volatilities of the expiration change
+        self._smiles = {}
+        # Number of implied volatilities solved, to see how much the incremental updates save
+        self.solved_count = 0
+
+    def __repr__(self):
+        return f"VolatilitySurface(underlying_price={self.underlying_price}, expirations={self.expirations})"
+
+    @property
+    def expirations(self):
+        """The expirations of the surface, sorted."""
+        return sorted(self._expirations)
+
+    def set_underlying_price(self, underlying_price):
+        """Change the underlying price, all the implied volatilities will be solved again."""
+        underlying_price = float(underlying_price)
+        if underlying_price != self.underlying_price:
+            self.underlying_price = underlying_price
+            self._invalidate()
+
+    def set_interest_rate(self, interest_rate):
+        """Change the interest rate (in percent), all the implied volatilities will be solved again."""
+        interest_rate = float(interest_rate)
+        if interest_rate != self.interest_rate:
+            self.interest_rate = interest_rate
+            self._invalidate()
+
+    def update(self, expiration, days_to_expiration, strikes, prices, is_call=True):
+        """Set the prices of options of one expiration.
+
+        Options that are not in `strikes` keep their previous price.
+
+        Parameters
+        ----------
+        expiration : datetime.date
+            The expiration of the options.
+        days_to_expiration : float
+            The time left until the expiration, in days.
+        strikes : list[float] or np.ndarray
+        prices : list[float] or np.ndarray
+            The price of each option, None or NaN if the option has no price.
+        is_call : bool or list[bool]
+            True for calls, False for puts.
+        """
+        strikes = np.atleast_1d(np.asarray(strikes, dtype=float))
+        prices = np.array([np.nan if price is None else price for price in np.atleast_1d(prices)], dtype=float)
+        is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), strikes.shape)
+
+        entry = self._expirations.setdefault(
+            expiration, {"days": None, "solved_days": None, "contracts": {}, "stale": set()}
+        )
+        entry["days"] = float(days_to_expiration)
+        if entry["solved_days"] is None or abs(entry["days"] - entry["solved_days"]) > self.DAYS_TOLERANCE:
+            entry["solved_days"] = entry["days"]
+            entry["stale"].update(entry["contracts"])
+
+        contracts = entry["contracts"]
+        for strike, price, call in zip(strikes.tolist(), prices.tolist(), is_call.tolist()):
+            contract = (strike, call)
+            current = contracts.get(contract)
+            if current is None:
+                contracts[contract] = [price, np.nan]
+            elif current[0] == price or (np.isnan(price) and np.isnan(current[0])):
+                continue
+            else:
+                current[0] = price
+            entry["stale"].add(contract)
+
+    def remove(self, expiration):
+        """Remove an expiration from the surface, eg. once it has expired."""
+        self._expirations.pop(expiration, None)
+        self._smiles.pop(expiration, None)
+
+    def smile(self, expiration):
+        """Returns the strikes and the implied volatilities (in percent) of one expiration, sorted by strike."""
+        self._solve(expiration)
+        return self._smiles[expiration]
+
+    def implied_volatility(self, expiration, strike):
+        """Returns the interpolated implied volatility (in percent) of the options of a strike and an expiration.
+
+        Parameters
+        ----------
+        expiration : datetime.date or float
+            The expiration of the options, or the number of days until it. The expiration doesn't need to be in the
+            surface.
+        strike : float or np.ndarray
+
+        Returns
+        -------
+        float or np.ndarray
+            NaN if the surface has no implied volatility.
+        """
+        days = self._get_days(expiration)
+        strike = np.asarray(strike, dtype=float)
+
+        # The total variance of each expiration of the surface at the strikes
+        expirations = [exp for exp in self.expirations if len(self.smile(exp)[0]) > 0]
+        if not expirations:
+            return np.full(strike.shape, np.nan)[()]
+
+        all_days = np.array([self._expirations[exp]["days"] for exp in expirations])
+        ivs = np.array([np.interp(strike, *self.smile(exp)) for exp in expirations])
+
+        i = np.searchsorted(all_days, days)
+        if i == 0 or i == len(all_days) or all_days[i - 1] <= 0:
+            # Flat volatility outside of the expirations of the surface
+            iv = ivs[min(i, len(all_days) - 1)]
+        else:
+            d0, d1 = all_days[i - 1], all_days[i]
+            w0, w1 = ivs[i - 1] ** 2 * d0, ivs[i] ** 2 * d1
+            iv = np.sqrt((w0 + (w1 - w0) * (days - d0) / (d1 - d0)) / days)
+        return iv[()]
+
+    def price(self, expiration, strike, is_call=True):
+        """Returns the Black-Scholes price of options with the interpolated implied volatility, see
+        `implied_volatility`."""
+        iv = self.implied_volatility(expiration, strike)
+        return bs_price(
+            self.underlying_price, strike, self.interest_rate, self._get_days(expiration), iv, is_call
+        )
+
+    def greeks(self, expiration, strike, is_call=True):
+        """Returns the Black-Scholes price and greeks of options with the interpolated implied volatility, see
+        `black_scholes.bs_greeks`."""
+        iv = self.implied_volatility(expiration, strike)
+        greeks = bs_greeks(
+            self.underlying_price, strike, self.interest_rate, self._get_days(expiration), iv, is_call
+        )
+        greeks["implied_volatility"] = iv
+        return greeks
+
+    def _get_days(self, expiration):
+        if not isinstance(expiration, date):
+            return float(expiration)
+
+        entry = self._expirations.get(expiration)
+        if entry is not None:
+            return entry["days"]
+
+        # All the expirations are at the same time of day, so the days to any expiration follow from a known one
+        if not self._expirations:
+            raise ValueError(f"Cannot get the time to the expiration {expiration} of an empty volatility surface")
+        known, entry = next(iter(self._expirations.items()))
+        return entry["days"] + (expiration - known).days
+
+    def _invalidate(self):
+        for entry in self._expirations.values():
+            entry["stale"].update(entry["contracts"])
+
+    def _solve(self, expiration):
+        """Solve the implied volatilities of the stale options of an expiration and rebuild its smile."""
+        entry = self._expirations[expiration]
+        if not entry["stale"] and expiration in self._smiles:
+            return
+
+        stale = list(entry["stale"])
+        if stale:
+            strikes = np.array([strike for strike, _ in stale])
+            is_call = np.array([call for _, call in stale])
+            prices = np.array([entry["contracts"][contract][0] for contract in stale])
+            ivs = bs_implied_volatility(
+                self.underlying_price, strikes, self.interest_rate, entry["days"], prices, is_call
+            )
+            for contract, iv in zip(stale, np.atleast_1d(ivs).tolist()):
+                entry["contracts"][contract][1] = iv
+            self.solved_count += len(stale)
+            entry["stale"].clear()
+
+        # Use the out of the money option of each strike, or the other one if it has no implied volatility
+        smile = {}
+        for (strike, call), (_, iv) in entry["contracts"].items():
+            if np.isnan(iv):
+                continue
+            otm = call == (strike >= self.underlying_price)
+            if otm or strike not in smile:
+                smile[strike] = iv
+
+        strikes = np.array(sorted(smile))
+        self._smiles[expiration] = (strikes, np.array([smile[strike] for strike in strikes]))
@@ -1,13 +1,16 @@
 import logging
 import os
 import pickle
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
 from lumibot import LUMIBOT_CACHE_FOLDER, LUMIBOT_DEFAULT_PYTZ
 
+from .coverage_index import CoverageIndex
 from .helpers import get_lumibot_datetime
 
 DAY_DATA = "day_data"
@@ -15,12 +18,20 @@ INFO_DATA = "info"
 
 
 class _YahooData:
-    def __init__(self, symbol, type, data):
+    def __init__(self, symbol, type, data, coverage=None):
         self.symbol = symbol
         self.type = type.lower()
         self.data = data
+        # The dates already checked on Yahoo, which can go past the last bar (eg. weekends and holidays)
+        self.coverage = coverage
         self.file_name = f"{symbol}_{type.lower()}.pickle"
 
+    def is_empty(self):
+        if self.type == DAY_DATA:
+            return self.data is None or self.data.empty
+
+        return not self.data
+
     def is_up_to_date(self, last_needed_datetime=None):
         if last_needed_datetime is None:
             last_needed_datetime = get_lumibot_datetime()
@@ -28,10 +39,13 @@ class _YahooData:
         if self.type == DAY_DATA:
             last_needed_date = last_needed_datetime.date()
             last_day = self.data.index[-1].to_pydatetime().date()
+            coverage = self.coverage
+            if coverage is None:
+                coverage = CoverageIndex(timedelta(days=1), intervals=[(last_day, last_day)])
 
-            # ip_up_to_date will always return False on holidays even though
-            # the data is up-to-date because the market is still closed
-            return last_day >= last_needed_date
+            # Nothing is missing between the last bar and the last needed date. is_up_to_date will
+            # return False on the current day if it is a holiday because that day has not been checked yet.
+            return not coverage.gaps(last_day, last_needed_date)
 
         if self.type == INFO_DATA:
             if self.data.get("error"):
@@ -49,6 +63,8 @@ class YahooHelper:
     # =========Internal initialization parameters and methods============
 
     CACHING_ENABLED = False
+    # Number of threads used to download the day data of several symbols at once
+    MAX_DOWNLOAD_WORKERS = 8
     LUMIBOT_YAHOO_CACHE_FOLDER = os.path.join(LUMIBOT_CACHE_FOLDER, "yahoo")
 
     if not os.path.exists(LUMIBOT_YAHOO_CACHE_FOLDER):
@@ -86,6 +102,58 @@ class YahooHelper:
             with open(pickle_file_path, "wb") as f:
                 pickle.dump(yahoo_data, f)
 
+    @staticmethod
+    def get_feather_file_path(symbol, type):
+        file_name = f"{symbol}_{type.lower()}.feather"
+        return os.path.join(YahooHelper.LUMIBOT_YAHOO_CACHE_FOLDER, file_name)
+
+    @staticmethod
+    def get_coverage_file_path(symbol, type):
+        file_name = f"{symbol}_{type.lower()}_coverage.feather"
+        return os.path.join(YahooHelper.LUMIBOT_YAHOO_CACHE_FOLDER, file_name)
+
+    @staticmethod
+    def check_feather_file(symbol, type):
+        """Load a DataFrame cached in the columnar (feather) format. DataFrames cached as pickles by older versions
+        of lumibot are converted to feather the first time they are loaded."""
+        if YahooHelper.CACHING_ENABLED:
+            feather_file_path = YahooHelper.get_feather_file_path(symbol, type)
+            if os.path.exists(feather_file_path):
+                try:
+                    df = pd.read_feather(feather_file_path)
+                    # The index is saved as the first column
+                    df = df.set_index(df.columns[0])
+                    coverage = CoverageIndex.load(YahooHelper.get_coverage_file_path(symbol, type), timedelta(days=1))
+                    return _YahooData(symbol, type, df, coverage=coverage)
+                except Exception as e:
+                    logging.error("Error while loading feather file %s: %s" % (feather_file_path, e))
+                    return None
+
+            cached_data = YahooHelper.check_pickle_file(symbol, type)
+            if cached_data is not None and not cached_data.is_empty():
+                YahooHelper.dump_feather_file(symbol, type, cached_data.data)
+                os.remove(os.path.join(YahooHelper.LUMIBOT_YAHOO_CACHE_FOLDER, cached_data.file_name))
+            return cached_data
+
+        return None
+
+    @staticmethod
+    def dump_feather_file(symbol, type, data):
+        if YahooHelper.CACHING_ENABLED:
+            feather_file_path = YahooHelper.get_feather_file_path(symbol, type)
+            data.reset_index().to_feather(feather_file_path)
+
+    @staticmethod
+    def dump_day_data_coverage(symbol, data):
+        """Save the dates checked on Yahoo for the day data of a symbol that was just downloaded. The bars of the
+        days before today are final, so they are covered even when they have no bar (weekends and holidays)."""
+        if YahooHelper.CACHING_ENABLED:
+            first_day = data.index[0].to_pydatetime().date()
+            last_day = data.index[-1].to_pydatetime().date()
+            checked_day = max(last_day, get_lumibot_datetime().date() - timedelta(days=1))
+            coverage = CoverageIndex(timedelta(days=1), intervals=[(first_day, checked_day)])
+            coverage.save(YahooHelper.get_coverage_file_path(symbol, DAY_DATA))
+
     # ====================Formatters methods===============================
 
     @staticmethod
@@ -169,10 +237,13 @@ class YahooHelper:
         return df["Close"].iloc[-1]
 
     @staticmethod
-    def download_symbol_day_data(symbol):
+    def download_symbol_day_data(symbol, start=None):
         ticker = yf.Ticker(symbol)
         try:
-            df = ticker.history(period="max", auto_adjust=False)
+            if start is None:
+                df = ticker.history(period="max", auto_adjust=False)
+            else:
+                df = ticker.history(start=start, auto_adjust=False)
         except Exception as e:
             logging.debug(f"Error while downloading symbol day data for {symbol}, returning empty dataframe for now.")
             logging.debug(e)
@@ -199,6 +270,32 @@ class YahooHelper:
         df = YahooHelper.process_df(df, asset_info=info)
         return df
 
+    @staticmethod
+    def update_symbol_day_data(symbol, df):
+        """Download only the bars that are missing at the end of df and append them.
+
+        Dividends and splits change the adjusted prices of the whole history, so if one happened since the last
+        cached bar (or the prices of the last cached bar changed) the full history is downloaded again instead."""
+        last_datetime = df.index[-1]
+        df_tail = YahooHelper.download_symbol_day_data(symbol, start=last_datetime.date())
+        if df_tail is None or df_tail.empty:
+            return df
+
+        df_new = df_tail[df_tail.index > last_datetime]
+        if df_new.empty:
+            return df
+
+        actions_columns = [col for col in ["Dividends", "Stock Splits"] if col in df_new.columns]
+        has_actions = (df_new[actions_columns] != 0).any().any()
+
+        df_overlap = df_tail[df_tail.index == last_datetime]
+        prices_changed = not df_overlap.empty and not np.isclose(df_overlap["Close"].iloc[-1], df["Close"].iloc[-1])
+
+        if has_actions or prices_changed:
+            return YahooHelper.download_symbol_day_data(symbol)
+
+        return pd.concat([df, df_new])
+
     @staticmethod
     def download_symbols_day_data(symbols):
         if len(symbols) == 1:
@@ -237,41 +334,59 @@ class YahooHelper:
 
     @staticmethod
     def fetch_symbol_day_data(symbol, caching=True, last_needed_datetime=None):
+        cached_data = None
         if caching:
-            cached_data = YahooHelper.check_pickle_file(symbol, DAY_DATA)
+            cached_data = YahooHelper.check_feather_file(symbol, DAY_DATA)
             if cached_data:
                 if cached_data.is_up_to_date(last_needed_datetime=last_needed_datetime):
                     return cached_data.data
 
         # Caching is disabled or no previous data found
         # or data found not up to date
-        data = YahooHelper.download_symbol_day_data(symbol)
+        return YahooHelper.refresh_symbol_day_data(symbol, cached_data)
+
+    @staticmethod
+    def refresh_symbol_day_data(symbol, cached_data=None):
+        """Download the day data of a symbol and cache it. If there is cached data then only the missing bars at
+        the end are downloaded."""
+        if cached_data is not None and not cached_data.is_empty():
+            data = YahooHelper.update_symbol_day_data(symbol, cached_data.data)
+            if data is cached_data.data:
+                # Nothing new was downloaded (eg. on market holidays)
+                YahooHelper.dump_day_data_coverage(symbol, data)
+                return data
+        else:
+            data = YahooHelper.download_symbol_day_data(symbol)
 
         # Check if the data is empty
         if data is None or data.empty:
             return data
 
-        YahooHelper.dump_pickle_file(symbol, DAY_DATA, data)
+        YahooHelper.dump_feather_file(symbol, DAY_DATA, data)
+        YahooHelper.dump_day_data_coverage(symbol, data)
         return data
 
     @staticmethod
     def fetch_symbols_day_data(symbols, caching=True):
         result = {}
-        missing_symbols = symbols.copy()
+        missing_symbols = {}
 
-        if caching:
-            for symbol in symbols:
-                cached_data = YahooHelper.check_pickle_file(symbol, DAY_DATA)
-                if cached_data:
-                    if cached_data.is_up_to_date():
-                        result[symbol] = cached_data.data
-                        missing_symbols.remove(symbol)
+        for symbol in symbols:
+            cached_data = YahooHelper.check_feather_file(symbol, DAY_DATA) if caching else None
+            if cached_data and cached_data.is_up_to_date():
+                result[symbol] = cached_data.data
+            else:
+                missing_symbols[symbol] = cached_data
 
+        # Download all the missing symbols in one multi-threaded batch
         if missing_symbols:
-            missing_data = YahooHelper.download_symbols_day_data(missing_symbols)
-            for symbol, data in missing_data.items():
-                result[symbol] = data
-                YahooHelper.dump_pickle_file(symbol, DAY_DATA, data)
+            with ThreadPoolExecutor(max_workers=YahooHelper.MAX_DOWNLOAD_WORKERS) as executor:
+                futures = {
+                    symbol: executor.submit(YahooHelper.refresh_symbol_day_data, symbol, cached_data)
+                    for symbol, cached_data in missing_symbols.items()
+                }
+                for symbol, future in futures.items():
+                    result[symbol] = future.result()
 
         return result
 
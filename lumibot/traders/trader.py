@@ -54,7 +54,15 @@ class Trader:
         """Adds a strategy to the trader"""
         self._strategies.append(strategy)
 
-    def run_all(self, async_=False, show_plot=True, show_tearsheet=True, save_tearsheet=True, show_indicators=True):
+    def run_all(
+        self,
+        async_=False,
+        show_plot=True,
+        show_tearsheet=True,
+        save_tearsheet=True,
+        show_indicators=True,
+        background_reports=False,
+    ):
         """
         run all strategies
 
@@ -75,6 +83,11 @@ class Trader:
         show_indicators: bool
             Whether to display the indicators (markers and lines) in the user's web browser. This is only used for backtesting.
 
+        background_reports: bool
+            Whether to create the plots and the tearsheet in a background process, so that the results are returned
+            as soon as the backtest is done. The strategy's `backtest_reports` can be used to wait for them. This is
+            only used for backtesting.
+
         Returns
         -------
         dict
@@ -125,6 +138,7 @@ class Trader:
                 show_tearsheet=show_tearsheet,
                 save_tearsheet=save_tearsheet,
                 show_indicators=show_indicators,
+                background_reports=background_reports,
             )
 
         return result
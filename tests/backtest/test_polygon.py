@@ -1,5 +1,6 @@
 import datetime
 import os
+import threading
 from collections import defaultdict
 
 import pandas_market_calendars as mcal
@@ -272,3 +273,66 @@ class TestPolygonBacktestFull:
             polygon_has_paid_subscription=True,
         )
         assert results
+
+
+class TestPolygonPrefetch:
+    def test_prefetch_is_used_by_update_pandas_data(self, mocker):
+        import pandas as pd
+
+        index = pd.date_range("2023-07-20 09:30", periods=10000, freq="1min", tz="America/New_York")
+        df = pd.DataFrame(
+            {"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0},
+            index=index,
+        )
+        mock_download = mocker.patch(
+            "lumibot.backtesting.polygon_backtesting.polygon_helper.get_price_data_from_polygon",
+            return_value=df,
+        )
+
+        data_source = PolygonDataBacktesting(
+            datetime.datetime(2023, 8, 1), datetime.datetime(2023, 8, 4), api_key="abc123"
+        )
+        asset = Asset("SPY")
+        data_source.prefetch([asset], timestep="minute")
+        assert len(data_source._prefetch_futures) == 1
+
+        # Prefetching again while the download is pending doesn't start another download
+        data_source.prefetch([asset], timestep="minute")
+        assert len(data_source._prefetch_futures) == 1
+
+        data_source._update_pandas_data(asset, None, 1, "minute", data_source.get_datetime())
+        assert not data_source._prefetch_futures
+        assert mock_download.call_count == 1
+
+        data = data_source._data_store[(asset, Asset("USD", "forex"))]
+        assert data.is_repaired
+
+    def test_cancel_prefetch(self, mocker):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_download(*args, **kwargs):
+            started.set()
+            release.wait(10)
+            return None
+
+        mock_download = mocker.patch(
+            "lumibot.backtesting.polygon_backtesting.polygon_helper.get_price_data_from_polygon",
+            side_effect=slow_download,
+        )
+        mocker.patch.object(PolygonDataBacktesting, "PREFETCH_MAX_WORKERS", 1)
+
+        data_source = PolygonDataBacktesting(
+            datetime.datetime(2023, 8, 1), datetime.datetime(2023, 8, 4), api_key="abc123"
+        )
+        data_source.prefetch([Asset("SPY"), Asset("QQQ"), Asset("IWM")], timestep="minute")
+        assert started.wait(10)
+        futures = list(data_source._prefetch_futures.values())
+
+        data_source.cancel_prefetch()
+        assert data_source._prefetch_executor is None and not data_source._prefetch_futures
+        # The queued downloads never start
+        assert all(future.cancelled() for future in futures[1:])
+        release.set()
+        futures[0].result(timeout=10)
+        assert mock_download.call_count == 1
@@ -1,5 +1,8 @@
+from types import SimpleNamespace
+
 from lumibot.brokers.alpaca import Alpaca
 from lumibot.data_sources.alpaca_data import AlpacaData
+from lumibot.entities import Asset
 from lumibot.example_strategies.stock_buy_and_hold import BuyAndHold
 
 # Fake credentials, they do not need to be real
@@ -27,3 +30,62 @@ def test_initialize_broker_legacy():
 
     # Assert that strategy.data_source is AlpacaData object
     assert isinstance(strategy.broker.data_source, AlpacaData)
+
+
+class FakeClient:
+    """Records the requested symbols and returns latest trades or quotes for them"""
+
+    def __init__(self):
+        self.requests = []
+
+    def _symbols(self, request):
+        symbols = request.symbol_or_symbols
+        self.requests.append(symbols)
+        return [symbols] if isinstance(symbols, str) else symbols
+
+    def get_stock_latest_trade(self, request):
+        # Like some symbols, "OLD" is only returned when it is requested alone
+        batch = not isinstance(request.symbol_or_symbols, str)
+        symbols = self._symbols(request)
+        return {
+            symbol: SimpleNamespace(price=100.0 + i)
+            for i, symbol in enumerate(symbols)
+            if not (batch and symbol == "OLD")
+        }
+
+    def get_crypto_latest_quote(self, request):
+        return {symbol: SimpleNamespace(bid_price=9.0, ask_price=11.0) for symbol in self._symbols(request)}
+
+
+def test_get_last_prices_batches_requests():
+    data_source = AlpacaData(ALPACA_CONFIG, chunk_size=2)
+    stock_client = data_source._stock_client = FakeClient()
+    crypto_client = data_source._crypto_client = FakeClient()
+
+    stocks = [Asset("AAPL"), Asset("MSFT"), Asset("SPY")]
+    btc = Asset("BTC", asset_type="crypto")
+    prices = data_source.get_last_prices(stocks + [btc], quote=Asset("USD", asset_type="forex"))
+
+    assert stock_client.requests == [["AAPL", "MSFT"], ["SPY"]]
+    assert crypto_client.requests == [["BTC/USD"]]
+    assert prices[Asset("AAPL")] == 100.0 and prices[Asset("MSFT")] == 101.0 and prices[Asset("SPY")] == 100.0
+    assert prices[btc] == 10.0
+    assert prices["AAPL"] == 100.0
+
+
+def test_get_last_price_reuses_clients():
+    data_source = AlpacaData(ALPACA_CONFIG)
+    stock_client = data_source._stock_client = FakeClient()
+
+    assert data_source.get_last_price(Asset("AAPL")) == 100.0
+    assert data_source.get_last_price(Asset("MSFT")) == 100.0
+    assert stock_client.requests == ["AAPL", "MSFT"]
+
+
+def test_get_last_prices_requests_missing_symbols_one_by_one():
+    data_source = AlpacaData(ALPACA_CONFIG)
+    stock_client = data_source._stock_client = FakeClient()
+
+    prices = data_source.get_last_prices([Asset("AAPL"), Asset("OLD")])
+    assert prices[Asset("AAPL")] == 100.0 and prices[Asset("OLD")] == 100.0
+    assert stock_client.requests == [["AAPL", "OLD"], "OLD"]
@@ -1,4 +1,6 @@
+import copy
 import datetime
+import pickle
 from collections.abc import Hashable
 
 import pytest
@@ -80,3 +82,32 @@ def test_right_validator(param):
 def test_asset_types_validator(param):
     with pytest.raises(Exception):
         Asset(symbol="ABC", asset_type=param)
+
+
+def test_assets_are_interned():
+    a = Asset(symbol="ABC", asset_type="option", expiration=datetime.date(2020, 1, 1), strike=150, right="CALL")
+    b = Asset(symbol="ABC", asset_type="option", expiration=datetime.datetime(2020, 1, 1), strike=150, right="call")
+    assert a is b
+    assert Asset("USD", "forex") is Asset("USD", "forex")
+    assert hash(a) == hash(("ABC", "option", datetime.date(2020, 1, 1), 150, "CALL"))
+
+    # Different fields are different objects, even if they are equal
+    assert Asset("ES", "future", multiplier=50) is not Asset("ES", "future")
+    assert Asset("ES", "future", multiplier=50) == Asset("ES", "future")
+    assert repr(Asset("ABC", "option", datetime.date(2020, 1, 1), 150.0, "CALL")) == "ABC 2020-01-01 150.0 CALL"
+
+
+def test_assets_are_immutable():
+    asset = Asset(symbol="ABC")
+    with pytest.raises(AttributeError):
+        asset.symbol = "XYZ"
+    with pytest.raises(AttributeError):
+        asset.extra = 1
+    assert asset.symbol == "ABC"
+
+
+def test_copies_are_interned():
+    asset = Asset(symbol="ABC", asset_type="future", expiration=datetime.date(2020, 3, 20), multiplier=50)
+    assert pickle.loads(pickle.dumps(asset)) is asset
+    assert copy.deepcopy(asset) is asset
+    assert copy.deepcopy({asset: 1}) == {asset: 1}
@@ -0,0 +1,36 @@
+import os
+from datetime import datetime
+from pathlib import Path
+
+from lumibot.backtesting import BacktestingBroker, PandasDataBacktesting
+from lumibot.example_strategies.stock_buy_and_hold import BuyAndHold
+from lumibot.tools import BackgroundReports
+
+
+class TestBackgroundReports:
+    def test_reports_are_rendered(self, tmpdir):
+        report_file = Path(tmpdir) / "report.html"
+        tasks = [
+            (os.remove, (str(Path(tmpdir) / "missing.html"),), {}),
+            (Path.write_text, (report_file, "<html></html>"), {}),
+        ]
+
+        reports = BackgroundReports(tasks, files=[str(report_file)])
+        # The failing report doesn't stop the next one
+        assert reports.wait(timeout=60) == ["remove"]
+        assert reports.done()
+        assert report_file.read_text() == "<html></html>"
+
+    def test_backtest_analysis_in_background(self, tmpdir, mocker):
+        date_start = datetime(2023, 1, 2)
+        date_end = datetime(2023, 1, 31)
+        data_source = PandasDataBacktesting(date_start, date_end, pandas_data={})
+        strategy = BuyAndHold(BacktestingBroker(data_source), backtesting_start=date_start, backtesting_end=date_end)
+        mocker.patch.object(strategy.broker, "export_trade_events_to_csv")
+
+        strategy.backtest_analysis(
+            logdir=str(tmpdir), save_tearsheet=False, show_tearsheet=False, background_reports=True
+        )
+        assert strategy.backtest_reports is not None
+        assert strategy.backtest_reports.wait(timeout=60) == []
+        assert strategy.backtest_reports.files[0].startswith(str(tmpdir))
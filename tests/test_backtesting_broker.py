@@ -1,7 +1,15 @@
 import datetime
+from decimal import Decimal
+from types import SimpleNamespace
 
-from lumibot.backtesting import BacktestingBroker
+import pytest
+
+from lumibot.backtesting import BacktestingBroker, PandasDataBacktesting
 from lumibot.data_sources import PandasData
+from lumibot.entities import Asset, Order, TradingFee
+from lumibot.example_strategies.stock_buy_and_hold import BuyAndHold
+from lumibot.tools import get_numeric_mode, set_numeric_mode
+from lumibot.traders import Trader
 
 
 class TestBacktestingBroker:
@@ -56,3 +64,75 @@ class TestBacktestingBroker:
         # Stop not triggered
         stop_price = 80
         assert not broker.stop_order(stop_price, 'sell', open_=100, high=110, low=90)
+
+    def test_trade_event_log(self):
+        start = datetime.datetime(2023, 8, 1)
+        end = datetime.datetime(2023, 8, 2)
+        data_source = PandasData(datetime_start=start, datetime_end=end, pandas_data={})
+        broker = BacktestingBroker(data_source=data_source)
+        assert broker._trade_event_log_df.empty
+
+        orders = [Order("abc", Asset("SPY"), 10, "buy", limit_price=100) for _ in range(3)]
+        for order in orders:
+            broker._process_trade_event(order, broker.NEW_ORDER)
+        broker._process_trade_event(orders[0], broker.FILLED_ORDER, price=99.5, filled_quantity=10)
+        broker._process_trade_event(orders[1], broker.CANCELED_ORDER)
+
+        df = broker._trade_event_log_df
+        assert len(df) == 5
+        assert list(df["identifier"]) == [order.identifier for order in orders] + [
+            orders[0].identifier,
+            orders[1].identifier,
+        ]
+        assert list(df["status"]) == ["new", "new", "new", "fill", "canceled"]
+        assert df["price"].iloc[3] == 99.5 and df["price"].isna().sum() == 4
+        # Columns without values are left out, like for stocks the option columns
+        assert "asset.right" not in df.columns
+        assert "asset.asset_type" in df.columns
+
+    def test_float_numeric_mode(self):
+        start = datetime.datetime(2023, 8, 1)
+        end = datetime.datetime(2023, 8, 2)
+        data_source = PandasData(datetime_start=start, datetime_end=end, pandas_data={})
+        broker = BacktestingBroker(data_source=data_source)
+        strategy = SimpleNamespace(buy_trading_fees=[TradingFee(flat_fee=1, percent_fee=0.01)], sell_trading_fees=[])
+
+        set_numeric_mode("float")
+        try:
+            order = Order("abc", Asset("SPY"), 10, "buy", limit_price=100)
+            broker._process_trade_event(order, broker.NEW_ORDER)
+            broker._process_trade_event(order, broker.FILLED_ORDER, price=99.5, filled_quantity=10)
+            position = broker.get_tracked_position("abc", Asset("SPY"))
+            assert type(position._quantity) is float and position.quantity == 10
+
+            order = Order("abc", Asset("SPY"), 10, "buy", type="limit", limit_price=100)
+            trade_cost = broker.calculate_trade_cost(order, strategy, 100)
+            assert type(trade_cost) is float and trade_cost == pytest.approx(11)
+        finally:
+            set_numeric_mode("decimal")
+
+        trade_cost = broker.calculate_trade_cost(order, strategy, 100)
+        assert isinstance(trade_cost, Decimal) and float(trade_cost) == pytest.approx(11)
+
+    def test_numeric_mode_is_restored_after_backtest(self, mocker):
+        modes = []
+
+        def run_all(trader, **kwargs):
+            modes.append(get_numeric_mode())
+            return {"BuyAndHold": {}}
+
+        mocker.patch.object(Trader, "run_all", run_all)
+        BuyAndHold.run_backtest(
+            PandasDataBacktesting,
+            datetime.datetime(2023, 1, 2),
+            datetime.datetime(2023, 1, 31),
+            pandas_data={},
+            numeric_mode="float",
+            save_logfile=False,
+            show_plot=False,
+            show_tearsheet=False,
+            save_tearsheet=False,
+            show_indicators=False,
+        )
+        assert modes == ["float"]
+        assert get_numeric_mode() == "decimal"
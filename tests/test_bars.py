@@ -0,0 +1,85 @@
+from datetime import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lumibot.entities import Asset, Bars
+
+
+def make_minute_bars(tz="America/New_York", seed=0):
+    # Around the DST change of 2023-03-12, with some missing minutes
+    index = pd.date_range("2023-03-08 09:30", "2023-03-16 16:00", freq="min", tz=tz)
+    index = index[(index.time >= time(9, 30)) & (index.time < time(16, 0))]
+    rng = np.random.default_rng(seed)
+    index = index.delete(rng.choice(len(index), 500, replace=False))
+    close = 100 + rng.normal(0, 1, len(index)).cumsum()
+    df = pd.DataFrame(
+        {
+            "open": close - 0.2,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": rng.integers(1, 100, len(index)).astype(float),
+        },
+        index=index,
+    )
+    return Bars(df, "test", Asset("SPY"))
+
+
+class TestAggregateBars:
+    @pytest.mark.parametrize("tz", ["America/New_York", None])
+    def test_same_as_pandas(self, tz):
+        bars = make_minute_bars(tz)
+        for frequency in ["1min", "5Min", "15Min", "1h", "2h", "7min", "1D", "2D"]:
+            expected = bars._aggregate_df_with_pandas(frequency)
+            pd.testing.assert_frame_equal(bars.aggregate_bars(frequency).df, expected, check_freq=False)
+
+    def test_arrays_and_unsorted_bars(self):
+        bars = make_minute_bars()
+        expected = bars.aggregate_bars("15Min").df
+
+        shuffled = bars.df.sample(frac=1, random_state=0)
+        pd.testing.assert_frame_equal(
+            Bars(shuffled, "test", Asset("SPY")).aggregate_bars("15Min").df, expected, check_freq=False
+        )
+
+        arrays = {"datetime": bars.df.index.to_numpy(), **{c: bars.df[c].to_numpy() for c in bars.df.columns}}
+        from_arrays = Bars.from_arrays(arrays, "test", Asset("SPY"))
+        pd.testing.assert_frame_equal(from_arrays.aggregate_bars("15Min").df, expected, check_freq=False)
+
+    def test_session_start(self):
+        bars = make_minute_bars()
+        df = bars.aggregate_bars("1h", session_start=time(9, 30)).df
+        assert {(dt.hour, dt.minute) for dt in df.index} == {(h, 30) for h in range(9, 16)}
+
+        day = bars.df[bars.df.index.date == df.index[0].date()]
+        first_hour = day[day.index < df.index[1]]
+        assert df["open"].iloc[0] == first_hour["open"].iloc[0]
+        assert df["high"].iloc[0] == first_hour["high"].max()
+        assert df["volume"].iloc[0] == first_hour["volume"].sum()
+
+    def test_session_start_step_not_dividing_a_day(self):
+        bars = make_minute_bars()
+        df = bars.aggregate_bars("25Min", session_start=time(9, 30)).df
+        for date in sorted(set(df.index.date)):
+            labels = df.index[df.index.date == date]
+            assert (labels[0].hour, labels[0].minute) == (9, 30)
+            assert (labels[1].hour, labels[1].minute) == (9, 55)
+
+    def test_partial_trailing_bar(self):
+        bars = make_minute_bars()
+        df = bars.df[bars.df.index <= pd.Timestamp("2023-03-16 15:37", tz="America/New_York")]
+        bars = Bars(df, "test", Asset("SPY"))
+
+        assert bars.aggregate_bars("15Min").df.index[-1].minute == 30
+        assert bars.aggregate_bars("15Min", include_partial=False).df.index[-1].minute == 15
+        # Complete buckets are kept
+        assert bars.aggregate_bars("1min", include_partial=False).df.index[-1] == df.index[-1]
+
+    def test_grouper_kwargs(self):
+        bars = make_minute_bars()
+        df = bars.aggregate_bars("1h", offset="30min").df
+        pd.testing.assert_frame_equal(
+            df, bars.aggregate_bars("1h", session_start=time(9, 30)).df, check_freq=False
+        )
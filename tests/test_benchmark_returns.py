@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lumibot.tools import benchmark_returns
+from lumibot.tools.benchmark_returns import clear_benchmark_returns_cache, get_benchmark_returns
+
+
+@pytest.fixture
+def cache_folder(tmpdir, mocker):
+    folder = Path(tmpdir) / "benchmark_returns"
+    mocker.patch.object(benchmark_returns, "BENCHMARK_RETURNS_CACHE_FOLDER", folder)
+    clear_benchmark_returns_cache()
+    yield folder
+    clear_benchmark_returns_cache()
+
+
+def make_returns():
+    index = pd.date_range("2023-01-03", periods=5, freq="D", tz="America/New_York", name="Date")
+    close = np.array([100.0, 101.0, 99.0, 102.0, 103.0])
+    df = pd.DataFrame({"Close": close, "Volume": 1000, "Dividends": 0.0}, index=index)
+    df["return"] = df["Close"].pct_change()
+    df["symbol_cumprod"] = (1 + df["return"]).cumprod()
+    return df
+
+
+class TestBenchmarkReturns:
+    def test_loaded_once_per_process(self, cache_folder, mocker):
+        loader = mocker.Mock(side_effect=make_returns)
+        key = ("yahoo", "SPY", "day", "2023-01-03", "2023-01-07")
+
+        df = get_benchmark_returns(key, loader, persist=False)
+        df["return"] = 0
+        df2 = get_benchmark_returns(key, loader, persist=False)
+
+        assert loader.call_count == 1
+        # Callers get a copy of the compact returns
+        assert list(df2.columns) == ["Close", "return", "symbol_cumprod"]
+        assert df2["return"].iloc[1] == pytest.approx(0.01)
+        assert not cache_folder.exists()
+
+        get_benchmark_returns(("yahoo", "SPY", "day", "2023-01-03", "2023-01-08"), loader, persist=False)
+        assert loader.call_count == 2
+
+    def test_persisted(self, cache_folder, mocker):
+        loader = mocker.Mock(side_effect=make_returns)
+        key = ("yahoo", "SPY", "day", "2023-01-03", "2023-01-07")
+
+        df = get_benchmark_returns(key, loader)
+        assert len(list(cache_folder.iterdir())) == 1
+
+        # Another process reads the file
+        clear_benchmark_returns_cache()
+        cached = get_benchmark_returns(key, loader)
+        assert loader.call_count == 1
+        pd.testing.assert_frame_equal(cached, df, check_freq=False)
+        assert str(cached.index.tz) == "America/New_York"
+
+    def test_no_returns(self, cache_folder):
+        assert get_benchmark_returns(("yahoo", "XYZ", "day", "2023-01-03", "2023-01-07"), lambda: None) is None
+        assert not cache_folder.exists()
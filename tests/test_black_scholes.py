@@ -0,0 +1,78 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from lumibot.data_sources import PandasData
+from lumibot.entities import Asset
+from lumibot.tools import black_scholes
+
+
+class TestVectorizedBlackScholes:
+    def test_greeks_match_bs(self):
+        strikes = np.array([90.0, 100.0, 110.0])
+        for is_call in [True, False]:
+            greeks = black_scholes.bs_greeks(100, strikes, 5, 30, 25, is_call)
+            for i, strike in enumerate(strikes):
+                c = black_scholes.BS([100, strike, 5, 30], volatility=25)
+                assert greeks["option_price"][i] == pytest.approx(c.callPrice if is_call else c.putPrice)
+                assert greeks["delta"][i] == pytest.approx(c.callDelta if is_call else c.putDelta)
+                assert greeks["theta"][i] == pytest.approx(c.callTheta if is_call else c.putTheta)
+                assert greeks["rho"][i] == pytest.approx(c.callRho if is_call else c.putRho)
+                assert greeks["gamma"][i] == pytest.approx(c.gamma)
+                assert greeks["vega"][i] == pytest.approx(c.vega)
+
+    def test_expired_options_are_intrinsic(self):
+        greeks = black_scholes.bs_greeks(100, 90, 5, 0, 25, True)
+        assert greeks["option_price"] == 10
+        assert greeks["delta"] == 1
+        assert greeks["gamma"] == 0
+
+    def test_implied_volatility(self):
+        strikes = np.linspace(90, 110, 41)
+        days = np.linspace(20, 200, 41)
+        volatility = np.linspace(10, 90, 41)
+        is_call = np.arange(41) % 2 == 0
+        prices = black_scholes.bs_price(100, strikes, 5, days, volatility, is_call)
+
+        iv = black_scholes.bs_implied_volatility(100, strikes, 5, days, prices, is_call)
+        np.testing.assert_allclose(iv, volatility, rtol=1e-4)
+
+        # Scalars, the bisection of the BS class stops once the price matches to the cent
+        c = black_scholes.BS([100, 105, 5, 30], callPrice=1.19)
+        implied_volatility = black_scholes.bs_implied_volatility(100, 105, 5, 30, 1.19)
+        assert implied_volatility == pytest.approx(c.impliedVolatility, rel=1e-3)
+
+    def test_implied_volatility_edge_cases(self):
+        iv = black_scholes.bs_implied_volatility(100, [105, 50, 105, 105], 5, [30, 30, 30, 0], [0, 10, 99, 1])
+        # No price, below intrinsic value, above the price at the highest volatility, expired
+        assert np.isnan(iv[0])
+        assert iv[1] == 0.001
+        assert iv[2] == 500
+        assert np.isnan(iv[3])
+
+
+class TestCalculateChainGreeks:
+    def test_chain_greeks_match_single_greeks(self, mocker):
+        data_source = PandasData(
+            datetime_start=datetime.datetime(2023, 1, 2), datetime_end=datetime.datetime(2023, 1, 31), pandas_data={}
+        )
+        now = data_source.DEFAULT_PYTZ.localize(datetime.datetime(2023, 1, 3, 10))
+        mocker.patch.object(data_source, "get_datetime", return_value=now)
+
+        expiration = datetime.date(2023, 2, 17)
+        assets = [
+            Asset("SPY", asset_type="option", expiration=expiration, strike=strike, right=right)
+            for strike in [370, 380, 390]
+            for right in ["CALL", "PUT"]
+        ]
+        prices = [18.5, 6.2, 11.9, 9.4, 6.8, 14.2]
+
+        chain_greeks = data_source.calculate_chain_greeks(assets, prices, 382.0, 0.04)
+        assert len(chain_greeks) == len(assets)
+        for asset, price, greeks in zip(assets, prices, chain_greeks):
+            assert greeks == data_source.calculate_greeks(asset, price, 382.0, 0.04)
+            assert greeks["option_price"] == pytest.approx(price, abs=1e-4)
+            assert (greeks["delta"] > 0) == (asset.right == "CALL")
+
+        assert data_source.calculate_chain_greeks(assets[:1], [None], 382.0, 0.04)[0]["delta"] is None
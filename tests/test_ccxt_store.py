@@ -1,8 +1,11 @@
 from lumibot.tools import CcxtCacheDB
 import pytest
+import ccxt
+import ccxt.async_support as ccxt_async
 import duckdb
 from datetime import datetime
 import os
+import pandas as pd
 
 
 # PYTHONWARNINGS="ignore::DeprecationWarning"; pytest test/test_ccxt_store.py
@@ -12,11 +15,10 @@ import os
                          ])
 def test_cache_download_data(exchange_id:str, symbol:str, timeframe:str, start:datetime, end:datetime)->None:
     cache = CcxtCacheDB(exchange_id)
-    cache_file_path = cache.get_cache_file_name(symbol,timeframe)
+    cache_file_path = cache.get_cache_file_name()
 
-    # Remove cache file if exists.
-    if os.path.exists(cache_file_path):
-        os.remove(cache_file_path)
+    # Remove cached data if exists.
+    cache.clear_cache(symbol,timeframe)
 
     # Download data and store in cache.
     df1 = cache.download_ohlcv(symbol,timeframe,start,end)
@@ -56,11 +58,9 @@ def test_cache_download_data_without_overap(exchange_id:str, symbol:str, timefra
     """
 
     cache = CcxtCacheDB(exchange_id)
-    cache_file_path = cache.get_cache_file_name(symbol,timeframe)
 
     # Read the cache_dt_ranges table before caching new data to duckdb
-    with duckdb.connect(cache_file_path) as con:
-        df_down_range = con.execute("SELECT * from cache_dt_ranges").fetch_df()
+    df_down_range = cache.get_cache_ranges(symbol,timeframe)
     prev_start_dt = df_down_range.iloc[0].start_dt
     prev_end_dt = df_down_range.iloc[0].end_dt
 
@@ -68,8 +68,7 @@ def test_cache_download_data_without_overap(exchange_id:str, symbol:str, timefra
     df_cache = cache.download_ohlcv(symbol,timeframe,start,end)
 
     # Read the cache_dt_ranges table after caching new data to duckdb
-    with duckdb.connect(cache_file_path) as con:
-        df_down_range = con.execute("SELECT * from cache_dt_ranges").fetch_df()
+    df_down_range = cache.get_cache_ranges(symbol,timeframe)
 
     # Verify that the existing data range has been updated with the new data range
     # The number of data ranges should be 1.
@@ -100,6 +99,108 @@ def test_cache_download_data_without_overap(exchange_id:str, symbol:str, timefra
     # The first time of the cached data must be equal to or less than the requested time.
     assert df_cache.index.min() <= start
 
-    # Remove cache file if exists.
-    if os.path.exists(cache_file_path):
-        os.remove(cache_file_path)
\ No newline at end of file
+    # Remove cached data if exists.
+    cache.clear_cache(symbol,timeframe)
+
+def make_candles(start:datetime, periods:int, price:float)->pd.DataFrame:
+    return pd.DataFrame({
+        "datetime": pd.date_range(start, periods=periods, freq="D"),
+        "open": price, "high": price, "low": price, "close": price, "volume": 10.0,
+    })
+
+
+class TestCcxtCacheDBStorage:
+    @pytest.fixture
+    def cache(self, mocker, tmpdir):
+        mocker.patch("lumibot.tools.ccxt_data_store.LUMIBOT_CACHE_FOLDER", str(tmpdir))
+        mocker.patch.object(ccxt.binance, "load_markets")
+        yield CcxtCacheDB("binance")
+        CcxtCacheDB.close_connections()
+        CcxtCacheDB.close_async_clients()
+
+    def test_symbols_share_one_database(self, mocker, cache, tmpdir):
+        def get_barset(symbol, timeframe, limit, start, end):
+            return make_candles(start, (end - start).days + 1, 1.0 if symbol == "BTC/USDT" else 2.0)
+
+        mocker.patch.object(cache, "_get_barset_from_api", side_effect=get_barset)
+        start, end = datetime(2023, 1, 1), datetime(2023, 1, 10)
+        cache.download_ohlcv("BTC/USDT", "1d", start, end)
+        cache.download_ohlcv("ETH/USDT", "1d", start, end)
+        # Overlapping download, the cached rows are replaced
+        df = cache.download_ohlcv("ETH/USDT", "1d", datetime(2023, 1, 5), datetime(2023, 1, 20))
+
+        cache_files = [f for f in os.listdir(os.path.join(str(tmpdir), "binance")) if f.endswith(".duckdb")]
+        assert cache_files == ["binance.duckdb"]
+        assert df.index.is_unique
+        assert df.index.min() == datetime(2023, 1, 5)
+        assert (df.close == 2.0).all()
+        assert len(cache.get_cache_ranges("ETH/USDT", "1d")) == 1
+
+        arrays = cache.get_arrays_from_cache("BTC/USDT", "1d", start, end)
+        assert len(arrays["datetime"]) == 10
+        assert (arrays["close"] == 1.0).all()
+
+        cache.clear_cache("BTC/USDT", "1d")
+        assert cache.get_data_from_cache("BTC/USDT", "1d", start, end).empty
+        assert len(cache.get_data_from_cache("ETH/USDT", "1d", start, end)) == 10
+
+    def test_legacy_cache_file_is_imported(self, cache, tmpdir):
+        os.makedirs(os.path.join(str(tmpdir), "binance"))
+        legacy_file = os.path.join(str(tmpdir), "binance", "BTC_USDT_1d.duckdb")
+        df = make_candles(datetime(2023, 1, 1), 5, 1.0)
+        df["missing"] = 0
+        with duckdb.connect(legacy_file) as con:
+            con.execute("""CREATE TABLE candles (datetime DATETIME, open FLOAT, high FLOAT, low FLOAT, close FLOAT,
+                        volume INTEGER, missing INTEGER)""")
+            con.execute("CREATE TABLE cache_dt_ranges (id STRING, start_dt DATETIME, end_dt DATETIME)")
+            con.execute("INSERT INTO candles SELECT * FROM df")
+            con.execute("INSERT INTO cache_dt_ranges VALUES ('id1', '2023-01-01', '2023-01-05')")
+
+        ranges = cache.get_cache_ranges("BTC/USDT", "1d")
+        assert ranges.id.tolist() == ["id1"]
+        assert len(cache.get_data_from_cache("BTC/USDT", "1d", datetime(2023, 1, 1), datetime(2023, 1, 5))) == 5
+        assert not os.path.exists(legacy_file)
+
+    def test_concurrent_backfill(self, mocker, cache):
+        mocker.patch.object(CcxtCacheDB, "BACKFILL_PAGE_LIMIT", 5)
+        mocker.patch.object(ccxt_async.binance, "set_markets")
+        cache.api.markets = {"BTC/USDT": {}, "ETH/USDT": {}}
+        # The exchange has no candle on 2023-01-06, the first day of the second page
+        missing_ms = cache.api.parse8601("2023-01-06 00:00:00")
+        day_ms = 24 * 60 * 60 * 1000
+        calls = []
+
+        async def fetch_ohlcv(symbol, timeframe, since=None, limit=None, params=None):
+            calls.append((symbol, since))
+            timestamps = [since + i * day_ms for i in range(limit)]
+            return [[t, 1.0, 1.0, 1.0, float(t), 1.0] for t in timestamps if t != missing_ms]
+
+        mocker.patch.object(ccxt_async.binance, "fetch_ohlcv", side_effect=fetch_ohlcv)
+        start, end = datetime(2023, 1, 1), datetime(2023, 1, 12)
+        result = cache.download_ohlcv_many(["BTC/USDT", "ETH/USDT"], "1d", start, end)
+
+        # 12 days in pages of 5 days, for each symbol
+        assert len(calls) == 6
+        for symbol, df in result.items():
+            assert len(df) == 12
+            assert df.index.is_unique
+            assert df.loc["2023-01-06", "missing"] == 1
+            assert df.loc["2023-01-06", "close"] == df.loc["2023-01-05", "close"]
+            assert len(cache.get_cache_ranges(symbol, "1d")) == 1
+
+        # Everything is cached now
+        cache.download_ohlcv_many(["BTC/USDT", "ETH/USDT"], "1d", start, end)
+        assert len(calls) == 6
+
+    def test_async_client_is_shared(self, mocker, cache):
+        mocker.patch.object(ccxt_async.binance, "set_markets")
+        clients = set()
+
+        async def get_client(cache):
+            api, semaphore = cache._get_async_client()
+            clients.add((id(api), id(semaphore)))
+
+        cache._run_async(get_client(cache))
+        cache._run_async(get_client(cache))
+        cache._run_async(get_client(CcxtCacheDB("binance")))
+        assert len(clients) == 1
@@ -0,0 +1,59 @@
+import datetime
+
+from lumibot.tools.coverage_index import CoverageIndex
+
+DAY = datetime.timedelta(days=1)
+
+
+def d(day, month=1):
+    return datetime.date(2023, month, day)
+
+
+class TestCoverageIndex:
+    def test_add_merges_overlapping_and_adjacent_intervals(self):
+        coverage = CoverageIndex(DAY)
+        coverage.add(d(10), d(15))
+        coverage.add(d(1), d(5))
+        coverage.add(d(20), d(25))
+        assert coverage.intervals == [(d(1), d(5)), (d(10), d(15)), (d(20), d(25))]
+
+        # Touches the first interval and overlaps the second one
+        coverage.add(d(6), d(12))
+        assert coverage.intervals == [(d(1), d(15)), (d(20), d(25))]
+
+        # Already covered
+        coverage.add(d(2), d(3))
+        assert coverage.intervals == [(d(1), d(15)), (d(20), d(25))]
+
+        coverage.add(d(14), d(19))
+        assert coverage.intervals == [(d(1), d(25))]
+
+    def test_gaps(self):
+        coverage = CoverageIndex(DAY, intervals=[(d(1), d(10)), (d(21), d(31)), (d(5, 2), d(7, 2))])
+        assert coverage.gaps(d(5), d(3, 2)) == [(d(11), d(20)), (d(1, 2), d(3, 2))]
+        assert coverage.gaps(d(5), d(8)) == []
+        assert coverage.gaps(d(11), d(20)) == [(d(11), d(20))]
+        assert coverage.gaps(d(10), d(21)) == [(d(11), d(20))]
+        assert CoverageIndex(DAY).gaps(d(1), d(5)) == [(d(1), d(5))]
+
+        assert coverage.covers(d(2), d(10))
+        assert coverage.covers(d(6, 2))
+        assert not coverage.covers(d(2), d(11))
+        assert not coverage.covers(d(4, 2))
+
+    def test_gaps_with_datetimes(self):
+        minute = datetime.timedelta(minutes=1)
+        coverage = CoverageIndex(minute)
+        coverage.add(datetime.datetime(2023, 1, 1, 0, 0), datetime.datetime(2023, 1, 1, 12, 0))
+        gaps = coverage.gaps(datetime.datetime(2023, 1, 1, 0, 0), datetime.datetime(2023, 1, 1, 23, 59, 59))
+        assert gaps == [(datetime.datetime(2023, 1, 1, 12, 1), datetime.datetime(2023, 1, 1, 23, 59, 59))]
+
+    def test_from_values_and_persistence(self, tmpdir):
+        dates = [d(3), d(1), d(2), d(2), d(9), d(10)]
+        coverage = CoverageIndex.from_values(dates, DAY)
+        assert coverage.intervals == [(d(1), d(3)), (d(9), d(10))]
+
+        path = tmpdir / "coverage.feather"
+        assert CoverageIndex.load(path, DAY) is None
+        coverage.save(path)
+        assert CoverageIndex.load(path, DAY).intervals == coverage.intervals
@@ -0,0 +1,113 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lumibot.data_sources import PandasData
+from lumibot.entities import Asset, Data
+
+
+def make_daily_data(symbol="SPY", periods=100):
+    index = pd.date_range("2023-01-02", periods=periods, freq="1D", tz="America/New_York")
+    prices = np.arange(periods, dtype=float)
+    df = pd.DataFrame(
+        {"open": prices, "high": prices, "low": prices, "close": prices, "volume": 1.0},
+        index=index,
+    )
+    return Data(Asset(symbol), df, timestep="day", quote=Asset("USD", "forex"))
+
+
+class TestData:
+    def test_state_is_repaired_lazily(self):
+        data = make_daily_data()
+        assert data.state == Data.State.RAW
+        assert not data.is_repaired
+
+        price = data.get_last_price(data.df.index[10])
+        assert price == 10.0
+        assert data.state == Data.State.REPAIRED
+        assert data.is_repaired
+
+
+class TestPandasDataStore:
+    def test_single_store(self):
+        data = make_daily_data()
+        source = PandasData(
+            datetime_start=datetime.datetime(2023, 1, 5),
+            datetime_end=datetime.datetime(2023, 3, 1),
+            pandas_data=[data],
+        )
+        # pandas_data is only an alias of the data store, there is no second copy of the data
+        assert source.pandas_data is source._data_store
+        assert list(source._data_store.values()) == [data]
+
+        source.load_data()
+        assert source.pandas_data is source._data_store
+        assert data.is_repaired
+
+
+def make_minute_data(symbol="SPY", periods=500):
+    index = pd.date_range("2023-01-03 09:30", periods=periods, freq="1min", tz="America/New_York")
+    prices = np.linspace(100, 110, periods)
+    df = pd.DataFrame(
+        {"open": prices, "high": prices + 1, "low": prices - 1, "close": prices + 0.5, "volume": 10.0},
+        index=index,
+    )
+    return Data(Asset(symbol), df, timestep="minute", quote=Asset("USD", "forex"))
+
+
+class TestBarsArrays:
+    def test_arrays_are_zero_copy_slices(self):
+        for data in (make_daily_data(), make_minute_data()):
+            dt = data.df.index[50]
+            arrays = data.get_bars_arrays(dt, length=20, timestep=data.timestep)
+            assert np.shares_memory(arrays["close"], data.datalines["close"].dataline)
+
+            df = data.get_bars(dt, length=20, timestep=data.timestep)
+            assert list(arrays["datetime"]) == list(df.index)
+            for column in ["open", "high", "low", "close", "volume"]:
+                np.testing.assert_array_equal(arrays[column], df[column].to_numpy())
+
+    def test_arrays_are_read_only(self):
+        data = make_minute_data()
+        source = PandasData(
+            datetime_start=datetime.datetime(2023, 1, 3),
+            datetime_end=datetime.datetime(2023, 1, 4),
+            pandas_data=[data],
+        )
+        source._datetime = data.df.index[100]
+        expected = data.df["close"].iloc[90:100].to_numpy()
+
+        bars = source.get_historical_prices(Asset("SPY"), 10, "minute", quote=Asset("USD", "forex"))
+        with pytest.raises(ValueError):
+            bars.close[:] = 0
+        bars.df["close"] = 0
+
+        bars = source.get_historical_prices(Asset("SPY"), 10, "minute", quote=Asset("USD", "forex"))
+        np.testing.assert_array_equal(bars.close, expected)
+
+    def test_resampled_bars_use_get_bars(self):
+        data = make_minute_data()
+        assert data.get_bars_arrays(data.df.index[100], length=5, timestep="5 minutes") is None
+        assert data.get_bars_arrays(data.df.index[100], length=5, timestep="day") is None
+
+    def test_bars_from_pandas_data(self):
+        data = make_minute_data()
+        source = PandasData(
+            datetime_start=datetime.datetime(2023, 1, 3),
+            datetime_end=datetime.datetime(2023, 1, 4),
+            pandas_data=[data],
+        )
+        source._datetime = data.df.index[100]
+
+        bars = source.get_historical_prices(Asset("SPY"), 10, "minute", quote=Asset("USD", "forex"))
+        assert bars._df is None
+        assert bars.get_last_price() == data.df["close"].iloc[99]
+        assert len(bars.close) == 10 and len(bars.timestamps) == 10
+        assert bars._df is None
+
+        expected = data.get_bars(data.df.index[100], length=10, timestep="minute")
+        pd.testing.assert_frame_equal(bars.df, expected, check_freq=False)
+        assert [bar.close for bar in bars.split()] == list(expected["close"])
+        assert bars.split()[0].timestamp == int(expected.index[0].timestamp())
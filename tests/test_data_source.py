@@ -1,6 +1,51 @@
+import datetime
+
+from lumibot.data_sources import PandasData
 from lumibot.data_sources.data_source import DataSource
+from lumibot.entities import Asset
 
 
 class TestDataSource:
     def test_code(self):
         assert True
+
+
+class TestGreeksCache:
+    def test_greeks_are_cached_for_one_bar(self, mocker):
+        data_source = PandasData(
+            datetime_start=datetime.datetime(2023, 1, 2), datetime_end=datetime.datetime(2023, 1, 31), pandas_data={}
+        )
+        now = data_source.DEFAULT_PYTZ.localize(datetime.datetime(2023, 1, 3, 10))
+        mocker.patch.object(data_source, "get_datetime", return_value=now)
+        calculate = mocker.spy(data_source, "calculate_chain_greeks")
+
+        asset = Asset("SPY", asset_type="option", expiration=datetime.date(2023, 2, 17), strike=380, right="CALL")
+        greeks = data_source.calculate_greeks(asset, 11.9, 382.0, 0.04)
+        greeks["delta"] = None  # Changing the result does not change the cache
+        assert data_source.calculate_greeks(asset, 11.9, 382.0, 0.04)["delta"] is not None
+        assert calculate.call_count == 1
+        assert (data_source.greeks_cache_hits, data_source.greeks_cache_misses) == (1, 1)
+
+        # Different prices are a different calculation
+        data_source.calculate_greeks(asset, 12.1, 382.0, 0.04)
+        assert calculate.call_count == 2
+
+        # Next bar
+        data_source.get_datetime.return_value = now + datetime.timedelta(minutes=1)
+        data_source.calculate_greeks(asset, 11.9, 382.0, 0.04)
+        assert calculate.call_count == 3
+        assert (data_source.greeks_cache_hits, data_source.greeks_cache_misses) == (1, 3)
+
+    def test_live_greeks_expire_after_ttl(self, mocker):
+        data_source = PandasData(
+            datetime_start=datetime.datetime(2023, 1, 2), datetime_end=datetime.datetime(2023, 1, 31), pandas_data={}
+        )
+        mocker.patch.object(data_source, "IS_BACKTESTING_DATA_SOURCE", False)
+        now = data_source.DEFAULT_PYTZ.localize(datetime.datetime(2023, 1, 3, 10))
+        mocker.patch.object(data_source, "get_datetime", return_value=now)
+
+        data_source.cache_greeks("key", {"delta": 0.5})
+        data_source.get_datetime.return_value = now + datetime.timedelta(seconds=DataSource.GREEKS_CACHE_TTL)
+        assert data_source.get_cached_greeks("key") == {"delta": 0.5}
+        data_source.get_datetime.return_value = now + datetime.timedelta(seconds=DataSource.GREEKS_CACHE_TTL + 1)
+        assert data_source.get_cached_greeks("key") is None
@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from lumibot.tools import indicators
+
+
+class TestDownsampling:
+    def test_keeps_extremes(self):
+        values = np.sin(np.linspace(0, 20, 100_000))
+        values[12_345] = 5
+        values[54_321] = -5
+
+        kept = indicators.downsample_min_max(values, max_points=3000)
+        assert len(kept) <= 3001
+        assert np.all(np.diff(kept) > 0)
+        assert kept[0] == 0 and kept[-1] == len(values) - 1
+        assert 12_345 in kept and 54_321 in kept
+        assert values[kept].max() == 5 and values[kept].min() == -5
+
+    def test_short_lines_are_kept(self):
+        np.testing.assert_array_equal(indicators.downsample_min_max([1, 2, 3], max_points=10), [0, 1, 2])
+        np.testing.assert_array_equal(indicators.downsample_min_max(np.arange(20), max_points=None), np.arange(20))
+
+    def test_nan_values(self):
+        values = np.arange(1000, dtype=float)
+        values[100:900] = np.nan
+        kept = indicators.downsample_min_max(values, max_points=30)
+        assert not np.isnan(values[kept][[0, -1]]).any()
+        assert np.nanmax(values[kept]) == 999
+
+
+class TestPlotlyText:
+    def test_buysell_text(self):
+        index = pd.DatetimeIndex(["2023-01-03", "2023-01-03", "2023-01-04"])
+        trades = pd.DataFrame(
+            {
+                "status": ["fill", "canceled", "fill"],
+                "filled_quantity": [Decimal("10"), Decimal("0"), Decimal("1234.5")],
+                "symbol": ["SPY", "SPY", "SPY"],
+                "asset.asset_type": ["option", "stock", "stock"],
+                "asset.right": ["CALL", None, None],
+                "asset.strike": [400.0, None, None],
+                "asset.expiration": ["2023-01-20", None, None],
+                "asset.multiplier": [100, 1, 1],
+                "price": [2.55, None, 390.12345],
+                "type": ["market", "limit", "limit"],
+                "trade_cost": [0.0, None, 1.005],
+            },
+            index=index,
+        )
+
+        text = indicators._buysell_plotly_text(trades)
+        assert text.index.equals(index)
+        assert text.iloc[0] == (
+            "fill<br>10.00 SPY CALL Option<br>Strike: 400.0<br>Expiration: 2023-01-20<br>Price: 2.5500<br>"
+            "Order Type: market<br>Amount Transacted: 2,550.00<br>Trade Cost: 0.00<br>"
+        )
+        assert text.iloc[1] is None
+        assert text.iloc[2] == (
+            "fill<br>1,234.50 SPY<br>Price: 390.1234<br>Order Type: limit<br>Amount Transacted: 481,607.40<br>"
+            "Trade Cost: 1.00<br>"
+        )
+
+    def test_value_text(self):
+        df = pd.DataFrame({"value": [1.5, 2.0], "detail_text": [None, "crossed"]})
+        assert list(indicators._value_plotly_text(df)) == ["Value: 1.5", "Value: 2.0<br>crossed"]
+
+
+class TestPlotReturns:
+    def test_lines_are_downsampled(self, tmpdir, mocker):
+        mocker.patch("plotly.io._html.webbrowser")
+        index = pd.date_range("2023-01-03 09:30", periods=20_000, freq="min", tz="America/New_York")
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0, 0.001, len(index))
+        strategy_df = pd.DataFrame({"return": returns, "cash": 1000.0}, index=index)
+        close = 100 * np.cumprod(1 + returns[::-1])
+        benchmark_df = pd.DataFrame(
+            {"return": returns[::-1], "open": close, "high": close, "low": close, "close": close}, index=index
+        )
+        trades_df = pd.DataFrame(
+            {
+                "time": index[[10, 15_000]],
+                "side": ["buy", "sell"],
+                "status": ["fill", "fill"],
+                "filled_quantity": [Decimal("1"), Decimal("1")],
+                "symbol": ["SPY", "SPY"],
+                "asset.asset_type": ["stock", "stock"],
+                "asset.multiplier": [1, 1],
+                "price": [100.0, 101.0],
+                "type": ["market", "market"],
+                "trade_cost": [0.0, 0.0],
+            }
+        )
+        add_trace = mocker.spy(indicators.go.Figure, "add_trace")
+
+        plot_file = str(tmpdir.join("plot.html"))
+        indicators.plot_returns(
+            strategy_df, "Strategy", benchmark_df, "SPY", plot_file, trades_df=trades_df, max_points=3000
+        )
+
+        traces = {call.args[1].name: call.args[1] for call in add_trace.call_args_list}
+        assert 1000 < len(traces["Strategy"].y) <= 3001
+        assert len(traces["SPY"].y) <= 3001
+        assert len(traces["buy"].x) == 1 and len(traces["sell"].x) == 1
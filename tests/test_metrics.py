@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from lumibot.tools import OnlineMetrics, compute_metrics
+from lumibot.tools import indicators
+
+
+def make_returns(seed, periods=800, runs=None):
+    rng = np.random.default_rng(seed)
+    shape = periods if runs is None else (periods, runs)
+    returns = rng.normal(0.0005, 0.02, shape)
+    returns[rng.random(shape) < 0.1] = np.nan
+    returns[0] = np.nan
+    return returns
+
+
+class TestComputeMetrics:
+    def test_matches_indicators(self):
+        index = pd.date_range("2019-01-01", periods=800, freq="D", tz="America/New_York")
+        for seed in range(5):
+            df = pd.DataFrame({"return": make_returns(seed)}, index=index)
+            stats = indicators.stats_summary(df, 0.03)
+
+            assert stats["cagr"] == pytest.approx(indicators.cagr(df))
+            assert stats["volatility"] == pytest.approx(indicators.volatility(df))
+            assert stats["sharpe"] == pytest.approx(indicators.sharpe(df, 0.03))
+            assert stats["romad"] == pytest.approx(indicators.romad(df))
+            assert stats["total_return"] == pytest.approx(indicators.total_return(df))
+            max_drawdown = indicators.max_drawdown(df)
+            assert stats["max_drawdown"]["drawdown"] == pytest.approx(max_drawdown["drawdown"])
+            assert stats["max_drawdown"]["date"] == max_drawdown["date"]
+
+    def test_new_metrics(self):
+        index = pd.date_range("2019-01-01", periods=6, freq="D")
+        returns = np.array([np.nan, 0.1, 0, -0.2, 0, 0.05])
+        metrics = compute_metrics(returns, index, 0)
+
+        assert metrics["exposure"] == pytest.approx(3 / 5)
+        assert metrics["max_drawdown"] == pytest.approx(0.2)
+        assert metrics["max_drawdown_date"] == index[3]
+        # Less than 3 years, so the Calmar ratio is the RoMaD
+        assert metrics["calmar"] == metrics["romad"]
+
+        downside = np.sqrt(0.2**2 / 5) * np.sqrt(5 / (5 / 365.25))
+        assert metrics["sortino"] == pytest.approx(metrics["cagr"] / downside)
+
+    def test_no_risk_free_rate(self):
+        index = pd.date_range("2019-01-01", periods=300, freq="D")
+        df = pd.DataFrame({"return": make_returns(4, periods=300)}, index=index)
+        assert indicators.stats_summary(df, None)["sharpe"] == indicators.stats_summary(df, 0)["sharpe"]
+
+    def test_calmar_uses_last_3_years(self):
+        index = pd.date_range("2015-01-01", periods=2500, freq="D")
+        returns = make_returns(1, periods=2500)
+        metrics = compute_metrics(returns, index, 0)
+
+        last_years = index >= index[-1] - pd.Timedelta(days=3 * 365.25)
+        window = compute_metrics(returns[last_years], index[last_years], 0)
+        assert metrics["calmar"] == pytest.approx(window["romad"])
+        assert metrics["calmar"] != pytest.approx(metrics["romad"])
+
+    def test_many_runs(self):
+        index = pd.date_range("2019-01-01", periods=500, freq="D")
+        returns = make_returns(2, periods=500, runs=20)
+        metrics = compute_metrics(returns, index, 0.03)
+
+        for run in range(20):
+            single = compute_metrics(returns[:, run], index, 0.03)
+            for key, value in single.items():
+                if key == "max_drawdown_date":
+                    assert metrics[key][run] == value
+                else:
+                    assert metrics[key][run] == pytest.approx(value, nan_ok=True)
+
+    def test_unsorted_timestamps(self):
+        index = pd.date_range("2019-01-01", periods=300, freq="D")
+        returns = make_returns(3, periods=300)
+        order = np.random.default_rng(3).permutation(300)
+
+        metrics = compute_metrics(returns, index, 0.03)
+        shuffled = compute_metrics(returns[order], index[order], 0.03)
+        assert shuffled["cagr"] == pytest.approx(metrics["cagr"])
+        assert shuffled["max_drawdown_date"] == metrics["max_drawdown_date"]
+
+
+class TestOnlineMetrics:
+    def test_matches_compute_metrics(self):
+        index = pd.date_range("2019-01-01", periods=500, freq="D", tz="America/New_York")
+        rng = np.random.default_rng(4)
+        values = 100_000 * np.cumprod(1 + rng.normal(0.0005, 0.02, 500))
+
+        online = OnlineMetrics()
+        for value, dt in zip(values, index):
+            online.update(value, dt.to_pydatetime())
+        online.update(None, index[-1])
+
+        returns = pd.Series(values).pct_change().to_numpy()
+        metrics = compute_metrics(returns, index, 0.03)
+        assert online.total_return == pytest.approx(metrics["total_return"])
+        assert online.cagr == pytest.approx(metrics["cagr"])
+        assert online.volatility == pytest.approx(metrics["volatility"])
+        assert online.sharpe(0.03) == pytest.approx(metrics["sharpe"])
+        assert online.max_drawdown == pytest.approx(metrics["max_drawdown"])
+        assert online.high_water_mark == values.max()
+        assert online.drawdown == pytest.approx(1 - values[-1] / values.max())
+
+    def test_no_values(self):
+        online = OnlineMetrics()
+        assert online.total_return == 0
+        assert online.volatility == 0
+        assert online.sharpe() == 0
+        assert online.drawdown == 0
+        assert online.high_water_mark is None
@@ -1,6 +1,10 @@
+import threading
+from decimal import Decimal
+
 import pytest
 
 from lumibot.entities import Asset, Order
+from lumibot.tools import set_numeric_mode
 
 
 class TestOrderBasics:
@@ -122,3 +126,37 @@ class TestOrderBasics:
         order1.status = "open"
         order2.status = ""
         assert not order1.equivalent_status("")
+
+    def test_events(self):
+        order = Order(strategy='abc', asset=Asset("SPY"), side="buy", quantity=100)
+        # The events are only created when they are waited for
+        order.set_new()
+        order.set_filled()
+        assert order._events == {"new": True, "filled": True, "closed": True}
+        order.wait_to_be_registered()
+        order.wait_to_be_closed()
+
+        order = Order(strategy='abc', asset=Asset("SPY"), side="buy", quantity=100)
+        waiter = threading.Thread(target=order.wait_to_be_closed)
+        waiter.start()
+        order.set_canceled()
+        waiter.join(timeout=10)
+        assert not waiter.is_alive()
+
+    def test_quantity(self):
+        order = Order(strategy='abc', asset=Asset("SPY"), side="buy", quantity=0.1)
+        assert order.quantity == Decimal("0.1")
+        for quantity in [0, -1]:
+            with pytest.raises(ValueError):
+                Order(strategy='abc', asset=Asset("SPY"), side="buy", quantity=quantity)
+
+    def test_quantity_float_mode(self):
+        set_numeric_mode("float")
+        try:
+            order = Order(strategy='abc', asset=Asset("SPY"), side="buy", quantity=Decimal("0.1"))
+            assert type(order.quantity) is float and order.quantity == 0.1
+            with pytest.raises(ValueError):
+                Order(strategy='abc', asset=Asset("SPY"), side="buy", quantity=0.0)
+        finally:
+            set_numeric_mode("decimal")
+        assert Order(strategy='abc', asset=Asset("SPY"), side="buy", quantity=0.1).quantity == Decimal("0.1")
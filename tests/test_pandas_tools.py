@@ -0,0 +1,34 @@
+import datetime
+
+import pandas as pd
+import pytz
+
+from lumibot.tools import get_tail_before
+
+
+class TestGetTailBefore:
+    def test_matches_boolean_mask(self):
+        index = pd.date_range("2023-01-01", periods=50, freq="1D", tz="America/New_York")
+        df = pd.DataFrame({"close": range(50)}, index=index)
+        end = pytz.utc.localize(datetime.datetime(2023, 1, 20, 5))
+
+        pd.testing.assert_frame_equal(get_tail_before(df, end, length=5), df[df.index < end].tail(5))
+        pd.testing.assert_frame_equal(
+            get_tail_before(df, end, length=5, inclusive=True), df[df.index <= end].tail(5)
+        )
+        pd.testing.assert_frame_equal(get_tail_before(df, end), df[df.index < end])
+        assert get_tail_before(df, index[0]).empty
+
+    def test_cursor_is_reused(self):
+        index = pd.date_range("2023-01-01", periods=50, freq="1D", tz="America/New_York")
+        df = pd.DataFrame({"close": range(50)}, index=index)
+        cursors = {}
+
+        result = get_tail_before(df, index[10], length=3, cursors=cursors, key="SPY")
+        assert list(result["close"]) == [7, 8, 9]
+        assert cursors["SPY"][-1] == 10
+
+        # A different end datetime updates the cursor
+        result = get_tail_before(df, index[20], length=3, cursors=cursors, key="SPY")
+        assert list(result["close"]) == [17, 18, 19]
+        assert cursors["SPY"][-1] == 20
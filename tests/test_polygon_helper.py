@@ -79,6 +79,24 @@ class TestPolygonHelpers:
         missing_dates = ph.get_missing_dates(df_all, option_asset, start_date, end_date)
         assert not missing_dates
 
+    def test_missing_dates_with_coverage(self):
+        asset = Asset("SPY")
+        start_date = datetime.datetime(2023, 8, 1, 9, 30)  # Tuesday
+        end_date = datetime.datetime(2023, 8, 15, 10, 0)
+        coverage = ph.CoverageIndex(datetime.timedelta(days=1))
+        coverage.add(datetime.date(2023, 7, 25), datetime.date(2023, 8, 4))
+        coverage.add(datetime.date(2023, 8, 10), datetime.date(2023, 8, 13))
+
+        # The bars don't matter, only the dates that were already queried
+        missing_dates = ph.get_missing_dates(pd.DataFrame(), asset, start_date, end_date, coverage=coverage)
+        assert missing_dates == [
+            datetime.date(2023, 8, 7),
+            datetime.date(2023, 8, 8),
+            datetime.date(2023, 8, 9),
+            datetime.date(2023, 8, 14),
+            datetime.date(2023, 8, 15),
+        ]
+
     def test_get_trading_dates(self):
         # Unsupported Asset Type
         asset = Asset("SPY", asset_type="future")
@@ -457,3 +475,27 @@ class TestPolygonPriceData:
         else:
             assert mock_polyclient().get_aggs.call_count == 3
         expected_cachefile.unlink()
+
+    def test_downloaded_days_have_no_placeholders(self, mocker, tmpdir):
+        mock_polyclient = mocker.MagicMock()
+        mocker.patch.object(ph, "RESTClient", mock_polyclient)
+        mocker.patch.object(ph, "WAIT_TIME", 0)
+        mocker.patch.object(ph, "LUMIBOT_CACHE_FOLDER", tmpdir)
+
+        asset = Asset("SPY")
+        tz_e = pytz.timezone("US/Eastern")
+        start_date = tz_e.localize(datetime.datetime(2023, 8, 1))
+        end_date = tz_e.localize(datetime.datetime(2023, 8, 10))
+        # One daily bar (at midnight Eastern) for every trading day
+        days = pd.bdate_range("2023-07-31", "2023-08-11", tz="US/Eastern")
+        mock_polyclient().get_aggs.return_value = [
+            {"o": 1, "h": 2, "l": 1, "c": 2, "v": 100, "t": int(day.timestamp() * 1000)} for day in days
+        ]
+
+        ph.get_price_data_from_polygon("abc123", asset, start_date, end_date, "day")
+        df = ph.load_cache(ph.build_cache_filename(asset, "day"))
+
+        placeholders = df[df.isna().all(axis=1)]
+        bar_dates = set(df.dropna(how="all").index.date)
+        assert not bar_dates & set(placeholders.index.date)
+        assert df["t"].dtype == "int64"
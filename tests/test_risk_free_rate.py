@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lumibot import LUMIBOT_DEFAULT_PYTZ
+from lumibot.backtesting import BacktestingBroker, PandasDataBacktesting
+from lumibot.example_strategies.stock_buy_and_hold import BuyAndHold
+from lumibot.tools import RiskFreeRateCurve, get_risk_free_rate
+from lumibot.tools import risk_free_rate as risk_free_rate_module
+from lumibot.tools.yahoo_helper import YahooHelper
+
+
+def make_irx():
+    index = pd.date_range("2023-01-02", "2023-06-30", freq="B", tz=LUMIBOT_DEFAULT_PYTZ)
+    close = np.linspace(4.0, 5.0, len(index))
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+@pytest.fixture
+def irx(mocker):
+    risk_free_rate_module.clear_risk_free_rate_curve()
+    get_symbol_data = mocker.patch.object(YahooHelper, "get_symbol_data", return_value=make_irx())
+    yield get_symbol_data
+    risk_free_rate_module.clear_risk_free_rate_curve()
+
+
+class TestRiskFreeRateCurve:
+    def test_closest_date(self):
+        irx = make_irx()
+        curve = RiskFreeRateCurve(irx["Close"].iloc[::-1] / 100)
+
+        for dt in pd.date_range("2022-12-20", "2023-07-10", freq="7h", tz=LUMIBOT_DEFAULT_PYTZ):
+            # Same as the closest date of the index
+            expected = irx["Close"].iloc[abs(irx.index - dt).argmin()] / 100
+            assert curve.get_rate(dt) == expected
+
+        assert curve.get_rate() == 0.05
+        assert curve.get_rate(datetime(2023, 1, 2, 9, 30)) == 0.04
+
+    def test_empty(self):
+        assert RiskFreeRateCurve(pd.Series([], dtype=float, index=pd.DatetimeIndex([]))).get_rate() is None
+
+
+class TestGetRiskFreeRate:
+    def test_loaded_once(self, irx):
+        dt = LUMIBOT_DEFAULT_PYTZ.localize(datetime(2023, 3, 1, 10))
+        for _ in range(100):
+            rate = get_risk_free_rate(dt)
+        assert irx.call_count == 1
+        assert rate == pytest.approx(make_irx()["Close"].loc["2023-03-01"] / 100)
+
+    def test_strategy_rates(self, irx):
+        date_start = datetime(2023, 1, 2)
+        date_end = datetime(2023, 1, 31)
+        data_source = PandasDataBacktesting(date_start, date_end, pandas_data={})
+        broker = BacktestingBroker(data_source)
+        data_source._datetime = LUMIBOT_DEFAULT_PYTZ.localize(datetime(2023, 1, 10, 10))
+
+        strategy = BuyAndHold(broker, backtesting_start=date_start, backtesting_end=date_end)
+        assert strategy.risk_free_rate == pytest.approx(make_irx()["Close"].loc["2023-01-10"] / 100)
+
+        strategy = BuyAndHold(broker, backtesting_start=date_start, backtesting_end=date_end, risk_free_rate=0.03)
+        assert strategy.risk_free_rate == 0.03
+
+        rates = pd.Series([0.01, 0.02], index=pd.to_datetime(["2023-01-01", "2023-02-01"]))
+        strategy = BuyAndHold(broker, backtesting_start=date_start, backtesting_end=date_end, risk_free_rate=rates)
+        assert strategy.risk_free_rate == 0.01
+
+    def test_failed_load(self, mocker):
+        risk_free_rate_module.clear_risk_free_rate_curve()
+        get_symbol_data = mocker.patch.object(YahooHelper, "get_symbol_data", side_effect=ConnectionError("offline"))
+        monotonic = mocker.patch.object(risk_free_rate_module.time, "monotonic", return_value=1000.0)
+        dt = LUMIBOT_DEFAULT_PYTZ.localize(datetime(2023, 3, 1, 10))
+        try:
+            # Falls back to 0 and doesn't try again before the backoff
+            assert get_risk_free_rate(dt) == 0
+            assert get_risk_free_rate(dt) == 0
+            assert get_symbol_data.call_count == 1
+
+            get_symbol_data.side_effect = None
+            get_symbol_data.return_value = make_irx()
+            monotonic.return_value = 1000.0 + risk_free_rate_module.RETRY_SECONDS
+            assert get_risk_free_rate(dt) == pytest.approx(make_irx()["Close"].loc["2023-03-01"] / 100)
+            assert get_symbol_data.call_count == 2
+        finally:
+            risk_free_rate_module.clear_risk_free_rate_curve()
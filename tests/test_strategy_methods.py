@@ -1,6 +1,10 @@
 from datetime import date, datetime
 
-from lumibot.backtesting import BacktestingBroker, YahooDataBacktesting
+import pandas as pd
+import pytest
+
+from lumibot.backtesting import BacktestingBroker, PandasDataBacktesting, YahooDataBacktesting
+from lumibot.entities import Asset
 from lumibot.example_strategies.stock_buy_and_hold import BuyAndHold
 
 
@@ -42,3 +46,150 @@ class TestStrategyMethods:
 
         # Check that the expiration date is correct
         assert expiry_date == date(2023, 7, 21)
+
+    def test_get_chain_greeks(self, mocker):
+        date_start = datetime(2023, 1, 2)
+        date_end = datetime(2023, 1, 31)
+        data_source = PandasDataBacktesting(date_start, date_end, pandas_data={})
+        strategy = BuyAndHold(BacktestingBroker(data_source), backtesting_start=date_start, backtesting_end=date_end)
+        now = data_source.DEFAULT_PYTZ.localize(datetime(2023, 1, 3, 10))
+        mocker.patch.object(data_source, "get_datetime", return_value=now)
+
+        expiration = date(2023, 2, 17)
+        chains = {"Multiplier": 100, "Chains": {"CALL": {expiration: [390, 370, 380]}, "PUT": {expiration: [370, 380]}}}
+        prices = {(370, "CALL"): 18.5, (380, "CALL"): 11.9, (390, "CALL"): 6.8, (370, "PUT"): 6.2, (380, "PUT"): None}
+        mocker.patch.object(
+            data_source,
+            "get_last_price",
+            side_effect=lambda asset, **kwargs: prices[(asset.strike, asset.right)] if asset.strike else 382.0,
+        )
+
+        df = strategy.get_chain_greeks("SPY", expiration, chains=chains, risk_free_rate=0.04)
+        assert list(df["right"]) == ["CALL", "CALL", "CALL", "PUT", "PUT"]
+        assert list(df["strike"]) == [370, 380, 390, 370, 380]
+        assert (df["underlying_price"] == 382.0).all()
+
+        for _, row in df.iloc[:4].iterrows():
+            greeks = data_source.calculate_greeks(row["asset"], row["option_price"], 382.0, 0.04)
+            assert row["delta"] == pytest.approx(greeks["delta"])
+            assert row["implied_volatility"] == pytest.approx(greeks["implied_volatility"])
+        # No price, no greeks
+        assert pd.isna(df.iloc[4]["delta"])
+
+        calls = strategy.get_chain_greeks(
+            "SPY", expiration, right="call", strikes=[380], chains=chains, risk_free_rate=0.04
+        )
+        assert len(calls) == 1 and calls.iloc[0]["strike"] == 380
+
+    def test_get_greeks_is_cached_once(self, mocker):
+        date_start = datetime(2023, 1, 2)
+        date_end = datetime(2023, 1, 31)
+        data_source = PandasDataBacktesting(date_start, date_end, pandas_data={})
+        strategy = BuyAndHold(BacktestingBroker(data_source), backtesting_start=date_start, backtesting_end=date_end)
+        now = data_source.DEFAULT_PYTZ.localize(datetime(2023, 1, 3, 10))
+        mocker.patch.object(data_source, "get_datetime", return_value=now)
+        mocker.patch.object(
+            data_source, "get_last_price", side_effect=lambda asset, **kwargs: 11.9 if asset.strike else 382.0
+        )
+        asset = Asset("SPY", asset_type="option", expiration=date(2023, 2, 17), strike=380, right="CALL")
+
+        greeks = strategy.get_greeks(asset, risk_free_rate=0.04)
+        assert (data_source.greeks_cache_hits, data_source.greeks_cache_misses) == (0, 1)
+        assert strategy.get_greeks(asset, risk_free_rate=0.04) == greeks
+        assert (data_source.greeks_cache_hits, data_source.greeks_cache_misses) == (1, 1)
+        assert len(data_source._greeks_cache) == 1
+
+    def test_get_volatility_surface(self, mocker):
+        date_start = datetime(2023, 1, 2)
+        date_end = datetime(2023, 1, 31)
+        data_source = PandasDataBacktesting(date_start, date_end, pandas_data={})
+        strategy = BuyAndHold(BacktestingBroker(data_source), backtesting_start=date_start, backtesting_end=date_end)
+        now = data_source.DEFAULT_PYTZ.localize(datetime(2023, 1, 3, 10))
+        get_datetime = mocker.patch.object(data_source, "get_datetime", return_value=now)
+
+        expirations = [date(2023, 2, 17), date(2023, 3, 17)]
+        chains = {"Chains": {"CALL": {exp: [370, 380, 390] for exp in expirations}, "PUT": {}}}
+        prices = {370: 18.5, 380: 11.9, 390: 6.8}
+        get_last_price = mocker.patch.object(
+            data_source,
+            "get_last_price",
+            side_effect=lambda asset, **kwargs: prices[asset.strike] if asset.strike else 382.0,
+        )
+
+        surface = strategy.get_volatility_surface("SPY", expirations, chains=chains, risk_free_rate=0.04)
+        assert surface.expirations == expirations
+        greeks = data_source.calculate_greeks(
+            Asset("SPY", asset_type="option", expiration=expirations[0], strike=380, right="CALL"), 11.9, 382.0, 0.04
+        )
+        assert surface.implied_volatility(expirations[0], 380) == pytest.approx(greeks["implied_volatility"])
+        assert surface.solved_count == 6
+        calls = get_last_price.call_count
+
+        # Cached until the next bar
+        assert strategy.get_volatility_surface("SPY", expirations, chains=chains, risk_free_rate=0.04) is surface
+        assert get_last_price.call_count == calls
+
+        # Updated on the next bar
+        get_datetime.return_value = now.replace(minute=1)
+        prices[370] = 18.6
+        updated = strategy.get_volatility_surface(
+            "SPY", expirations, chains=chains, underlying_price=382.0, risk_free_rate=0.04
+        )
+        assert updated is surface
+        assert get_last_price.call_count > calls
+        surface.implied_volatility(expirations[0], 380)
+        # Only the option whose price changed is solved again in each expiration, one minute is within the tolerance
+        assert surface.solved_count == 8
+
+    def test_online_metrics(self, mocker):
+        date_start = datetime(2023, 1, 2)
+        date_end = datetime(2023, 1, 31)
+        data_source = PandasDataBacktesting(date_start, date_end, pandas_data={})
+        strategy = BuyAndHold(BacktestingBroker(data_source), backtesting_start=date_start, backtesting_end=date_end)
+        get_datetime = mocker.patch.object(strategy, "get_datetime")
+
+        for day, value in enumerate([100_000, 110_000, 99_000, 104_500]):
+            get_datetime.return_value = datetime(2023, 1, 3 + day)
+            strategy._portfolio_value = value
+            strategy._executor._trace_stats(None, None)
+
+        assert strategy.portfolio_total_return == pytest.approx(0.045)
+        assert strategy.portfolio_high_water_mark == 110_000
+        assert strategy.portfolio_drawdown == pytest.approx(0.05)
+        assert strategy.portfolio_max_drawdown == pytest.approx(0.1)
+        assert strategy.portfolio_volatility > 0
+
+        # Common parameter names stay free for user strategies
+        for name in ["total_return", "sharpe_ratio", "high_water_mark", "current_drawdown", "max_drawdown"]:
+            setattr(strategy, name, 0.2)
+            assert getattr(strategy, name) == 0.2
+
+    def test_chart_markers_and_lines(self):
+        date_start = datetime(2023, 1, 2)
+        date_end = datetime(2023, 1, 31)
+        data_source = PandasDataBacktesting(date_start, date_end, pandas_data={})
+        strategy = BuyAndHold(BacktestingBroker(data_source), backtesting_start=date_start, backtesting_end=date_end)
+        assert strategy.get_markers_df().empty
+        assert strategy.get_lines_df().empty
+
+        index = pd.date_range("2023-01-03 09:30", periods=1000, freq="min", tz="America/New_York")
+        for dt in index:
+            assert strategy.add_marker("Signal", value=1.0, dt=dt) is not None
+            strategy.add_line("Price", 100.0, color="blue", dt=dt)
+        # Same timestamp, name and symbol
+        assert strategy.add_marker("Signal", value=2.0, dt=index[10]) is None
+        assert strategy.add_marker("Signal", value=2.0, symbol="square", dt=index[10]) is not None
+
+        markers = strategy.get_markers_df()
+        assert len(markers) == 1001
+        assert list(markers.columns) == [
+            "datetime", "timestamp", "name", "symbol", "color", "size", "value", "detail_text"
+        ]
+        assert markers["value"].iloc[10] == 1.0
+        assert markers["timestamp"].iloc[-1] == index[10].timestamp()
+
+        lines = strategy.get_lines_df()
+        assert len(lines) == 1000
+        assert list(lines.columns) == ["datetime", "name", "value", "color", "style", "width", "detail_text"]
+        assert (lines["datetime"] == index).all()
+        assert (lines["style"] == "solid").all()
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lumibot.backtesting import BacktestingBroker, PandasDataBacktesting
+from lumibot.entities import Bars
+from lumibot.example_strategies.stock_buy_and_hold import BuyAndHold
+from lumibot.tools import ATR, EMA, MACD, RSI, SMA, VWAP, BollingerBands, IndicatorFeed
+
+
+def make_bars(periods=600, freq="min", seed=0):
+    index = pd.date_range("2023-01-03 09:30", periods=periods, freq=freq, tz="America/New_York")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.002, periods))
+    high = close * (1 + rng.uniform(0, 0.002, periods))
+    low = close * (1 - rng.uniform(0, 0.002, periods))
+    open = np.concatenate([[close[0]], close[:-1]])
+    volume = rng.integers(100, 10_000, periods).astype(float)
+    return pd.DataFrame({"open": open, "high": high, "low": low, "close": close, "volume": volume}, index=index)
+
+
+def make_indicators():
+    return [SMA(20), EMA(20), RSI(14), MACD(), ATR(14), BollingerBands(20), VWAP()]
+
+
+def state(indicator):
+    return [indicator.value, getattr(indicator, "signal", None), getattr(indicator, "upper", None)]
+
+
+class TestStreamingIndicators:
+    def test_warmup_matches_updates(self):
+        df = make_bars()
+        for streamed, warmed in zip(make_indicators(), make_indicators()):
+            for row in df.itertuples():
+                streamed.update(row.Index, row.open, row.high, row.low, row.close, row.volume)
+            warmed.warmup(df)
+            assert state(warmed) == pytest.approx(state(streamed)), streamed
+
+            # Both keep going the same way
+            for indicator in (streamed, warmed):
+                indicator.update(df.index[-1] + timedelta(minutes=1), 101, 102, 99, 100.5, 1000)
+            assert state(warmed) == pytest.approx(state(streamed)), streamed
+
+    def test_reference_values(self):
+        df = make_bars()
+        close = df["close"]
+        indicators = make_indicators()
+        for indicator in indicators:
+            indicator.warmup(df)
+        sma, ema, rsi, macd, atr, bollinger, vwap = indicators
+
+        assert sma.value == pytest.approx(close.rolling(20).mean().iloc[-1])
+        assert ema.value == pytest.approx(close.ewm(span=20, adjust=False).mean().iloc[-1])
+        gain = close.diff().clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+        loss = (-close.diff()).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+        assert rsi.value == pytest.approx(100 - 100 / (1 + gain / loss))
+        macd_line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        assert macd.value == pytest.approx(macd_line.iloc[-1])
+        assert macd.signal == pytest.approx(macd_line.ewm(span=9, adjust=False).mean().iloc[-1])
+        assert atr.value > 0
+        assert bollinger.upper == pytest.approx(sma.value + 2 * close.iloc[-20:].std(ddof=0))
+        typical_price = (df["high"] + df["low"] + df["close"]) / 3
+        assert vwap.value == pytest.approx((typical_price * df["volume"]).sum() / df["volume"].sum())
+
+    def test_not_ready(self):
+        sma = SMA(5)
+        sma.warmup(make_bars(periods=3))
+        assert not sma.ready and sma.value is None
+
+
+class TestIndicatorFeed:
+    def test_only_new_bars_are_fetched(self):
+        df = make_bars(periods=600)
+        feed = IndicatorFeed(timedelta(minutes=1))
+        sma, rsi = feed.add(SMA(20)), feed.add(RSI(14))
+        lengths = []
+
+        def updated_feed(end):
+            def get_bars(length):
+                lengths.append(length)
+                return df.iloc[max(end - length, 0) : end]
+
+            feed.update(get_bars, df.index[end - 1])
+
+        updated_feed(100)
+        assert lengths == [70]
+        for end in range(101, 300, 3):
+            updated_feed(end)
+        assert max(lengths[1:]) == 4
+
+        expected = RSI(14)
+        expected.warmup(df.iloc[:299])
+        assert rsi.value == pytest.approx(expected.value)
+        assert sma.value == pytest.approx(df["close"].iloc[279:299].mean())
+
+        # A new indicator is warmed up on its own, a gap warms all the indicators up again
+        ema = feed.add(EMA(10))
+        updated_feed(299)
+        assert lengths[-1] == 50 and ema.ready
+        updated_feed(500)
+        assert lengths[-1] == 70 and rsi.count == 70
+        expected.warmup(df.iloc[430:500])
+        assert rsi.value == pytest.approx(expected.value)
+
+
+class TestStrategyIndicators:
+    def test_add_indicator(self, mocker):
+        date_start = datetime(2023, 1, 2)
+        date_end = datetime(2023, 1, 31)
+        data_source = PandasDataBacktesting(date_start, date_end, pandas_data={})
+        strategy = BuyAndHold(BacktestingBroker(data_source), backtesting_start=date_start, backtesting_end=date_end)
+
+        df = make_bars(periods=100, freq="D")
+        now = {"end": 60}
+        mocker.patch.object(strategy, "get_datetime", side_effect=lambda: df.index[now["end"] - 1])
+        get_historical_prices = mocker.patch.object(
+            strategy,
+            "get_historical_prices",
+            side_effect=lambda asset, length, timestep, quote=None: Bars(
+                df.iloc[now["end"] - length : now["end"]], "test", asset
+            ),
+        )
+
+        sma = strategy.add_indicator(SMA(10), "SPY")
+        assert sma.value == pytest.approx(df["close"].iloc[50:60].mean())
+        assert get_historical_prices.call_args.args[1:3] == (10, "day")
+
+        now["end"] = 62
+        strategy._update_indicators()
+        assert sma.value == pytest.approx(df["close"].iloc[52:62].mean())
+        assert sma.count == 12
@@ -0,0 +1,102 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from lumibot.tools import VolatilitySurface
+from lumibot.tools.black_scholes import bs_price
+
+EXPIRATIONS = {date(2023, 2, 17): 45.0, date(2023, 3, 17): 73.0}
+STRIKES = np.array([90.0, 95.0, 100.0, 105.0, 110.0])
+
+
+def smile_volatility(strikes, days):
+    # Downward skew, higher volatility on the second expiration
+    return 30 - (strikes - 100) * 0.5 + (days - 45) * 0.1
+
+
+def build_surface(underlying_price=100.0):
+    surface = VolatilitySurface(underlying_price, 4.0)
+    for expiration, days in EXPIRATIONS.items():
+        for is_call in [True, False]:
+            prices = bs_price(underlying_price, STRIKES, 4.0, days, smile_volatility(STRIKES, days), is_call)
+            surface.update(expiration, days, STRIKES, prices, is_call)
+    return surface
+
+
+class TestVolatilitySurface:
+    def test_smile(self):
+        surface = build_surface()
+        strikes, ivs = surface.smile(date(2023, 2, 17))
+        np.testing.assert_array_equal(strikes, STRIKES)
+        np.testing.assert_allclose(ivs, smile_volatility(STRIKES, 45), rtol=1e-6)
+
+    def test_interpolation(self):
+        surface = build_surface()
+        # Between strikes
+        assert surface.implied_volatility(date(2023, 2, 17), 97.5) == pytest.approx(31.25, rel=1e-6)
+        # Flat outside of the strikes and the expirations
+        assert surface.implied_volatility(date(2023, 2, 17), 80) == pytest.approx(35, rel=1e-6)
+        assert surface.implied_volatility(date(2023, 1, 20), 100) == pytest.approx(30, rel=1e-6)
+        assert surface.implied_volatility(date(2023, 6, 16), 100) == pytest.approx(32.8, rel=1e-6)
+
+        # Between expirations the total variance is interpolated, date(2023, 3, 3) is 59 days away
+        variance = (30**2 * 45 + (32.8**2 * 73 - 30**2 * 45) * 14 / 28) / 59
+        assert surface.implied_volatility(date(2023, 3, 3), 100) == pytest.approx(np.sqrt(variance), rel=1e-6)
+        assert surface.implied_volatility(59, 100) == pytest.approx(np.sqrt(variance), rel=1e-6)
+
+        ivs = surface.implied_volatility(date(2023, 2, 17), [95, 105])
+        np.testing.assert_allclose(ivs, [32.5, 27.5], rtol=1e-6)
+
+    def test_price_and_greeks(self):
+        surface = build_surface()
+        price = surface.price(date(2023, 2, 17), 105, is_call=True)
+        assert price == pytest.approx(bs_price(100, 105, 4.0, 45, 27.5, True), rel=1e-6)
+
+        greeks = surface.greeks(date(2023, 2, 17), [95, 105], is_call=True)
+        assert greeks["implied_volatility"] == pytest.approx([32.5, 27.5], rel=1e-6)
+        assert greeks["delta"][0] > greeks["delta"][1]
+
+    def test_incremental_updates(self):
+        surface = build_surface()
+        surface.smile(date(2023, 2, 17))
+        surface.smile(date(2023, 3, 17))
+        assert surface.solved_count == 20
+
+        # Nothing changed
+        surface.update(date(2023, 2, 17), 45.0, STRIKES, bs_price(100, STRIKES, 4.0, 45, smile_volatility(STRIKES, 45)))
+        surface.implied_volatility(date(2023, 3, 1), 100)
+        assert surface.solved_count == 20
+
+        # One price changed
+        surface.update(date(2023, 2, 17), 45.0, [100], [3.0], True)
+        surface.implied_volatility(date(2023, 3, 1), 100)
+        assert surface.solved_count == 21
+
+        # A few minutes passed, the volatilities are kept
+        surface.update(date(2023, 2, 17), 44.99, [], [])
+        surface.implied_volatility(date(2023, 3, 1), 100)
+        assert surface.solved_count == 21
+        surface.update(date(2023, 2, 17), 45.0, [], [])
+
+        # The time to expiration of one expiration changed
+        surface.update(date(2023, 3, 17), 72.0, [], [])
+        surface.implied_volatility(date(2023, 3, 1), 100)
+        assert surface.solved_count == 31
+
+        # The underlying price changed
+        surface.set_underlying_price(101)
+        surface.implied_volatility(date(2023, 3, 1), 100)
+        assert surface.solved_count == 51
+
+    def test_missing_prices(self):
+        surface = VolatilitySurface(100, 4.0)
+        assert np.isnan(surface.implied_volatility(45, 100))
+
+        surface.update(date(2023, 2, 17), 45.0, [95, 100], [None, np.nan], False)
+        assert len(surface.smile(date(2023, 2, 17))[0]) == 0
+        assert np.isnan(surface.implied_volatility(date(2023, 2, 17), 100))
+
+        # The in the money option is used when the out of the money option has no price
+        surface.update(date(2023, 2, 17), 45.0, [95], [bs_price(100, 95, 4.0, 45, 20, True)], True)
+        assert surface.implied_volatility(date(2023, 2, 17), 95) == pytest.approx(20, rel=1e-6)
@@ -0,0 +1,103 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from lumibot.tools import YahooHelper
+from lumibot.tools.yahoo_helper import DAY_DATA
+
+
+def make_day_df(start, periods):
+    index = pd.date_range(start, periods=periods, freq="1D", tz="America/New_York", name="Date")
+    prices = np.arange(periods, dtype=float) + 100
+    return pd.DataFrame(
+        {
+            "Open": prices,
+            "High": prices,
+            "Low": prices,
+            "Close": prices,
+            "Adj Close": prices,
+            "Volume": 1000.0,
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+class TestYahooHelperCache:
+    def test_feather_roundtrip(self, mocker, tmpdir):
+        mocker.patch.object(YahooHelper, "LUMIBOT_YAHOO_CACHE_FOLDER", str(tmpdir))
+        mocker.patch.object(YahooHelper, "CACHING_ENABLED", True)
+
+        df = make_day_df("2023-01-02 16:00", 10)
+        YahooHelper.dump_feather_file("SPY", DAY_DATA, df)
+        cached_data = YahooHelper.check_feather_file("SPY", DAY_DATA)
+        pd.testing.assert_frame_equal(cached_data.data, df, check_freq=False)
+
+    def test_pickle_cache_is_converted(self, mocker, tmpdir):
+        mocker.patch.object(YahooHelper, "LUMIBOT_YAHOO_CACHE_FOLDER", str(tmpdir))
+        mocker.patch.object(YahooHelper, "CACHING_ENABLED", True)
+
+        df = make_day_df("2023-01-02 16:00", 10)
+        YahooHelper.dump_pickle_file("SPY", DAY_DATA, df)
+        cached_data = YahooHelper.check_feather_file("SPY", DAY_DATA)
+        pd.testing.assert_frame_equal(cached_data.data, df)
+        assert tmpdir.join("SPY_day_data.feather").exists()
+        assert not tmpdir.join("SPY_day_data.pickle").exists()
+
+    def test_only_missing_tail_is_downloaded(self, mocker, tmpdir):
+        mocker.patch.object(YahooHelper, "LUMIBOT_YAHOO_CACHE_FOLDER", str(tmpdir))
+        mocker.patch.object(YahooHelper, "CACHING_ENABLED", True)
+
+        df_all = make_day_df("2023-01-02 16:00", 20)
+        YahooHelper.dump_feather_file("SPY", DAY_DATA, df_all.iloc[:15])
+
+        mock_download = mocker.patch.object(
+            YahooHelper, "download_symbol_day_data", return_value=df_all.iloc[14:]
+        )
+        last_needed_datetime = df_all.index[-1].to_pydatetime()
+        result = YahooHelper.fetch_symbol_day_data("SPY", last_needed_datetime=last_needed_datetime)
+
+        mock_download.assert_called_once_with("SPY", start=datetime.date(2023, 1, 16))
+        pd.testing.assert_frame_equal(result, df_all, check_freq=False)
+
+        # The appended bars were saved to the cache
+        cached_data = YahooHelper.check_feather_file("SPY", DAY_DATA)
+        assert cached_data.is_up_to_date(last_needed_datetime=last_needed_datetime)
+
+    def test_full_download_after_split(self, mocker, tmpdir):
+        mocker.patch.object(YahooHelper, "LUMIBOT_YAHOO_CACHE_FOLDER", str(tmpdir))
+        mocker.patch.object(YahooHelper, "CACHING_ENABLED", True)
+
+        df_all = make_day_df("2023-01-02 16:00", 20)
+        df_tail = df_all.iloc[14:].copy()
+        df_tail.loc[df_tail.index[-1], "Stock Splits"] = 2.0
+
+        mock_download = mocker.patch.object(
+            YahooHelper, "download_symbol_day_data", side_effect=[df_tail, df_all]
+        )
+        result = YahooHelper.update_symbol_day_data("SPY", df_all.iloc[:15])
+
+        assert mock_download.call_count == 2
+        mock_download.assert_called_with("SPY")
+        assert result is df_all
+
+    def test_weekend_is_covered_after_download(self, mocker, tmpdir):
+        mocker.patch.object(YahooHelper, "LUMIBOT_YAHOO_CACHE_FOLDER", str(tmpdir))
+        mocker.patch.object(YahooHelper, "CACHING_ENABLED", True)
+
+        # Last bar on Friday 2023-01-13
+        df = make_day_df("2023-01-02 16:00", 12)
+        mocker.patch.object(YahooHelper, "download_symbol_day_data", return_value=df)
+        sunday = datetime.datetime(2023, 1, 15, 12, 0)
+        mocker.patch("lumibot.tools.yahoo_helper.get_lumibot_datetime", return_value=datetime.datetime(2023, 1, 16, 9))
+
+        cached_data = YahooHelper.check_feather_file("SPY", DAY_DATA)
+        assert cached_data is None
+        YahooHelper.fetch_symbol_day_data("SPY", last_needed_datetime=sunday)
+
+        # The weekend was checked, so the cache is up to date for Sunday but not for Monday
+        cached_data = YahooHelper.check_feather_file("SPY", DAY_DATA)
+        assert cached_data.is_up_to_date(last_needed_datetime=sunday)
+        assert not cached_data.is_up_to_date(last_needed_datetime=datetime.datetime(2023, 1, 16, 12, 0))